@@ -98,6 +98,32 @@ DATABASES = {
 }
 
 
+# Cache
+# Response caching relies on version keys bumped by model signals, so every
+# worker must share one backend in production (set REDIS_URL).
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv("REDIS_URL"),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'OPTIONS': {'MAX_ENTRIES': 5000},
+        }
+    }
+
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "True") == "True"
+# Without REDIS_URL the cache is per process and response caching stays off;
+# set this only when a single process serves the API.
+RESPONSE_CACHE_ALLOW_LOCAL = os.getenv("RESPONSE_CACHE_ALLOW_LOCAL", "False") == "True"
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", 600))
+RESPONSE_CACHE_MAX_AGE = int(os.getenv("RESPONSE_CACHE_MAX_AGE", 0))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -135,6 +161,11 @@ LOCALE_PATHS = [
     BASE_DIR / 'locale',
 ]
 
+# In-process cache for Translation rows (entries per language, seconds). The
+# timeout also bounds how stale other workers can be under LocMemCache.
+TRANSLATION_CACHE_SIZE = int(os.getenv("TRANSLATION_CACHE_SIZE", 5000))
+TRANSLATION_CACHE_TIMEOUT = int(os.getenv("TRANSLATION_CACHE_TIMEOUT", 300))
+
 # DRF + JWT
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
@@ -174,14 +205,28 @@ if os.getenv("EMAIL_BACKEND", "console") == "smtp":
 else:
     EMAIL_BACKEND = "django.core.mail.backends.console.EmailBackend"
 
+# Outgoing mail queue (see core.utils_email.MailDispatcher)
+MAIL_DISPATCHER_WORKERS = int(os.getenv("MAIL_DISPATCHER_WORKERS", 2))
+MAIL_QUEUE_SIZE = int(os.getenv("MAIL_QUEUE_SIZE", 1000))
+MAIL_BATCH_SIZE = int(os.getenv("MAIL_BATCH_SIZE", 50))
+MAIL_MAX_RETRIES = int(os.getenv("MAIL_MAX_RETRIES", 3))
+MAIL_RETRY_BACKOFF = float(os.getenv("MAIL_RETRY_BACKOFF", 1.0))
+NEWSLETTER_SEND_RATE = float(os.getenv("NEWSLETTER_SEND_RATE", 10))  # messages per second
+
 # WhatsApp Integration
 TWILIO_ACCOUNT_SID = os.environ.get('TWILIO_ACCOUNT_SID')
 TWILIO_AUTH_TOKEN = os.environ.get('TWILIO_AUTH_TOKEN')
 TWILIO_WHATSAPP_NUMBER = os.environ.get('TWILIO_WHATSAPP_NUMBER')
+WHATSAPP_CONCURRENCY = int(os.getenv("WHATSAPP_CONCURRENCY", 10))
+WHATSAPP_MAX_RETRIES = int(os.getenv("WHATSAPP_MAX_RETRIES", 5))
+WHATSAPP_RETRY_DELAY = float(os.getenv("WHATSAPP_RETRY_DELAY", 1.0))
+# Queued messages idle this long (seconds) are re-sent when a dispatcher starts.
+WHATSAPP_RESUME_AFTER = int(os.getenv("WHATSAPP_RESUME_AFTER", 300))
 
 # Payment Gateway Settings
 RAZORPAY_KEY_ID = os.environ.get('RAZORPAY_KEY_ID')
 RAZORPAY_KEY_SECRET = os.environ.get('RAZORPAY_KEY_SECRET')
+RAZORPAY_WEBHOOK_SECRET = os.environ.get('RAZORPAY_WEBHOOK_SECRET')
 STRIPE_PUBLIC_KEY = os.environ.get('STRIPE_PUBLIC_KEY')
 STRIPE_SECRET_KEY = os.environ.get('STRIPE_SECRET_KEY')
 UPI_MERCHANT_ID = os.environ.get('UPI_MERCHANT_ID')
@@ -195,3 +240,55 @@ STATIC_ROOT = BASE_DIR / "staticfiles"     # collectstatic will dump files here
 # Media files (User uploads: images, PDFs, etc.)
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
+
+# Uploads are stored by content hash under MEDIA_ROOT/cas/ (see core.storage),
+# so identical files are kept once. Names never change meaning: serve
+# MEDIA_URL + "cas/" with "Cache-Control: public, max-age=31536000, immutable".
+CONTENT_STORAGE_PREFIX = "cas"
+STORAGES = {
+    "default": {
+        "BACKEND": os.getenv("MEDIA_STORAGE_BACKEND", "core.storage.ContentAddressedStorage"),
+    },
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+}
+
+# Responsive image variants generated on upload (see core.images)
+IMAGE_VARIANT_WIDTHS = [320, 640, 1024, 1600]
+IMAGE_VARIANT_FORMATS = ['webp', 'jpeg']
+IMAGE_VARIANT_QUALITY = int(os.getenv("IMAGE_VARIANT_QUALITY", 80))
+IMAGE_PROCESS_WORKERS = int(os.getenv("IMAGE_PROCESS_WORKERS", 2))
+IMAGE_VARIANTS_SYNC = os.getenv("IMAGE_VARIANTS_SYNC", "False") == "True"
+
+# In-memory search suggestions (see core.suggest)
+SUGGEST_MAX_ENTRIES = int(os.getenv("SUGGEST_MAX_ENTRIES", 200000))
+SUGGEST_REFRESH_INTERVAL = int(os.getenv("SUGGEST_REFRESH_INTERVAL", 30))
+SUGGEST_MAX_AGE = int(os.getenv("SUGGEST_MAX_AGE", 60))  # Cache-Control max-age for /api/suggest/
+
+# Report downloads (see core.downloads): '' streams from Django, 'x-accel'
+# hands off to nginx (internal location at FILE_DOWNLOAD_ACCEL_PREFIX
+# aliased to MEDIA_ROOT), 'x-sendfile' to Apache/lighttpd.
+FILE_DOWNLOAD_OFFLOAD = os.getenv("FILE_DOWNLOAD_OFFLOAD", "")
+FILE_DOWNLOAD_ACCEL_PREFIX = os.getenv("FILE_DOWNLOAD_ACCEL_PREFIX", "/protected/")
+
+# Resumable chunked uploads (see core.uploads). Keep CHUNKED_UPLOAD_DIR on the
+# same filesystem as MEDIA_ROOT so finalizing is a rename, and let the proxy
+# accept bodies of CHUNKED_UPLOAD_CHUNK_SIZE (nginx client_max_body_size).
+CHUNKED_UPLOAD_DIR = os.getenv("CHUNKED_UPLOAD_DIR", str(BASE_DIR / "uploads_partial"))
+CHUNKED_UPLOAD_CHUNK_SIZE = int(os.getenv("CHUNKED_UPLOAD_CHUNK_SIZE", 5 * 1024 * 1024))
+CHUNKED_UPLOAD_MAX_SIZE = int(os.getenv("CHUNKED_UPLOAD_MAX_SIZE", 2 * 1024 ** 3))
+CHUNKED_UPLOAD_EXPIRY_HOURS = int(os.getenv("CHUNKED_UPLOAD_EXPIRY_HOURS", 48))
+
+# Write-behind for public contact, newsletter and donation submissions (see
+# core.writebehind): validated rows are appended to a local buffer, answered
+# with 202 and inserted in batches every WRITE_BEHIND_INTERVAL seconds. Keep
+# WRITE_BEHIND_DIR on persistent local disk shared by all workers of a host.
+# Donations are not buffered by default: the payment flow needs the new
+# donation's id, and a crash replay can duplicate them.
+WRITE_BEHIND_ENABLED = os.getenv("WRITE_BEHIND_ENABLED", "False") == "True"
+WRITE_BEHIND_MODELS = os.getenv("WRITE_BEHIND_MODELS", "contact,newsletter").split(",")
+WRITE_BEHIND_DIR = os.getenv("WRITE_BEHIND_DIR", str(BASE_DIR / "writebehind"))
+WRITE_BEHIND_INTERVAL = float(os.getenv("WRITE_BEHIND_INTERVAL", 1.0))
+WRITE_BEHIND_MAX_BYTES = int(os.getenv("WRITE_BEHIND_MAX_BYTES", 16 * 1024 * 1024))
+WRITE_BEHIND_FSYNC = os.getenv("WRITE_BEHIND_FSYNC", "True") == "True"
@@ -1,7 +1,8 @@
 from django.contrib import admin
 from .models import (
     Contact, Project, Donation, Gallery, Event, 
-    Impact, Testimonial, Career, Language, Translation, Newsletter
+    Impact, Testimonial, Career, Language, Translation, Newsletter,
+    NewsletterCampaign, WhatsAppMessage, PaymentEvent
 )
 
 @admin.register(Contact)
@@ -19,7 +20,7 @@ class ProjectAdmin(admin.ModelAdmin):
 class DonationAdmin(admin.ModelAdmin):
     list_display = ('donor', 'amount', 'purpose', 'status', 'date')
     list_filter = ('status', 'date')
-    search_fields = ('donor', 'purpose')
+    search_fields = ('donor', 'purpose', 'order_id', 'payment_id')
 
 
 @admin.register(Gallery)
@@ -36,7 +37,8 @@ class EventAdmin(admin.ModelAdmin):
 
 @admin.register(Impact)
 class ImpactAdmin(admin.ModelAdmin):
-    list_display = ('title', 'number', 'created_at')
+    list_display = ('title', 'number', 'source', 'created_at')
+    list_filter = ('source',)
     search_fields = ('title', 'description')
 
 @admin.register(Testimonial)
@@ -55,3 +57,22 @@ class NewsletterAdmin(admin.ModelAdmin):
     list_display = ('email', 'subscribed_at', 'is_active')
     list_filter = ('is_active',)
     search_fields = ('email',)
+
+@admin.register(NewsletterCampaign)
+class NewsletterCampaignAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'status', 'sent_count', 'failed_count', 'created_at', 'finished_at')
+    list_filter = ('status',)
+    search_fields = ('subject',)
+    readonly_fields = ('last_subscriber_id', 'sent_count', 'failed_count', 'started_at', 'finished_at')
+
+@admin.register(WhatsAppMessage)
+class WhatsAppMessageAdmin(admin.ModelAdmin):
+    list_display = ('to_number', 'status', 'attempts', 'sid', 'updated_at')
+    list_filter = ('status',)
+    search_fields = ('to_number', 'sid')
+
+@admin.register(PaymentEvent)
+class PaymentEventAdmin(admin.ModelAdmin):
+    list_display = ('event_id', 'gateway', 'event_type', 'received_at', 'processed_at', 'error')
+    list_filter = ('gateway', 'event_type')
+    search_fields = ('event_id',)
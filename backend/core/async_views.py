@@ -0,0 +1,103 @@
+"""
+Native async read endpoints for ASGI deployments (``/api/async/...``).
+
+They return the same representations and page shape as the DRF viewsets'
+list/retrieve, but every query runs on Django's async ORM and serialization
+only starts once the page and its translations are loaded, so a request
+never blocks the event loop. Writes stay on the sync viewsets.
+"""
+from django.http import JsonResponse
+from django.views import View
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .models import Career, Event, Gallery, Project
+from .search import FullTextSearchFilter
+from .serializers import (
+    CareerSerializer, CareerSummarySerializer, EventSerializer, EventSummarySerializer,
+    GallerySerializer, GallerySummarySerializer, ProjectSerializer, ProjectSummarySerializer,
+)
+
+
+class AsyncReadView(View):
+    """Public list (``page``-numbered) and retrieve for one model."""
+    http_method_names = ['get', 'head', 'options']
+    model = None
+    ordering = ('-created_at', '-id')
+    serializer_class = None
+    summary_serializer_class = None
+    page_size = api_settings.PAGE_SIZE
+    page_query_param = 'page'
+
+    def get_queryset(self, request):
+        return self.model.objects.order_by(*self.ordering)
+
+    async def get(self, request, pk=None):
+        queryset = self.get_queryset(request)
+        if pk is not None:
+            instance = await queryset.filter(pk=pk).afirst()
+            if instance is None:
+                return JsonResponse({'detail': 'Not found.'}, status=404)
+            return JsonResponse(await self.serialize(request, self.serializer_class, instance), encoder=JSONEncoder)
+
+        try:
+            number = int(request.GET.get(self.page_query_param, 1))
+        except ValueError:
+            number = 0
+        count = await queryset.acount()
+        offset = (number - 1) * self.page_size
+        if number < 1 or (number > 1 and offset >= count):
+            return JsonResponse({'detail': 'Invalid page.'}, status=404)
+
+        page = [instance async for instance in queryset[offset:offset + self.page_size]]
+        results = await self.serialize(request, self.summary_serializer_class or self.serializer_class, page, many=True)
+        url = request.build_absolute_uri()
+        previous_link = None
+        if number > 1:
+            previous_link = (remove_query_param(url, self.page_query_param) if number == 2
+                             else replace_query_param(url, self.page_query_param, number - 1))
+        return JsonResponse({
+            'count': count,
+            'next': replace_query_param(url, self.page_query_param, number + 1) if offset + len(page) < count else None,
+            'previous': previous_link,
+            'results': results,
+        }, encoder=JSONEncoder)
+
+    async def serialize(self, request, serializer_class, instance, many=False):
+        serializer = serializer_class(instance, many=many, context={'request': request, 'translations_prefetched': True})
+        child = serializer.child if many else serializer
+        await child.aprefetch_translations(instance if many else [instance])
+        return serializer.data
+
+
+class ProjectReadView(AsyncReadView):
+    model = Project
+    serializer_class = ProjectSerializer
+    summary_serializer_class = ProjectSummarySerializer
+
+
+class GalleryReadView(AsyncReadView):
+    model = Gallery
+    serializer_class = GallerySerializer
+    summary_serializer_class = GallerySummarySerializer
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        category = request.GET.get('category')
+        if category:
+            queryset = queryset.filter(category=category)
+        return FullTextSearchFilter().filter_queryset(request, queryset, self)
+
+
+class EventReadView(AsyncReadView):
+    model = Event
+    ordering = ('-date', '-id')
+    serializer_class = EventSerializer
+    summary_serializer_class = EventSummarySerializer
+
+
+class CareerReadView(AsyncReadView):
+    model = Career
+    serializer_class = CareerSerializer
+    summary_serializer_class = CareerSummarySerializer
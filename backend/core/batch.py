@@ -0,0 +1,68 @@
+"""
+Coalescing of per-row side effects during bulk writes.
+
+Save/delete receivers do their follow-up work (cache version bumps,
+search reindexing, impact recomputation) once per row. Inside
+``batched()`` they hand it to ``defer(flush, *items)`` instead, and each
+``flush`` runs once with every item collected when the outermost block
+exits, e.g. one cache bump per model however many rows changed.
+"""
+import threading
+from contextlib import contextmanager
+
+from django.db import connections, router
+from django.db.models.signals import post_save, pre_save
+
+_state = threading.local()
+
+
+@contextmanager
+def batched():
+    outermost = getattr(_state, 'pending', None) is None
+    if outermost:
+        _state.pending = {}
+    try:
+        yield
+    finally:
+        if outermost:
+            pending, _state.pending = _state.pending, None
+            for flush, items in pending.items():
+                flush(list(items))
+
+
+def defer(flush, *items):
+    """
+    Queue ``items`` for ``flush(items)`` at the end of the current batch.
+    Returns False outside a batch, when the caller should act right away.
+    """
+    pending = getattr(_state, 'pending', None)
+    if pending is None:
+        return False
+    queued = pending.setdefault(flush, {})
+    for item in items:
+        queued[item] = None
+    return True
+
+
+def bulk_save(model, instances, update_fields=None):
+    """
+    Insert (``update_fields`` None) or update ``instances`` with bulk SQL,
+    sending pre_save/post_save for each row as ``save()`` would.
+    """
+    using = router.db_for_write(model)
+    if update_fields is None and not connections[using].features.can_return_rows_from_bulk_insert:
+        # Without RETURNING the new primary keys are unknown, so save one by one.
+        for instance in instances:
+            instance.save(using=using)
+        return
+    created = update_fields is None
+    update_fields = None if created else frozenset(update_fields)
+    for instance in instances:
+        pre_save.send(sender=model, instance=instance, raw=False, using=using, update_fields=update_fields)
+    if created:
+        model.objects.using(using).bulk_create(instances)
+    else:
+        model.objects.using(using).bulk_update(instances, update_fields)
+    for instance in instances:
+        post_save.send(sender=model, instance=instance, created=created, update_fields=update_fields,
+                       raw=False, using=using)
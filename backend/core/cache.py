@@ -0,0 +1,152 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe, quote_etag, parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from . import batch
+from .models import Translation, Language
+from .utils_translation import get_request_language
+
+VERSION_PREFIX = 'core:cache-version:'
+RESPONSE_PREFIX = 'core:response:'
+
+# Models whose versions some cache depends on; only their writes bump a version.
+_versioned_models = {Translation, Language}
+
+
+def register_versioned_models(*models):
+    _versioned_models.update(models)
+
+
+def is_versioned_model(model):
+    return model in _versioned_models
+
+
+def _version_key(model):
+    return VERSION_PREFIX + model._meta.label_lower
+
+
+def get_model_versions(models):
+    keys = {_version_key(model): model for model in models}
+    versions = cache.get_many(list(keys))
+    missing = {key: time.time() for key in keys if key not in versions}
+    if missing:
+        cache.set_many(missing, None)
+        versions.update(missing)
+    return [versions[key] for key in keys]
+
+
+def bump_model_version(model):
+    """Invalidate every cached response that depends on ``model``."""
+    if not batch.defer(bump_model_versions, model):
+        bump_model_versions([model])
+
+
+def bump_model_versions(models):
+    """
+    Bump once the surrounding transaction commits, so a rolled-back write
+    invalidates nothing and no reader caches uncommitted data under the new
+    version.
+    """
+    models = list(models)
+    transaction.on_commit(lambda: cache.set_many({_version_key(model): time.time() for model in models}, None))
+
+
+def is_shared_cache():
+    """
+    Whether version bumps reach every worker. LocMemCache is per process, so
+    a bump in one worker leaves the others addressing their old entries.
+    """
+    return not isinstance(caches['default'], LocMemCache)
+
+
+def response_cache_enabled():
+    if not getattr(settings, 'RESPONSE_CACHE_ENABLED', True):
+        return False
+    return is_shared_cache() or getattr(settings, 'RESPONSE_CACHE_ALLOW_LOCAL', False)
+
+
+class CachedResponseMixin:
+    """
+    Caches list/retrieve responses keyed on scheme, host, path, query string,
+    language and the version of every model in ``cache_models``. Versions are
+    bumped by the post_save/post_delete receivers in ``core.signals``, so
+    nothing is deleted explicitly; stale entries simply stop being addressed.
+
+    That only holds if every worker sees the same versions, so caching is
+    off under a process-local cache unless ``RESPONSE_CACHE_ALLOW_LOCAL``
+    is set (a single-process deployment).
+    """
+    cache_models = ()
+    cache_actions = ('list', 'retrieve')
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        register_versioned_models(*cls.cache_models)
+
+    def get_cache_models(self):
+        return tuple(self.cache_models) + (Translation, Language)
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def cached_response(self, view, request, *args, **kwargs):
+        if (self.action not in self.cache_actions or request.method not in ('GET', 'HEAD')
+                or not response_cache_enabled()):
+            return view(request, *args, **kwargs)
+
+        versions = get_model_versions(self.get_cache_models())
+        key_source = '|'.join([
+            # Bodies hold absolute URLs built from the request's scheme and host.
+            request.scheme,
+            request.get_host(),
+            request.path,
+            request.META.get('QUERY_STRING', ''),
+            get_request_language(request) or '',
+            request.accepted_renderer.format,
+            ','.join(repr(version) for version in versions),
+        ])
+        key = RESPONSE_PREFIX + hashlib.md5(key_source.encode()).hexdigest()
+
+        entry = cache.get(key)
+        if entry is None:
+            response = view(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            body = json.dumps(response.data, cls=JSONEncoder, sort_keys=True)
+            entry = {
+                'data': json.loads(body),
+                'etag': quote_etag(hashlib.md5(body.encode()).hexdigest()),
+            }
+            cache.set(key, entry, getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 600))
+
+        last_modified = int(max(versions))
+        if self._not_modified(request, entry['etag'], last_modified):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(entry['data'])
+        response['ETag'] = entry['etag']
+        response['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, public=True, max_age=getattr(settings, 'RESPONSE_CACHE_MAX_AGE', 0))
+        patch_vary_headers(response, ('Accept-Language',))
+        return response
+
+    def _not_modified(self, request, etag, last_modified):
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            etags = [tag[2:] if tag.startswith('W/') else tag for tag in parse_etags(if_none_match)]
+            return '*' in etags or etag in etags
+        if_modified_since = parse_http_date_safe(request.META.get('HTTP_IF_MODIFIED_SINCE', ''))
+        return if_modified_since is not None and last_modified <= if_modified_since
@@ -0,0 +1,180 @@
+"""
+File downloads with HTTP Range and conditional request support.
+
+Files are streamed with FileResponse, so WSGI servers that provide
+``wsgi.file_wrapper`` (gunicorn, uWSGI) send them with zero-copy
+sendfile(), including partial ranges. With ``FILE_DOWNLOAD_OFFLOAD`` set
+the response carries no body at all and the front proxy serves the file:
+
+    'x-accel'    nginx, X-Accel-Redirect: FILE_DOWNLOAD_ACCEL_PREFIX + name
+    'x-sendfile' Apache mod_xsendfile / lighttpd, X-Sendfile: absolute path
+"""
+import mimetypes
+import os
+import re
+from urllib.parse import quote
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from django.views.decorators.http import require_http_methods
+
+from .models import Report
+
+_RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+_UNSAFE_FILENAME = re.compile(r'[\x00-\x1f\x7f"\\/]+')
+
+
+class FileRange:
+    """Read-limited view of an open file, starting at its current position."""
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+        self.name = getattr(file, 'name', '')
+
+    def read(self, size=-1):
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size) if size else b''
+        self.remaining -= len(data)
+        return data
+
+    # tell/seek/fileno let servers with sendfile() start at the range offset;
+    # they send Content-Length bytes from there.
+    def tell(self):
+        return self.file.tell()
+
+    def seek(self, *args):
+        return self.file.seek(*args)
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def parse_range(header, size):
+    """
+    Return (start, end) inclusive for a single-range ``Range`` header, None
+    to serve the whole file (absent, malformed or multi-range), or False
+    when the range cannot be satisfied.
+    """
+    match = _RANGE.match((header or '').strip())
+    if not match or size == 0:
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        suffix = int(last)
+        if suffix == 0:
+            return False
+        return max(size - suffix, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or (last and int(last) < start):
+        return False
+    return start, end
+
+
+def _if_range_matches(request, etag, last_modified):
+    value = request.META.get('HTTP_IF_RANGE')
+    if not value:
+        return True
+    if value.startswith(('"', 'W/')):
+        return value == etag
+    return last_modified is not None and parse_http_date_safe(value) == last_modified
+
+
+def _file_info(file):
+    storage = file.storage
+    size = file.size
+    try:
+        last_modified = int(storage.get_modified_time(file.name).timestamp())
+    except (NotImplementedError, OSError):
+        last_modified = None
+    etag = quote_etag(f'{size:x}-{last_modified or 0:x}')
+    return size, last_modified, etag
+
+
+def _disposition(filename, as_attachment):
+    kind = 'attachment' if as_attachment else 'inline'
+    try:
+        filename.encode('ascii')
+        return f'{kind}; filename="{filename}"'
+    except UnicodeEncodeError:
+        return f"{kind}; filename*=utf-8''{quote(filename)}"
+
+
+def serve_file(request, file, as_attachment=False, filename=None):
+    """Serve a FieldFile honouring Range, If-Range and the conditional request headers."""
+    if not file:
+        raise Http404('No file')
+    filename = filename or os.path.basename(file.name)
+    try:
+        size, last_modified, etag = _file_info(file)
+    except FileNotFoundError:
+        raise Http404('File not found')
+
+    response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+    if response is None:
+        response = _file_response(request, file, size, etag, last_modified)
+
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified)
+    response['Accept-Ranges'] = 'bytes'
+    if response.status_code in (200, 206):
+        response['Content-Disposition'] = _disposition(filename, as_attachment)
+    return response
+
+
+def _file_response(request, file, size, etag, last_modified):
+    offload = getattr(settings, 'FILE_DOWNLOAD_OFFLOAD', '')
+    if offload:
+        response = HttpResponse(content_type=mimetypes.guess_type(file.name)[0] or 'application/octet-stream')
+        if offload == 'x-accel':
+            prefix = getattr(settings, 'FILE_DOWNLOAD_ACCEL_PREFIX', '/protected/')
+            response['X-Accel-Redirect'] = quote(prefix.rstrip('/') + '/' + file.name)
+        else:
+            response['X-Sendfile'] = file.storage.path(file.name)
+        # The proxy serves the body and handles Range itself.
+        return response
+
+    byte_range = None
+    if request.method == 'GET' and _if_range_matches(request, etag, last_modified):
+        byte_range = parse_range(request.META.get('HTTP_RANGE'), size)
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    handle = file.storage.open(file.name, 'rb')
+    if byte_range is None:
+        return FileResponse(handle)
+
+    start, end = byte_range
+    handle.seek(start)
+    response = FileResponse(FileRange(handle, end - start + 1), status=206)
+    response['Content-Length'] = str(end - start + 1)
+    response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    return response
+
+
+@require_http_methods(['GET', 'HEAD'])
+def report_download(request, pk):
+    """Download a report PDF; ``?download=1`` forces a save dialog instead of inline display."""
+    report = get_object_or_404(Report, pk=pk)
+    return serve_file(request, report.file, as_attachment=request.GET.get('download') == '1',
+                      filename=report_filename(report))
+
+
+def report_filename(report):
+    """Name the download after the report's title; stored names are content hashes."""
+    extension = os.path.splitext(report.file.name or '')[1]
+    title = ' '.join(_UNSAFE_FILENAME.sub(' ', report.title or '').split())
+    return f'{title or "report"}{extension}'
@@ -0,0 +1,127 @@
+"""
+Streaming CSV / NDJSON exports of donations, volunteers, contact messages
+and newsletter subscribers.
+
+Rows are read with ``values_list().iterator()`` and encoded as they are
+produced, a few hundred rows per yielded block, so memory stays flat no
+matter how many rows a date range covers. Used by ``/api/exports/<name>/``
+and the ``export_data`` command.
+"""
+import csv
+import io
+import re
+from collections import namedtuple
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import DateTimeField
+from django.utils import timezone
+
+from .models import Contact, Donation, Newsletter, Volunteer
+
+# filters: (query parameter, model field, parser)
+ExportSpec = namedtuple('ExportSpec', 'model fields date_field filters')
+
+
+def _boolean(value):
+    return value.strip().lower() in ('1', 'true', 'yes')
+
+
+EXPORTS = {
+    'donations': ExportSpec(
+        Donation,
+        ('id', 'date', 'donor', 'email', 'phone', 'amount', 'purpose', 'status', 'order_id', 'payment_id'),
+        'date', (('status', 'status', str), ('purpose', 'purpose', str)),
+    ),
+    'volunteers': ExportSpec(
+        Volunteer, ('id', 'join_date', 'name', 'email', 'phone', 'area', 'status'),
+        'join_date', (('status', 'status', str),),
+    ),
+    'contacts': ExportSpec(
+        Contact, ('id', 'created_at', 'name', 'email', 'status', 'message'),
+        'created_at', (('status', 'status', str),),
+    ),
+    'subscribers': ExportSpec(
+        Newsletter, ('id', 'subscribed_at', 'email', 'is_active'),
+        'subscribed_at', (('active', 'is_active', _boolean),),
+    ),
+}
+
+OUTPUTS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+
+CHUNK_SIZE = 2000
+ROWS_PER_BLOCK = 500
+
+# Spreadsheets evaluate cells starting with these; contact messages come from the public.
+# Phone numbers such as "+91 98765 43210" are left alone.
+_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+_PLAIN_NUMBER = re.compile(r'^[+-][\d\s().-]*$')
+
+
+def export_queryset(spec, start=None, end=None, filters=None):
+    """Rows of ``spec`` whose date falls in [start, end] (inclusive dates), oldest first."""
+    queryset = spec.model.objects.all()
+    if isinstance(spec.model._meta.get_field(spec.date_field), DateTimeField):
+        # Compare against day boundaries rather than __date so an index on the column applies.
+        if start:
+            queryset = queryset.filter(**{f'{spec.date_field}__gte': _day_start(start)})
+        if end:
+            queryset = queryset.filter(**{f'{spec.date_field}__lt': _day_start(end + timedelta(days=1))})
+    else:
+        if start:
+            queryset = queryset.filter(**{f'{spec.date_field}__gte': start})
+        if end:
+            queryset = queryset.filter(**{f'{spec.date_field}__lte': end})
+    for param, field, parse in spec.filters:
+        value = (filters or {}).get(param)
+        if value not in (None, ''):
+            queryset = queryset.filter(**{field: parse(value)})
+    return queryset.order_by(spec.date_field, 'pk')
+
+
+def _day_start(day):
+    moment = datetime.combine(day, time.min)
+    return timezone.make_aware(moment) if settings.USE_TZ else moment
+
+
+def _csv_cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, datetime):
+        return timezone.localtime(value).isoformat() if timezone.is_aware(value) else value.isoformat()
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES) and not _PLAIN_NUMBER.match(value):
+        return "'" + value
+    return value
+
+
+def stream_rows(spec, queryset, output='csv'):
+    """Yield the export as encoded text blocks (header first for CSV)."""
+    rows = queryset.values_list(*spec.fields).iterator(chunk_size=CHUNK_SIZE)
+    buffer = io.StringIO()
+    if output == 'csv':
+        writer = csv.writer(buffer)
+        writer.writerow(spec.fields)
+        write = lambda row: writer.writerow([_csv_cell(value) for value in row])  # noqa: E731
+    else:
+        encoder = DjangoJSONEncoder(ensure_ascii=False)
+        write = lambda row: buffer.write(encoder.encode(dict(zip(spec.fields, row))) + '\n')  # noqa: E731
+
+    count = 0
+    for row in rows:
+        write(row)
+        count += 1
+        if count % ROWS_PER_BLOCK == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def filename(name, output, start=None, end=None):
+    parts = [name] + [day.isoformat() for day in (start, end) if day]
+    return f"{'_'.join(parts)}.{output}"
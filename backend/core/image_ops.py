@@ -0,0 +1,137 @@
+"""
+Pure-Pillow image work that runs inside the image process pool.
+
+Nothing here may import Django: pool workers are spawned fresh and only
+unpickle these functions.
+"""
+import io
+import math
+
+from PIL import Image, ImageOps
+
+PIL_FORMATS = {'webp': 'WEBP', 'jpeg': 'JPEG'}
+
+
+def _open(source):
+    image = Image.open(io.BytesIO(source) if isinstance(source, bytes) else source)
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ('RGB', 'RGBA'):
+        image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+    return image
+
+
+def target_widths(original_width, widths):
+    """Configured widths below the original, plus the original if it is smaller than some of them."""
+    targets = sorted(width for width in widths if width < original_width)
+    if len(targets) < len(widths):
+        targets.append(original_width)
+    return targets
+
+
+def render_variants(source, widths, formats, quality=80):
+    """
+    Resize ``source`` (a path, raw bytes or an opened image) to each target
+    width in each format. Returns {format: [(width, height, encoded_bytes), ...]}.
+    """
+    image = source if isinstance(source, Image.Image) else _open(source)
+    variants = {fmt: [] for fmt in formats}
+    for width in target_widths(image.width, widths):
+        height = max(1, round(image.height * width / image.width))
+        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+        for fmt in formats:
+            frame = resized.convert('RGB') if fmt == 'jpeg' and resized.mode == 'RGBA' else resized
+            buffer = io.BytesIO()
+            frame.save(buffer, PIL_FORMATS[fmt], quality=quality, optimize=True)
+            variants[fmt].append((width, height, buffer.getvalue()))
+    return variants
+
+
+_BASE83 = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz#$%*+,-.:;=?@[]^_{|}~'
+
+
+def _base83(value, length):
+    return ''.join(_BASE83[(value // 83 ** (length - index - 1)) % 83] for index in range(length))
+
+
+def _srgb_to_linear(value):
+    value = value / 255
+    return value / 12.92 if value <= 0.04045 else ((value + 0.055) / 1.055) ** 2.4
+
+
+def _linear_to_srgb(value):
+    value = max(0.0, min(1.0, value))
+    if value <= 0.0031308:
+        return int(value * 12.92 * 255 + 0.5)
+    return int((1.055 * value ** (1 / 2.4) - 0.055) * 255 + 0.5)
+
+
+def _sign_pow(value, exponent):
+    return math.copysign(abs(value) ** exponent, value)
+
+
+def blurhash(image, x_components=4, y_components=3):
+    """Encode ``image`` as a BlurHash string (https://blurha.sh)."""
+    small = image.convert('RGB')
+    small.thumbnail((32, 32))
+    width, height = small.size
+    pixels = [tuple(_srgb_to_linear(channel) for channel in pixel) for pixel in small.getdata()]
+    cos_x = [[math.cos(math.pi * i * x / width) for x in range(width)] for i in range(x_components)]
+    cos_y = [[math.cos(math.pi * j * y / height) for y in range(height)] for j in range(y_components)]
+
+    factors = []
+    for j in range(y_components):
+        for i in range(x_components):
+            normalisation = 1 if i == 0 and j == 0 else 2
+            r = g = b = 0.0
+            for y in range(height):
+                row = y * width
+                for x in range(width):
+                    basis = cos_x[i][x] * cos_y[j][y]
+                    pr, pg, pb = pixels[row + x]
+                    r += basis * pr
+                    g += basis * pg
+                    b += basis * pb
+            scale = normalisation / (width * height)
+            factors.append((r * scale, g * scale, b * scale))
+
+    dc, ac = factors[0], factors[1:]
+    result = _base83((x_components - 1) + (y_components - 1) * 9, 1)
+    if ac:
+        quantised_max = max(0, min(82, int(math.floor(max(abs(c) for f in ac for c in f) * 166 - 0.5))))
+        maximum = (quantised_max + 1) / 166
+    else:
+        quantised_max, maximum = 0, 1
+    result += _base83(quantised_max, 1)
+    result += _base83((_linear_to_srgb(dc[0]) << 16) + (_linear_to_srgb(dc[1]) << 8) + _linear_to_srgb(dc[2]), 4)
+    for factor in ac:
+        r, g, b = (max(0, min(18, int(math.floor(_sign_pow(c / maximum, 0.5) * 9 + 9.5)))) for c in factor)
+        result += _base83(r * 19 * 19 + g * 19 + b, 2)
+    return result
+
+
+def dominant_color(image):
+    small = image.convert('RGB')
+    small.thumbnail((64, 64))
+    quantised = small.quantize(colors=5)
+    _, index = max(quantised.getcolors())
+    r, g, b = quantised.getpalette()[index * 3:index * 3 + 3]
+    return f'#{r:02x}{g:02x}{b:02x}'
+
+
+def process_image(source, widths=(), formats=(), quality=80, metadata=False):
+    """
+    One pool job per upload: {'variants': render_variants(...) or {},
+    'metadata': {'width', 'height', 'color', 'blurhash'} or None}.
+    """
+    image = _open(source)
+    result = {'variants': {}, 'metadata': None}
+    if widths and formats:
+        result['variants'] = render_variants(image, widths, formats, quality)
+    if metadata:
+        result['metadata'] = {
+            'width': image.width,
+            'height': image.height,
+            'color': dominant_color(image),
+            'blurhash': blurhash(image),
+        }
+    return result
@@ -0,0 +1,189 @@
+"""
+Image post-processing: responsive variants and precomputed metadata.
+
+When an image field changes, the work is handed to a process pool (see
+``core.image_ops``) after the transaction commits. Resized variants are saved
+next to the original through the field's storage, and their names are
+recorded in the model's ``*_variants`` JSON field:
+
+    {"source": "gallery/a.jpg", "webp": {"320": "gallery/a_w320.webp", ...}, "jpeg": {...}}
+
+Models with ``metadata`` also get ``<field>_width``, ``<field>_height``,
+``<field>_color`` (dominant colour, ``#rrggbb``) and ``<field>_blurhash``
+filled in, so clients can lay out and paint a placeholder before the image
+itself has downloaded.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+
+from .cache import bump_model_version
+from .image_ops import process_image
+from .models import Event, Gallery, GalleryImage, Project, TeamMember
+
+logger = logging.getLogger(__name__)
+
+ImageSpec = namedtuple('ImageSpec', 'field variants_field metadata')
+
+IMAGE_FIELDS = {
+    Gallery: ImageSpec('image', 'image_variants', True),
+    Project: ImageSpec('image', 'image_variants', True),
+    Event: ImageSpec('image', 'image_variants', True),
+    GalleryImage: ImageSpec('image', None, True),
+    TeamMember: ImageSpec('photo', 'photo_variants', False),
+}
+
+METADATA_KEYS = ('width', 'height', 'color', 'blurhash')
+
+EXTENSIONS = {'webp': 'webp', 'jpeg': 'jpg'}
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=getattr(settings, 'IMAGE_PROCESS_WORKERS', 2),
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+    return _pool
+
+
+def metadata_fields(spec):
+    return {key: f'{spec.field}_{key}' for key in METADATA_KEYS}
+
+
+def process_args(file, variants=True, metadata=True):
+    try:
+        source = file.storage.path(file.name)
+    except NotImplementedError:
+        with file.storage.open(file.name, 'rb') as handle:
+            source = handle.read()
+    if not variants:
+        return source, (), (), 0, metadata
+    return (
+        source,
+        getattr(settings, 'IMAGE_VARIANT_WIDTHS', [320, 640, 1024, 1600]),
+        getattr(settings, 'IMAGE_VARIANT_FORMATS', ['webp', 'jpeg']),
+        getattr(settings, 'IMAGE_VARIANT_QUALITY', 80),
+        metadata,
+    )
+
+
+def outdated_parts(instance):
+    """Return (variants, metadata): which derived data no longer matches the image."""
+    spec = IMAGE_FIELDS[type(instance)]
+    name = getattr(instance, spec.field).name or None
+    variants = metadata = False
+    if spec.variants_field:
+        stored = getattr(instance, spec.variants_field) or {}
+        variants = (stored.get('source') or None) != name
+    if spec.metadata:
+        # ``_image_uploaded`` is set by the pre_save receiver for a fresh upload; a
+        # file saved with FieldFile.save() is already committed, but its variants
+        # source then no longer matches.
+        has_metadata = getattr(instance, metadata_fields(spec)['width']) is not None
+        metadata = getattr(instance, '_image_uploaded', False) or variants or has_metadata != bool(name)
+    return variants, metadata
+
+
+def schedule_processing(instance, variants=True, metadata=True):
+    """Rebuild derived image data for ``instance`` once the current transaction commits."""
+    model, pk = type(instance), instance.pk
+    spec = IMAGE_FIELDS[model]
+    variants = variants and bool(spec.variants_field)
+    metadata = metadata and spec.metadata
+    file = getattr(instance, spec.field)
+    name = file.name
+
+    if not name:
+        transaction.on_commit(lambda: store_result(model, pk, None, {}))
+    elif getattr(settings, 'IMAGE_VARIANTS_SYNC', False):
+        transaction.on_commit(lambda: process_now(model, pk, variants, metadata))
+    else:
+        def submit():
+            future = get_pool().submit(process_image, *process_args(file, variants, metadata))
+            future.add_done_callback(lambda done: _store_future(model, pk, name, done))
+        transaction.on_commit(submit)
+
+
+def process_now(model, pk, variants=True, metadata=True):
+    """Process and store derived image data in the calling process."""
+    spec = IMAGE_FIELDS[model]
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None:
+        return None
+    file = getattr(instance, spec.field)
+    if not file:
+        return store_result(model, pk, None, {})
+    variants = variants and bool(spec.variants_field)
+    metadata = metadata and spec.metadata
+    return store_result(model, pk, file.name, process_image(*process_args(file, variants, metadata)))
+
+
+def _store_future(model, pk, source_name, future):
+    try:
+        store_result(model, pk, source_name, future.result())
+    except Exception:
+        logger.exception('Could not process image for %s %s', model.__name__, pk)
+    finally:
+        connection.close()
+
+
+def store_result(model, pk, source_name, result):
+    """
+    Persist a ``process_image`` result. With no ``source_name`` (image
+    cleared) every derived field is reset.
+    """
+    spec = IMAGE_FIELDS[model]
+    instance = model.objects.filter(pk=pk).first()
+    if instance is None or (getattr(instance, spec.field).name or None) != source_name:
+        # Deleted or re-uploaded while we were processing.
+        return None
+
+    storage = getattr(instance, spec.field).storage
+    updates = {}
+    previous = None
+    if spec.variants_field and (result.get('variants') or not source_name):
+        variants = {'source': source_name} if source_name else {}
+        stem = os.path.splitext(source_name or '')[0]
+        for fmt, items in (result.get('variants') or {}).items():
+            variants[fmt] = {}
+            for width, height, data in items:
+                name = storage.save(f'{stem}_w{width}.{EXTENSIONS[fmt]}', ContentFile(data))
+                variants[fmt][str(width)] = name
+        previous = getattr(instance, spec.variants_field) or {}
+        updates[spec.variants_field] = variants
+    if spec.metadata and (result.get('metadata') or not source_name):
+        metadata = result.get('metadata') or {}
+        for key, field in metadata_fields(spec).items():
+            updates[field] = metadata.get(key)
+
+    if not updates:
+        return None
+    model.objects.filter(pk=pk).update(**updates)
+    if previous:
+        delete_variant_files(storage, previous)
+    bump_model_version(model)
+    return updates
+
+
+def delete_variant_files(storage, variants):
+    for fmt, names in (variants or {}).items():
+        if fmt == 'source':
+            continue
+        for name in names.values():
+            try:
+                storage.delete(name)
+            except Exception:
+                logger.warning('Could not delete image variant %s', name)
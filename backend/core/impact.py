@@ -0,0 +1,115 @@
+"""
+Impact counters derived from source data.
+
+Impact rows with a non-manual ``source`` have their ``number`` maintained
+here: save signals turn each change into +/- deltas. Counters are integers,
+so a change by a fractional amount re-reads the affected counters from
+DonationRollup (or the projects) instead of letting rounding drift. Writes
+use queryset updates, so the response cache version for Impact is bumped
+explicitly.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db.models import F, Q, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .cache import bump_model_version
+from .models import DonationRollup, Impact, Project, Volunteer
+
+DONATION_SOURCES = ('donations_total', 'donations_count')
+
+
+def _as_number(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float, Decimal)):
+        return Decimal(str(value))
+    try:
+        return Decimal(str(value).replace(',', ''))
+    except Exception:
+        return None
+
+
+def project_impact_value(impact_numbers, key):
+    if not isinstance(impact_numbers, dict):
+        return Decimal('0')
+    return _as_number(impact_numbers.get(key)) or Decimal('0')
+
+
+def compute_counter(source, key=None):
+    """Full recomputation of one counter from the source tables."""
+    if source in DONATION_SOURCES:
+        rollups = DonationRollup.objects.filter(status='Completed')
+        if key:
+            rollups = rollups.filter(purpose=key)
+        totals = rollups.aggregate(total=Sum('total'), count=Sum('count'))
+        value = totals['total'] if source == 'donations_total' else totals['count']
+        return int(value or 0)
+    if source == 'volunteers_active':
+        return Volunteer.objects.filter(status='Active').count()
+    if source == 'project_impact' and key:
+        values = Project.objects.exclude(impact_numbers=None).values_list('impact_numbers', flat=True)
+        return int(sum(project_impact_value(numbers, key) for numbers in values.iterator()))
+    return None
+
+
+def recompute_counters(queryset=None):
+    queryset = (queryset if queryset is not None else Impact.objects.all()).exclude(source='manual')
+    updated = 0
+    for impact in queryset.only('pk', 'source', 'source_key'):
+        value = compute_counter(impact.source, impact.source_key)
+        if value is not None:
+            updated += Impact.objects.filter(pk=impact.pk).update(number=value)
+    if updated:
+        bump_model_version(Impact)
+    return updated
+
+
+def recompute_ids(ids):
+    recompute_counters(Impact.objects.filter(pk__in=ids))
+
+
+def _add(counters, delta):
+    if counters.update(number=Coalesce(F('number'), Value(0)) + delta):
+        bump_model_version(Impact)
+
+
+def donations_changed(old, new):
+    """Apply the change between two donation snapshots (see core.rollups) to the donation counters."""
+    deltas = defaultdict(lambda: [Decimal('0'), 0])
+    for snapshot, sign in ((old, -1), (new, 1)):
+        if snapshot is not None and snapshot[2] == 'Completed':
+            deltas[snapshot[1]][0] += sign * snapshot[3]
+            deltas[snapshot[1]][1] += sign
+    for purpose, (amount, count) in deltas.items():
+        counters = Impact.objects.filter(Q(source_key__isnull=True) | Q(source_key='') | Q(source_key=purpose))
+        if count:
+            _add(counters.filter(source='donations_count'), count)
+        if amount == int(amount):
+            if amount:
+                _add(counters.filter(source='donations_total'), int(amount))
+        else:
+            recompute_counters(counters.filter(source='donations_total'))
+
+
+def volunteer_changed(was_active, is_active):
+    delta = int(is_active) - int(was_active)
+    if delta:
+        _add(Impact.objects.filter(source='volunteers_active'), delta)
+
+
+def project_changed(old_numbers, new_numbers):
+    keys = set()
+    for numbers in (old_numbers, new_numbers):
+        if isinstance(numbers, dict):
+            keys.update(numbers)
+    for key in keys:
+        delta = project_impact_value(new_numbers, key) - project_impact_value(old_numbers, key)
+        if not delta:
+            continue
+        counters = Impact.objects.filter(source='project_impact', source_key=key)
+        if delta == int(delta):
+            _add(counters, int(delta))
+        else:
+            recompute_counters(counters)
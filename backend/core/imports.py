@@ -0,0 +1,260 @@
+"""
+Bulk imports of translations, volunteers and newsletter subscribers.
+
+Input (CSV with a header row, NDJSON, or a JSON array) is read as a stream
+of records, cleaned with the model fields' own validation and written
+``CHUNK_SIZE`` rows at a time with ``bulk_create``. Translations upsert on
+their (language, model_name, field_name, object_id) key and subscribers on
+``email``; volunteers are plain inserts. A bad row is reported with its
+number and skipped, never aborting the rest of the file. Because
+bulk_create sends no signals, caches, the search index and impact counters
+are refreshed once at the end (``finish``).
+"""
+import codecs
+import csv
+import json
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+from django.db.models import BooleanField, DateTimeField
+from django.utils import timezone
+
+from . import impact, search
+from .cache import bump_model_version
+from .models import Impact, Language, Newsletter, Translation, Volunteer
+from .utils_translation import clear_translation_cache
+
+CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+INPUTS = ('csv', 'ndjson', 'json')
+
+_BOOLEANS = {'1': True, 'true': True, 't': True, 'yes': True, 'y': True,
+             '0': False, 'false': False, 'f': False, 'no': False, 'n': False}
+
+
+def _finish_translations(keys):
+    clear_translation_cache()
+    bump_model_version(Translation)
+    by_model = {}
+    for model_name, object_id in keys:
+        by_model.setdefault(model_name.lower(), set()).add(object_id)
+    for model_name, ids in by_model.items():
+        model = search.MODELS.get(model_name)
+        if model is not None:
+            search.index_objects(model, model.objects.filter(pk__in=ids).iterator(chunk_size=search.CHUNK_SIZE))
+
+
+def _finish_volunteers(keys):
+    bump_model_version(Volunteer)
+    impact.recompute_counters(Impact.objects.filter(source='volunteers_active'))
+
+
+def _finish_subscribers(keys):
+    bump_model_version(Newsletter)
+
+
+# key: which attributes of a written row ``finish`` needs
+ImportSpec = namedtuple('ImportSpec', 'model columns required unique_fields update_fields key finish')
+
+IMPORTS = {
+    'translations': ImportSpec(
+        Translation, ('language', 'model_name', 'field_name', 'object_id', 'translated_text'),
+        required=('language', 'model_name', 'field_name', 'object_id', 'translated_text'),
+        unique_fields=('language', 'model_name', 'field_name', 'object_id'), update_fields=('translated_text',),
+        key=('model_name', 'object_id'), finish=_finish_translations,
+    ),
+    'volunteers': ImportSpec(
+        Volunteer, ('name', 'email', 'phone', 'area', 'status', 'join_date'),
+        required=('name',), unique_fields=(), update_fields=(), key=(), finish=_finish_volunteers,
+    ),
+    'subscribers': ImportSpec(
+        Newsletter, ('email', 'is_active', 'subscribed_at'),
+        required=('email',), unique_fields=('email',), update_fields=('is_active',),
+        key=(), finish=_finish_subscribers,
+    ),
+}
+
+
+def guess_input(filename='', content_type=''):
+    name, content_type = (filename or '').lower(), (content_type or '').lower()
+    if name.endswith(('.ndjson', '.jsonl')) or 'ndjson' in content_type:
+        return 'ndjson'
+    if name.endswith('.json') or 'application/json' in content_type:
+        return 'json'
+    return 'csv'
+
+
+def read_records(lines, input_format='csv'):
+    """
+    Yield (row number, record dict) from an iterable of byte lines; a
+    record that cannot be parsed is yielded as (row number, error string).
+    Only a JSON array is read whole.
+    """
+    text = codecs.iterdecode(lines, 'utf-8-sig')
+    if input_format == 'csv':
+        for number, record in enumerate(csv.DictReader(text), start=1):
+            yield number, record
+    elif input_format == 'ndjson':
+        number = 0
+        for line in text:
+            if not line.strip():
+                continue
+            number += 1
+            try:
+                record = json.loads(line)
+            except ValueError as error:
+                yield number, f'Invalid JSON: {error}'
+                continue
+            yield number, record if isinstance(record, dict) else 'Expected a JSON object'
+    else:
+        try:
+            records = json.loads(''.join(text))
+        except ValueError as error:
+            yield 0, f'Invalid JSON: {error}'
+            return
+        if not isinstance(records, list):
+            yield 0, 'Expected a JSON array of objects'
+            return
+        for number, record in enumerate(records, start=1):
+            yield number, record if isinstance(record, dict) else 'Expected a JSON object'
+
+
+class Importer:
+    def __init__(self, dataset, dry_run=False):
+        self.spec = IMPORTS[dataset]
+        self.dataset = dataset
+        self.dry_run = dry_run
+        self.model = self.spec.model
+        self.fields = {column: self.model._meta.get_field(column) for column in self.spec.columns}
+        self.languages = {}
+        if 'language' in self.fields:
+            for pk, code in Language.objects.values_list('pk', 'code'):
+                self.languages[str(pk)] = pk
+                if code:
+                    self.languages[code.lower()] = pk
+        self.rows = self.imported = self.failed = 0
+        self.errors = []
+        self.keys = set()
+
+    def clean(self, record):
+        """Return (instance, columns given) or raise ValidationError with a per-column dict."""
+        values, given, errors = {}, [], {}
+        for column, field in self.fields.items():
+            value = record.get(column)
+            if isinstance(value, str):
+                value = value.strip()
+            if value in (None, ''):
+                if column in self.spec.required:
+                    errors[column] = 'This field is required.'
+                continue
+            given.append(column)
+            if column == 'language':
+                pk = self.languages.get(str(value).lower())
+                if pk is None:
+                    errors[column] = f'Unknown language: {value}'
+                values['language_id'] = pk
+                continue
+            if isinstance(field, BooleanField) and isinstance(value, str):
+                value = _BOOLEANS.get(value.lower(), value)
+            try:
+                value = field.clean(value, None)
+            except ValidationError as error:
+                errors[column] = ' '.join(error.messages)
+                continue
+            if isinstance(field, DateTimeField) and settings.USE_TZ and timezone.is_naive(value):
+                value = timezone.make_aware(value)
+            values[field.attname] = value
+        if errors:
+            raise ValidationError(errors)
+        return self.model(**values), tuple(given)
+
+    def error(self, number, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': number, 'errors': errors})
+
+    def run(self, records):
+        chunk = []
+        for number, record in records:
+            self.rows += 1
+            if isinstance(record, str):
+                self.error(number, {'non_field_errors': [record]})
+                continue
+            try:
+                chunk.append((number, *self.clean(record)))
+            except ValidationError as error:
+                self.error(number, error.message_dict)
+                continue
+            if len(chunk) >= CHUNK_SIZE:
+                self.write(chunk)
+                chunk = []
+        if chunk:
+            self.write(chunk)
+        if self.imported and not self.dry_run:
+            self.spec.finish(self.keys)
+        return self.result()
+
+    def write(self, chunk):
+        # A conflicting statement may not touch one row twice: the last row for a key wins.
+        if self.spec.unique_fields:
+            attnames = [self.fields[name].attname for name in self.spec.unique_fields]
+            latest = {}
+            for item in chunk:
+                latest[tuple(getattr(item[1], attname) for attname in attnames)] = item
+            self.imported += len(chunk) - len(latest)
+            chunk = sorted(latest.values(), key=lambda item: item[0])
+        # Only update columns the row actually supplied, so a file without is_active never resubscribes anyone.
+        groups = {}
+        for item in chunk:
+            update_fields = tuple(name for name in self.spec.update_fields if name in item[2])
+            groups.setdefault(update_fields, []).append(item)
+        for update_fields, items in groups.items():
+            if self.dry_run:
+                self.imported += len(items)
+                continue
+            try:
+                with transaction.atomic():
+                    self.bulk_create([instance for _, instance, _ in items], update_fields)
+            except DatabaseError:
+                # Find the offending rows one at a time.
+                for item in items:
+                    try:
+                        with transaction.atomic():
+                            self.bulk_create([item[1]], update_fields)
+                    except DatabaseError as error:
+                        self.error(item[0], {'non_field_errors': [str(error)]})
+                    else:
+                        self.written([item])
+            else:
+                self.written(items)
+
+    def bulk_create(self, instances, update_fields):
+        options = {}
+        if self.spec.unique_fields:
+            if update_fields:
+                options = {'update_conflicts': True, 'unique_fields': self.spec.unique_fields,
+                           'update_fields': update_fields}
+            else:
+                options = {'ignore_conflicts': True}
+        self.model.objects.bulk_create(instances, **options)
+
+    def written(self, items):
+        self.imported += len(items)
+        if self.spec.key:
+            self.keys.update(tuple(getattr(instance, name) for name in self.spec.key) for _, instance, _ in items)
+
+    def result(self):
+        return {
+            'dataset': self.dataset,
+            'dry_run': self.dry_run,
+            'rows': self.rows,
+            'imported': self.imported,
+            'failed': self.failed,
+            'errors': self.errors,
+        }
+
+
+def import_records(dataset, lines, input_format='csv', dry_run=False):
+    return Importer(dataset, dry_run=dry_run).run(read_records(lines, input_format))
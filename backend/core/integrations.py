@@ -0,0 +1,86 @@
+"""
+Lazily constructed third-party clients.
+
+Factories are registered by name and only run (importing their SDK) the first
+time ``get_client`` asks for them, so workers that never take a payment or
+send a WhatsApp message never pay for twilio/razorpay/stripe. A factory can be
+replaced through the ``INTEGRATION_CLIENTS`` setting, e.g. with a fake for
+load tests.
+"""
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.module_loading import import_string
+
+_factories = {}
+_clients = {}
+_lock = threading.Lock()
+
+
+def register(name):
+    def decorator(factory):
+        _factories[name] = factory
+        return factory
+    return decorator
+
+
+def get_factory(name):
+    override = getattr(settings, 'INTEGRATION_CLIENTS', {}).get(name)
+    if override:
+        return import_string(override) if isinstance(override, str) else override
+    try:
+        return _factories[name]
+    except KeyError:
+        raise ImproperlyConfigured(f"No integration client registered as '{name}'")
+
+
+def get_client(name):
+    client = _clients.get(name)
+    if client is None:
+        with _lock:
+            client = _clients.get(name)
+            if client is None:
+                client = _clients[name] = get_factory(name)()
+    return client
+
+
+def reset_clients(*names):
+    with _lock:
+        for name in names or list(_clients):
+            _clients.pop(name, None)
+
+
+def _require_settings(*names):
+    values = [getattr(settings, name, None) for name in names]
+    missing = [name for name, value in zip(names, values) if not value]
+    if missing:
+        raise ImproperlyConfigured(f"Missing settings: {', '.join(missing)}")
+    return values
+
+
+@register('twilio')
+def twilio_client():
+    from twilio.rest import Client
+    account_sid, auth_token = _require_settings('TWILIO_ACCOUNT_SID', 'TWILIO_AUTH_TOKEN')
+    return Client(account_sid, auth_token)
+
+
+@register('razorpay')
+def razorpay_client():
+    import razorpay
+    key_id, key_secret = _require_settings('RAZORPAY_KEY_ID', 'RAZORPAY_KEY_SECRET')
+    return razorpay.Client(auth=(key_id, key_secret))
+
+
+@register('stripe')
+def stripe_client():
+    import stripe
+    stripe.api_key, = _require_settings('STRIPE_SECRET_KEY')
+    return stripe
+
+
+@register('whatsapp')
+def whatsapp_transport():
+    from .whatsapp_utils import TwilioWhatsAppTransport
+    return TwilioWhatsAppTransport()
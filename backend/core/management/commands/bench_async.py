@@ -0,0 +1,124 @@
+import asyncio
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.test import override_settings
+
+
+def _delayed(latency):
+    def wrapper(execute, sql, params, many, context):
+        time.sleep(latency)
+        return execute(sql, params, many, context)
+    return wrapper
+
+
+class Command(BaseCommand):
+    help = ('Compare the sync DRF viewset under WSGI (thread pool) with the native async view '
+            'under ASGI (event loop) for the same public endpoint and the current database. '
+            'Requests are driven in-process, so no server is needed.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--endpoint', default='projects', choices=['projects', 'gallery', 'events', 'careers'])
+        parser.add_argument('--query', default='', help='Query string, e.g. "page=2&lang=hi".')
+        parser.add_argument('--requests', type=int, default=1000)
+        parser.add_argument('--concurrency', type=int, default=200, help='Requests in flight at once.')
+        parser.add_argument('--threads', type=int, default=16, help='WSGI worker threads.')
+        parser.add_argument('--db-latency', type=float, default=0.0,
+                            help='Milliseconds added to every query, to model a networked database.')
+        parser.add_argument('--with-cache', action='store_true', help='Leave the sync response cache on.')
+
+    def handle(self, *args, **options):
+        latency = options['db_latency'] / 1000
+        if latency:
+            wrapper = _delayed(latency)
+            connection_created.connect(lambda connection, **kwargs: connection.execute_wrappers.append(wrapper),
+                                       weak=False, dispatch_uid='bench_async_latency')
+            for connection in connections.all():
+                connection.execute_wrappers.append(wrapper)
+
+        with override_settings(RESPONSE_CACHE_ENABLED=options['with_cache'], RESPONSE_CACHE_ALLOW_LOCAL=True):
+            sync = self.run_wsgi(f"/api/{options['endpoint']}/", options)
+            native = self.run_asgi(f"/api/async/{options['endpoint']}/", options)
+
+        self.stdout.write(f"{options['requests']} requests, {options['concurrency']} concurrent, "
+                          f"db latency {options['db_latency']} ms")
+        self.report('WSGI sync viewset', sync)
+        self.report('ASGI async view', native)
+
+    def run_wsgi(self, path, options):
+        handler = WSGIHandler()
+        # ``concurrency`` clients share ``threads`` server workers, so latency includes queueing.
+        workers = threading.BoundedSemaphore(options['threads'])
+
+        def request(_):
+            environ = {
+                'REQUEST_METHOD': 'GET', 'PATH_INFO': path, 'QUERY_STRING': options['query'],
+                'SERVER_NAME': 'localhost', 'SERVER_PORT': '80', 'HTTP_HOST': 'localhost',
+                'wsgi.url_scheme': 'http', 'wsgi.input': BytesIO(), 'wsgi.errors': BytesIO(),
+            }
+            started = time.perf_counter()
+            result = {}
+            with workers:
+                body = handler(environ, lambda status, headers: result.setdefault('status', status))
+                b''.join(body)
+                body.close()
+            return result['status'].startswith('200'), time.perf_counter() - started
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as pool:
+            outcomes = list(pool.map(request, range(options['requests'])))
+        return outcomes, time.perf_counter() - started
+
+    def run_asgi(self, path, options):
+        application = ASGIHandler()
+
+        async def request(limit):
+            scope = {
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+                'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'root_path': '',
+                'query_string': options['query'].encode(), 'headers': [(b'host', b'localhost')],
+                'client': ('127.0.0.1', 0), 'server': ('localhost', 80),
+            }
+            incoming = [{'type': 'http.request', 'body': b'', 'more_body': False}]
+            status = {}
+
+            async def receive():
+                if incoming:
+                    return incoming.pop()
+                await asyncio.Event().wait()
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    status['code'] = message['status']
+
+            async with limit:
+                started = time.perf_counter()
+                await application(scope, receive, send)
+                return status.get('code') == 200, time.perf_counter() - started
+
+        async def run():
+            limit = asyncio.Semaphore(options['concurrency'])
+            return await asyncio.gather(*(request(limit) for _ in range(options['requests'])))
+
+        started = time.perf_counter()
+        outcomes = asyncio.run(run())
+        return outcomes, time.perf_counter() - started
+
+    def report(self, label, result):
+        outcomes, elapsed = result
+        timings = sorted(duration for _, duration in outcomes)
+        failed = sum(1 for ok, _ in outcomes if not ok)
+        self.stdout.write(
+            f"{label:<20} {len(outcomes) / elapsed:8.0f} req/s   "
+            f"p50 {statistics.median(timings) * 1000:7.1f} ms   "
+            f"p99 {timings[int(len(timings) * 0.99)] * 1000:7.1f} ms   "
+            f"errors {failed}"
+        )
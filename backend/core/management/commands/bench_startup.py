@@ -0,0 +1,57 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Runs in a fresh interpreter: load the WSGI app and URLconf like a worker
+# booting, then report wall time, peak RSS and which integration SDKs loaded.
+WORKER_SCRIPT = """
+import json, os, resource, sys, time
+start = time.perf_counter()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(json.dumps({
+    'seconds': time.perf_counter() - start,
+    'rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    'sdks': [name for name in ('twilio', 'razorpay', 'stripe') if name in sys.modules],
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = 'Measure cold-start import time and peak RSS of a worker process.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=5)
+        parser.add_argument('--json', action='store_true', help='Print raw results as JSON.')
+
+    def handle(self, *args, **options):
+        results = [self.run_worker() for _ in range(options['runs'])]
+        if options['json']:
+            self.stdout.write(json.dumps(results))
+            return
+
+        seconds = [result['seconds'] for result in results]
+        rss_mb = [result['rss_kb'] / 1024 for result in results]
+        self.stdout.write(f"runs:          {len(results)}")
+        self.stdout.write(f"startup time:  mean {statistics.mean(seconds):.3f}s  "
+                          f"min {min(seconds):.3f}s  max {max(seconds):.3f}s")
+        self.stdout.write(f"peak RSS:      mean {statistics.mean(rss_mb):.1f} MB  max {max(rss_mb):.1f} MB")
+        self.stdout.write(f"SDKs imported: {', '.join(results[-1]['sdks']) or 'none'}")
+
+    def run_worker(self):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get('DJANGO_SETTINGS_MODULE', 'backend.settings'))
+        completed = subprocess.run(
+            [sys.executable, '-c', WORKER_SCRIPT],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        if completed.returncode:
+            raise CommandError(completed.stderr.strip())
+        return json.loads(completed.stdout.strip().splitlines()[-1])
@@ -0,0 +1,65 @@
+import random
+import statistics
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from core.suggest import PrefixIndex
+
+WORDS = (
+    'clean water village school books health camp women skill training rural '
+    'education tree plantation drive relief flood food nutrition child girl '
+    'library solar light sanitation awareness youth sports medical mobile clinic '
+    'community garden literacy digital computer lab scholarship elderly care'
+).split()
+PLACES = ('Delhi', 'Mumbai', 'Pune', 'Jaipur', 'Lucknow', 'Patna', 'Kochi', 'Indore', 'Bhopal', 'Surat')
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the suggestion prefix index over a synthetic title set (no database access).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=100000)
+        parser.add_argument('--queries', type=int, default=20000)
+        parser.add_argument('--max-entries', type=int, default=1000000)
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        items = []
+        for pk in range(1, options['titles'] + 1):
+            title = ' '.join(rng.choice(WORDS) for _ in range(rng.randint(2, 5))).title() + f' {pk}'
+            items.append((('project', pk, 'title'), title))
+            if pk % 3 == 0:
+                items.append((('event', pk, 'location'), rng.choice(PLACES)))
+
+        index = PrefixIndex(max_entries=options['max_entries'])
+        started = time.perf_counter()
+        index.load(items)
+        build = time.perf_counter() - started
+
+        # Measured on a second build: tracemalloc slows allocation down a lot.
+        tracemalloc.start()
+        measured = PrefixIndex(max_entries=options['max_entries'])
+        measured.load(items)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del measured
+
+        queries = [rng.choice(WORDS + [place.lower() for place in PLACES])[:rng.randint(1, 5)]
+                   for _ in range(options['queries'])]
+        timings = []
+        for query in queries:
+            started = time.perf_counter()
+            index.lookup(query, 8)
+            timings.append(time.perf_counter() - started)
+        timings.sort()
+
+        self.stdout.write(f"texts:         {len(items)}")
+        self.stdout.write(f"keys:          {len(index)}{' (truncated)' if index.truncated else ''}")
+        self.stdout.write(f"build time:    {build * 1000:.0f} ms")
+        self.stdout.write(f"index memory:  {memory / 1024 / 1024:.1f} MB")
+        self.stdout.write(f"lookup p50:    {statistics.median(timings) * 1e6:.1f} µs")
+        self.stdout.write(f"lookup p99:    {timings[int(len(timings) * 0.99)] * 1e6:.1f} µs")
+        self.stdout.write(f"lookup max:    {timings[-1] * 1e6:.1f} µs")
@@ -0,0 +1,45 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.whatsapp_utils import FakeWhatsAppTransport, WhatsAppDispatcher
+
+
+class Command(BaseCommand):
+    help = 'Load-test the WhatsApp dispatcher offline against a fake transport.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--messages', type=int, default=1000)
+        parser.add_argument('--concurrency', type=int, default=20)
+        parser.add_argument('--latency', type=float, default=0.05, help='Simulated seconds per request.')
+        parser.add_argument('--rate-limit-every', type=int, default=0, help='Answer every Nth request with a 429.')
+        parser.add_argument('--failure-rate', type=float, default=0.0)
+        parser.add_argument('--retry-delay', type=float, default=0.1)
+        parser.add_argument('--record', action='store_true', help='Also write WhatsAppMessage rows.')
+
+    def handle(self, *args, **options):
+        transport = FakeWhatsAppTransport(
+            latency=options['latency'],
+            rate_limit_every=options['rate_limit_every'],
+            failure_rate=options['failure_rate'],
+        )
+        dispatcher = WhatsAppDispatcher(
+            transport=transport,
+            concurrency=options['concurrency'],
+            retry_delay=options['retry_delay'],
+            record_status=options['record'],
+        )
+
+        started = time.perf_counter()
+        for index in range(options['messages']):
+            dispatcher.submit(f'+9100000{index:05d}', 'Thank you for your support!')
+        submitted = time.perf_counter() - started
+        dispatcher.join()
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(f"messages:       {options['messages']}")
+        self.stdout.write(f"submit time:    {submitted * 1000:.1f} ms total")
+        self.stdout.write(f"drain time:     {elapsed:.2f}s ({options['messages'] / elapsed:.0f} msg/s)")
+        self.stdout.write(f"max in flight:  {transport.max_in_flight}")
+        self.stdout.write(f"sent / failed:  {dispatcher.stats['sent']} / {dispatcher.stats['failed']}")
+        self.stdout.write(f"429 responses:  {dispatcher.stats['rate_limited']}")
@@ -0,0 +1,20 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.uploads import expire
+
+
+class Command(BaseCommand):
+    help = 'Delete unfinished chunked uploads (and their partial files) that have not received data recently.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, default=None,
+                            help='Idle time before an upload expires (default CHUNKED_UPLOAD_EXPIRY_HOURS).')
+
+    def handle(self, *args, **options):
+        hours = options['hours'] if options['hours'] is not None else settings.CHUNKED_UPLOAD_EXPIRY_HOURS
+        count = expire(timezone.now() - timedelta(hours=hours))
+        self.stdout.write(self.style.SUCCESS(f'Expired {count} upload(s) idle for more than {hours}h'))
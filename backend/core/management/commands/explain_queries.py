@@ -0,0 +1,105 @@
+import re
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, models
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+# Plan lines that read a table or index in full, and lines that sort without an index.
+SCAN_PATTERNS = {
+    'sqlite': [re.compile(r'\bSCAN \w+')],
+    'postgresql': [re.compile(r'\bSeq Scan\b')],
+    'mysql': [re.compile(r'\btype\W+(ALL|index)\b')],
+}
+SORT_PATTERNS = {
+    'sqlite': [re.compile(r'USE TEMP B-TREE FOR (RIGHT PART OF )?ORDER BY')],
+    'postgresql': [re.compile(r'^\s*(->\s*)?Sort\b')],
+    'mysql': [re.compile(r'Using filesort')],
+}
+
+
+class Command(BaseCommand):
+    help = ("Run EXPLAIN on every registered viewset's list queryset, including keyset cursor "
+            "pages, and flag full table or index scans.")
+
+    def add_arguments(self, parser):
+        parser.add_argument('--fail-on-scan', action='store_true',
+                            help='Exit with an error if any query plan contains a full scan.')
+
+    def handle(self, *args, **options):
+        from core.urls import router
+
+        flagged = 0
+        for prefix, viewset, basename in router.registry:
+            for label, queryset in self.list_querysets(prefix, viewset):
+                plan = queryset.explain()
+                problems = self.problems(queryset, plan)
+                flagged += bool(problems)
+                style = self.style.WARNING if problems else self.style.SUCCESS
+                self.stdout.write(style(f"{prefix} [{label}]: {'FULL SCAN' if problems else 'ok'}"))
+                for line in plan.splitlines():
+                    self.stdout.write(f"    {line}")
+
+        if flagged and options['fail_on_scan']:
+            raise CommandError(f'{flagged} list queries use a full table scan')
+        self.stdout.write(f'{flagged} flagged queries')
+
+    def problems(self, queryset, plan):
+        """
+        Plan lines that make the query's cost grow with the table. A scan in
+        ORDER BY order (table or index) with no WHERE stops after LIMIT rows,
+        so only filtered scans, such as a cursor page walking the ordering
+        index from the top, and unindexed sorts are reported.
+        """
+        lines = plan.splitlines()
+        sorts = [line for line in lines if any(p.search(line) for p in SORT_PATTERNS.get(connection.vendor, []))]
+        if not queryset.query.where:
+            return sorts
+        scans = [line for line in lines if any(p.search(line) for p in SCAN_PATTERNS.get(connection.vendor, []))]
+        return sorts + scans
+
+    def list_querysets(self, prefix, viewset):
+        """Yield (label, queryset) for the plain list and each declared filter."""
+        factory = APIRequestFactory()
+        variants = [('list', {})]
+        variants += [(f'filter {field}', {field: 'x'}) for field in getattr(viewset, 'filterset_fields', [])]
+
+        seen = set()
+        for label, params in variants:
+            view = viewset()
+            view.action = 'list'
+            view.format_kwarg = None
+            view.args, view.kwargs = (), {}
+            view.request = Request(factory.get(f'/api/{prefix}/', params))
+            queryset = view.filter_queryset(view.get_queryset())
+            paginator = view.paginator
+            page_size = getattr(paginator, 'page_size', None) or 10
+
+            querysets = [(label, queryset[:page_size])]
+            keyset_class = getattr(viewset, 'keyset_pagination_class', None)
+            if keyset_class is not None:
+                keyset = keyset_class()
+                ordered = keyset.order_queryset(queryset)
+                value = self.sample_value(queryset.model._meta.get_field(keyset.ordering_field))
+                tail = ordered.filter(**{f'{keyset.ordering_field}__isnull': True})
+                querysets += [
+                    (f'{label}, keyset', ordered[:page_size]),
+                    (f'{label}, keyset cursor', ordered.filter(keyset.seek_filter(value, 1))[:page_size]),
+                    (f'{label}, keyset null tail', tail[:page_size]),
+                ]
+
+            for variant_label, variant in querysets:
+                sql = str(variant.query)
+                if sql not in seen:
+                    seen.add(sql)
+                    yield variant_label, variant
+
+    @staticmethod
+    def sample_value(field):
+        """A cursor value of the right type for ``field``; the plan does not depend on it."""
+        if isinstance(field, models.DateTimeField):
+            return timezone.now()
+        if isinstance(field, models.DateField):
+            return timezone.localdate()
+        return 0
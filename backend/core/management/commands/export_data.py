@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from core.exports import EXPORTS, OUTPUTS, export_queryset, stream_rows
+
+
+class Command(BaseCommand):
+    help = 'Stream donations, volunteers, contacts or subscribers to a CSV or NDJSON file (or stdout).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=sorted(EXPORTS))
+        parser.add_argument('--output', choices=sorted(OUTPUTS), default='csv')
+        parser.add_argument('--from', dest='start', help='First date to include (YYYY-MM-DD).')
+        parser.add_argument('--to', dest='end', help='Last date to include (YYYY-MM-DD).')
+        parser.add_argument('--filter', action='append', default=[], metavar='NAME=VALUE',
+                            help='Dataset filter, e.g. status=Completed. May be repeated.')
+        parser.add_argument('--file', help='Write here instead of stdout.')
+
+    def handle(self, *args, **options):
+        spec = EXPORTS[options['dataset']]
+        start, end = self.parse_day(options['start'], '--from'), self.parse_day(options['end'], '--to')
+        filters = {}
+        for item in options['filter']:
+            name, _, value = item.partition('=')
+            if name not in {param for param, _, _ in spec.filters}:
+                raise CommandError(f"Unknown filter for {options['dataset']}: {name}")
+            filters[name] = value
+
+        blocks = stream_rows(spec, export_queryset(spec, start, end, filters), options['output'])
+        if options['file']:
+            with open(options['file'], 'w', encoding='utf-8', newline='') as handle:
+                handle.writelines(blocks)
+        else:
+            for block in blocks:
+                self.stdout.write(block, ending='')
+
+    def parse_day(self, value, name):
+        if not value:
+            return None
+        try:
+            day = parse_date(value)
+        except ValueError:
+            day = None
+        if day is None:
+            raise CommandError(f'{name} must be a date (YYYY-MM-DD)')
+        return day
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from core.writebehind import MODELS, flush, pending_bytes
+
+
+class Command(BaseCommand):
+    help = ('Insert buffered contact, newsletter and donation submissions now, including files '
+            'left by workers that stopped without flushing.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--status', action='store_true', help='Only report how many bytes are buffered per model.')
+
+    def handle(self, *args, **options):
+        for model_name in MODELS:
+            if options['status']:
+                self.stdout.write(f'{model_name}: {pending_bytes(model_name)} byte(s) buffered')
+                continue
+            written = flush(model_name)
+            self.stdout.write(self.style.SUCCESS(f'{model_name}: {written} row(s) inserted'))
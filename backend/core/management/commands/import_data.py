@@ -0,0 +1,44 @@
+import json
+import os
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.imports import IMPORTS, INPUTS, guess_input, import_records
+
+
+class Command(BaseCommand):
+    help = ('Bulk import translations, volunteers or newsletter subscribers from CSV, NDJSON or a JSON array. '
+            'Invalid rows are reported and skipped.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('dataset', choices=sorted(IMPORTS))
+        parser.add_argument('path', help='Input file, or - for stdin.')
+        parser.add_argument('--input', choices=INPUTS, help='Input format (default: from the file extension).')
+        parser.add_argument('--dry-run', action='store_true', help='Validate every row without writing.')
+        parser.add_argument('--errors', help='Write the per-row errors to this JSON file.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        input_format = options['input'] or guess_input(path)
+        started = time.perf_counter()
+        if path == '-':
+            result = import_records(options['dataset'], sys.stdin.buffer, input_format, options['dry_run'])
+        else:
+            if not os.path.exists(path):
+                raise CommandError(f'No such file: {path}')
+            with open(path, 'rb') as handle:
+                result = import_records(options['dataset'], handle, input_format, options['dry_run'])
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(f"{result['rows']} row(s) read, {result['imported']} "
+                          f"{'valid' if options['dry_run'] else 'imported'}, {result['failed']} failed "
+                          f"in {elapsed:.1f}s")
+        for error in result['errors'][:20]:
+            self.stdout.write(f"  row {error['row']}: {json.dumps(error['errors'])}")
+        if result['failed'] > 20:
+            self.stdout.write(f"  ... {result['failed'] - 20} more")
+        if options['errors']:
+            with open(options['errors'], 'w', encoding='utf-8') as handle:
+                json.dump(result['errors'], handle, indent=2)
@@ -0,0 +1,137 @@
+import os
+from collections import Counter
+
+from django.apps import apps
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import FileField
+
+from core.cache import bump_model_version
+from core.images import IMAGE_FIELDS
+from core.models import StoredFile
+from core.storage import ContentAddressedStorage
+
+
+def file_models():
+    """(model, file field names, variants field or None) for every core model with files."""
+    for model in apps.get_app_config('core').get_models():
+        fields = [field.name for field in model._meta.fields if isinstance(field, FileField)]
+        if fields:
+            spec = IMAGE_FIELDS.get(model)
+            yield model, fields, spec.variants_field if spec else None
+
+
+def variant_names(variants):
+    for fmt, names in (variants or {}).items():
+        if fmt != 'source':
+            yield from names.values()
+
+
+class Command(BaseCommand):
+    help = ('Move media saved under the old upload_to directories into content-addressed storage, '
+            'rewrite the stored names (including image variants), then recount blob references.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report what would move without changing anything.')
+        parser.add_argument('--keep-legacy', action='store_true', help='Leave the old files in place after moving.')
+        parser.add_argument('--prune', action='store_true',
+                            help='Delete content-addressed blobs that nothing references any more, including '
+                                 'blobs whose references were never given back when a file was replaced.')
+
+    def handle(self, *args, **options):
+        self.storage = default_storage
+        if not isinstance(self.storage, ContentAddressedStorage):
+            raise CommandError('The default storage is not core.storage.ContentAddressedStorage (see STORAGES).')
+        self.dry_run = options['dry_run']
+        self.moved, self.missing = {}, []
+
+        for model, fields, variants_field in file_models():
+            updated = 0
+            for instance in model.objects.order_by('pk').iterator(chunk_size=500):
+                updates = {}
+                for field in fields:
+                    name = getattr(instance, field).name
+                    new_name = self.convert(name)
+                    if new_name != name:
+                        updates[field] = new_name
+                variants = getattr(instance, variants_field) if variants_field else None
+                if variants:
+                    converted = {
+                        fmt: (self.convert(names) if fmt == 'source'
+                              else {width: self.convert(name) for width, name in names.items()})
+                        for fmt, names in variants.items()
+                    }
+                    if converted != variants:
+                        updates[variants_field] = converted
+                if updates:
+                    updated += 1
+                    if not self.dry_run:
+                        model.objects.filter(pk=instance.pk).update(**updates)
+            if updated:
+                self.stdout.write(f'{model.__name__}: {updated} object(s) updated')
+                if not self.dry_run:
+                    bump_model_version(model)
+
+        self.stdout.write(f'{len(self.moved)} legacy file(s) moved, {len(self.missing)} missing')
+        for name in self.missing:
+            self.stdout.write(f'  missing: {name}')
+        if self.dry_run:
+            return
+        if not options['keep_legacy']:
+            for name in self.moved:
+                self.storage.delete(name)
+        self.recount(options['prune'])
+
+    def convert(self, name):
+        if not name or self.storage.is_hashed(name):
+            return name
+        if name in self.moved:
+            return self.moved[name]
+        if not self.storage.exists(name):
+            self.missing.append(name)
+            return name
+        if self.dry_run:
+            self.moved[name] = name
+            return name
+        with self.storage.open(name, 'rb') as handle:
+            self.moved[name] = self.storage.save(name, handle)
+        return self.moved[name]
+
+    def recount(self, prune):
+        references = Counter()
+        for model, fields, variants_field in file_models():
+            for row in model.objects.values_list(*fields, *([variants_field] if variants_field else [])).iterator():
+                names = [name for name in row[:len(fields)] if name]
+                if variants_field:
+                    names.extend(variant_names(row[-1]))
+                references.update(name for name in names if self.storage.is_hashed(name))
+
+        known = dict(StoredFile.objects.values_list('name', 'refcount'))
+        for name, count in references.items():
+            if name not in known:
+                size = self.storage.size(name) if self.storage.exists(name) else 0
+                StoredFile.objects.create(name=name, size=size, refcount=count)
+            elif known[name] != count:
+                StoredFile.objects.filter(name=name).update(refcount=count)
+        stale = [name for name, count in known.items() if count and name not in references]
+        for start in range(0, len(stale), 500):
+            StoredFile.objects.filter(name__in=stale[start:start + 500]).update(refcount=0)
+        self.stdout.write(f'{len(references)} referenced blob(s)')
+
+        if not prune:
+            return
+        pruned = 0
+        for name in StoredFile.objects.filter(refcount=0).values_list('name', flat=True):
+            self.storage.delete(name)
+            pruned += 1
+        # Blobs written without a row (for example an interrupted save); .tmp files may be saves in progress.
+        root = self.storage.path(self.storage.prefix)
+        for directory, _, filenames in os.walk(root):
+            for filename in filenames:
+                if filename.endswith('.tmp'):
+                    continue
+                name = os.path.relpath(os.path.join(directory, filename), self.storage.location).replace(os.sep, '/')
+                if name not in references and not StoredFile.objects.filter(name=name).exists():
+                    os.remove(os.path.join(directory, filename))
+                    pruned += 1
+        self.stdout.write(f'{pruned} unreferenced blob(s) deleted')
@@ -0,0 +1,67 @@
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.image_ops import process_image
+from core.images import IMAGE_FIELDS, process_args, get_pool, outdated_parts, store_result
+
+
+class Command(BaseCommand):
+    help = ('Backfill image variants and metadata (dimensions, dominant colour, blurhash) '
+            'for existing media using the image process pool.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', action='append', dest='models',
+                            help='Only process this model (e.g. gallery). May be repeated.')
+        parser.add_argument('--all', action='store_true',
+                            help='Reprocess every image, not only those with missing or stale data.')
+        parser.add_argument('--in-flight', type=int, default=8,
+                            help='Maximum images submitted to the pool at once.')
+
+    def handle(self, *args, **options):
+        models = {model._meta.model_name: model for model in IMAGE_FIELDS}
+        selected = options['models'] or list(models)
+        unknown = set(selected) - set(models)
+        if unknown:
+            raise CommandError(f"Unknown model(s): {', '.join(sorted(unknown))}")
+
+        pool = get_pool()
+        processed = failed = 0
+        pending = {}
+        for name in selected:
+            model = models[name]
+            spec = IMAGE_FIELDS[model]
+            queryset = model.objects.exclude(**{spec.field: ''}).exclude(**{f'{spec.field}__isnull': True})
+            for instance in queryset.order_by('pk').iterator(chunk_size=200):
+                variants, metadata = (True, True) if options['all'] else outdated_parts(instance)
+                if not (variants or metadata):
+                    continue
+                file = getattr(instance, spec.field)
+                try:
+                    args = process_args(file, variants and bool(spec.variants_field), metadata and spec.metadata)
+                except Exception as exc:
+                    self.stderr.write(f'{name} {instance.pk}: {exc}')
+                    failed += 1
+                    continue
+                pending[pool.submit(process_image, *args)] = (model, instance.pk, file.name)
+                if len(pending) >= options['in_flight']:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    ok, errors = self.store(pending, done)
+                    processed, failed = processed + ok, failed + errors
+        if pending:
+            ok, errors = self.store(pending, list(pending))
+            processed, failed = processed + ok, failed + errors
+
+        self.stdout.write(self.style.SUCCESS(f'Processed {processed} images ({failed} failed)'))
+
+    def store(self, pending, done):
+        ok = errors = 0
+        for future in done:
+            model, pk, name = pending.pop(future)
+            try:
+                store_result(model, pk, name, future.result())
+                ok += 1
+            except Exception as exc:
+                self.stderr.write(f'{model._meta.model_name} {pk}: {exc}')
+                errors += 1
+        return ok, errors
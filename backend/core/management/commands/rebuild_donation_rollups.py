@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from core.rollups import rebuild_rollups
+
+
+class Command(BaseCommand):
+    help = 'Recompute DonationRollup rows from Donation, optionally for a date range only.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--from', dest='start', help='First day to rebuild (YYYY-MM-DD).')
+        parser.add_argument('--to', dest='end', help='Last day to rebuild (YYYY-MM-DD).')
+
+    def handle(self, *args, **options):
+        start, end = self.parse(options['start']), self.parse(options['end'])
+        buckets = rebuild_rollups(start, end)
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {buckets} rollup buckets'))
+
+    def parse(self, value):
+        if value is None:
+            return None
+        try:
+            day = parse_date(value)
+        except ValueError:
+            day = None
+        if day is None:
+            raise CommandError(f'Invalid date: {value}')
+        return day
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core import search
+
+
+class Command(BaseCommand):
+    help = 'Repopulate the full-text search index (SQLite FTS5) from the content tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', action='append', dest='models',
+                            help=f"Only rebuild this model ({', '.join(search.MODELS)}). May be repeated.")
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            raise CommandError('Full-text search requires the SQLite backend')
+        names = options['models'] or list(search.MODELS)
+        unknown = set(names) - set(search.MODELS)
+        if unknown:
+            raise CommandError(f"Unknown model(s): {', '.join(sorted(unknown))}")
+        count = search.rebuild([search.MODELS[name] for name in names])
+        self.stdout.write(self.style.SUCCESS(f'Indexed {count} objects'))
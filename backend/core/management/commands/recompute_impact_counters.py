@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.impact import recompute_counters
+
+
+class Command(BaseCommand):
+    help = 'Recompute every non-manual Impact counter from its source data.'
+
+    def handle(self, *args, **options):
+        updated = recompute_counters()
+        self.stdout.write(self.style.SUCCESS(f'Recomputed {updated} impact counters'))
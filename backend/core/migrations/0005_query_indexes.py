@@ -0,0 +1,49 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_career_contact_event_gallery_impact_language_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='career',
+            index=models.Index(fields=['-created_at', '-id'], name='core_career_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contact',
+            index=models.Index(fields=['-created_at', '-id'], name='core_contact_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='donation',
+            index=models.Index(fields=['-date', '-id'], name='core_donation_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['-date', '-id'], name='core_event_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gallery',
+            index=models.Index(fields=['-created_at', '-id'], name='core_gallery_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='gallery',
+            index=models.Index(fields=['category', '-created_at', '-id'], name='core_gallery_category_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['-created_at', '-id'], name='core_project_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='testimonial',
+            index=models.Index(fields=['-created_at', '-id'], name='core_testimonial_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='translation',
+            index=models.Index(fields=['model_name', 'object_id', 'field_name'], name='core_translation_object_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:10
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NewsletterCampaign',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(blank=True, max_length=255, null=True)),
+                ('body', models.TextField(blank=True, null=True)),
+                ('html_body', models.TextField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('Draft', 'Draft'), ('Sending', 'Sending'), ('Sent', 'Sent')], default='Draft', max_length=20)),
+                ('last_subscriber_id', models.BigIntegerField(default=0)),
+                ('sent_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(blank=True, default=django.utils.timezone.now, null=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:11
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_newslettercampaign'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WhatsAppMessage',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('to_number', models.CharField(blank=True, max_length=20, null=True)),
+                ('body', models.TextField(blank=True, null=True)),
+                ('status', models.CharField(choices=[('Queued', 'Queued'), ('Sent', 'Sent'), ('Failed', 'Failed')], default='Queued', max_length=20)),
+                ('sid', models.CharField(blank=True, max_length=64, null=True)),
+                ('attempts', models.IntegerField(default=0)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(blank=True, default=django.utils.timezone.now, null=True)),
+                ('updated_at', models.DateTimeField(blank=True, default=django.utils.timezone.now, null=True)),
+            ],
+        ),
+    ]
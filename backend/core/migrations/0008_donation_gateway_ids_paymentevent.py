@@ -0,0 +1,48 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_whatsappmessage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='donation',
+            name='email',
+            field=models.EmailField(blank=True, max_length=254, null=True),
+        ),
+        migrations.AddField(
+            model_name='donation',
+            name='order_id',
+            field=models.CharField(blank=True, db_index=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='donation',
+            name='payment_id',
+            field=models.CharField(blank=True, db_index=True, max_length=100, null=True),
+        ),
+        migrations.AddField(
+            model_name='donation',
+            name='phone',
+            field=models.CharField(blank=True, max_length=20, null=True),
+        ),
+        migrations.CreateModel(
+            name='PaymentEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_id', models.CharField(max_length=100, unique=True)),
+                ('gateway', models.CharField(default='razorpay', max_length=20)),
+                ('event_type', models.CharField(blank=True, max_length=100, null=True)),
+                ('payload', models.JSONField(blank=True, default=dict, null=True)),
+                ('received_at', models.DateTimeField(blank=True, default=django.utils.timezone.now, null=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('donation', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='core.donation')),
+            ],
+        ),
+    ]
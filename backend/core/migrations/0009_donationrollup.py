@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_donation_gateway_ids_paymentevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DonationRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('purpose', models.CharField(blank=True, default='', max_length=255)),
+                ('status', models.CharField(max_length=20)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'day'], name='core_rollup_status_day_idx')],
+                'unique_together': {('day', 'purpose', 'status')},
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_donationrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='impact',
+            name='source',
+            field=models.CharField(choices=[('manual', 'Manual'), ('donations_total', 'Completed donations (amount)'), ('donations_count', 'Completed donations (count)'), ('volunteers_active', 'Active volunteers'), ('project_impact', 'Project impact number')], default='manual', max_length=30),
+        ),
+        migrations.AddField(
+            model_name='impact',
+            name='source_key',
+            field=models.CharField(blank=True, max_length=100, null=True),
+        ),
+    ]
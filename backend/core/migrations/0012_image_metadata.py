@@ -0,0 +1,93 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_image_variants'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='image_blurhash',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='image_color',
+            field=models.CharField(blank=True, max_length=7, null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='gallery',
+            name='image_blurhash',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='gallery',
+            name='image_color',
+            field=models.CharField(blank=True, max_length=7, null=True),
+        ),
+        migrations.AddField(
+            model_name='gallery',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='gallery',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='galleryimage',
+            name='image_blurhash',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='galleryimage',
+            name='image_color',
+            field=models.CharField(blank=True, max_length=7, null=True),
+        ),
+        migrations.AddField(
+            model_name='galleryimage',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='galleryimage',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='image_blurhash',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='image_color',
+            field=models.CharField(blank=True, max_length=7, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='image_height',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='image_width',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
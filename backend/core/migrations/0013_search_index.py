@@ -0,0 +1,32 @@
+from django.db import migrations
+
+
+class SQLiteRunSQL(migrations.RunSQL):
+    """RunSQL that is a no-op on other backends; FTS5 exists only in SQLite."""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'sqlite':
+            super().database_forwards(app_label, schema_editor, from_state, to_state)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor == 'sqlite':
+            super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_image_metadata'),
+    ]
+
+    operations = [
+        # FTS5 virtual table; populate with `manage.py rebuild_search_index`.
+        SQLiteRunSQL(
+            sql=(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS core_search_index USING fts5("
+                "model UNINDEXED, object_id UNINDEXED, language UNINDEXED, title, body, "
+                "tokenize = 'porter unicode61 remove_diacritics 2', prefix = '2 3')"
+            ),
+            reverse_sql="DROP TABLE IF EXISTS core_search_index",
+        ),
+    ]
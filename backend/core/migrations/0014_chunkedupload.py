@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:31
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('core', '0013_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChunkedUpload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('filename', models.CharField(max_length=255)),
+                ('size', models.BigIntegerField()),
+                ('offset', models.BigIntegerField(default=0)),
+                ('target', models.CharField(choices=[('report', 'Report file'), ('gallery', 'Gallery image'), ('galleryimage', 'Gallery batch image')], max_length=20)),
+                ('object_id', models.IntegerField(blank=True, null=True)),
+                ('title', models.CharField(blank=True, max_length=255, null=True)),
+                ('checksum', models.CharField(blank=True, max_length=64, null=True)),
+                ('sha256', models.CharField(blank=True, max_length=64, null=True)),
+                ('status', models.CharField(choices=[('Uploading', 'Uploading'), ('Complete', 'Complete')], default='Uploading', max_length=20)),
+                ('created_at', models.DateTimeField(blank=True, default=django.utils.timezone.now, null=True)),
+                ('updated_at', models.DateTimeField(blank=True, default=django.utils.timezone.now, null=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
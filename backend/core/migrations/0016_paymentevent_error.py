@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 17:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_storedfile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='paymentevent',
+            name='error',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
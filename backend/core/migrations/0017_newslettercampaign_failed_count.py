@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 18:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_paymentevent_error'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='newslettercampaign',
+            name='failed_count',
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-18 18:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_newslettercampaign_failed_count'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chunkedupload',
+            index=models.Index(fields=['-created_at'], name='core_upload_created_idx'),
+        ),
+    ]
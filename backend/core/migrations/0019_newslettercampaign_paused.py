@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-18 18:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_chunkedupload_created_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='newslettercampaign',
+            name='status',
+            field=models.CharField(choices=[('Draft', 'Draft'), ('Sending', 'Sending'), ('Paused', 'Paused'), ('Sent', 'Sent')], default='Draft', max_length=20),
+        ),
+    ]
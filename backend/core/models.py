@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.db import models
 from django.utils.text import slugify
 from django.utils import timezone
@@ -25,12 +26,22 @@ class Project(models.Model):
     description = models.TextField(null=True, blank=True)
     category = models.CharField(max_length=50, null=True, blank=True)
     image = models.ImageField(upload_to='projects/', null=True, blank=True)
+    image_variants = models.JSONField(default=dict, blank=True, null=True)
+    image_width = models.PositiveIntegerField(null=True, blank=True)
+    image_height = models.PositiveIntegerField(null=True, blank=True)
+    image_color = models.CharField(max_length=7, null=True, blank=True)
+    image_blurhash = models.CharField(max_length=64, null=True, blank=True)
     start_date = models.DateField(null=True, blank=True)
     end_date = models.DateField(null=True, blank=True)
     status = models.CharField(max_length=20, null=True, blank=True)
     impact_numbers = models.JSONField(default=dict, blank=True, null=True)
     created_at = models.DateTimeField(default=timezone.now, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='core_project_created_idx'),
+        ]
+
     def __str__(self):
         return self.title or "Untitled"
 
@@ -47,6 +58,10 @@ class Report(models.Model):
 class GalleryImage(models.Model):
     title = models.CharField(max_length=255, blank=True, null=True)
     image = models.ImageField(upload_to="gallery/", null=True, blank=True)
+    image_width = models.PositiveIntegerField(null=True, blank=True)
+    image_height = models.PositiveIntegerField(null=True, blank=True)
+    image_color = models.CharField(max_length=7, null=True, blank=True)
+    image_blurhash = models.CharField(max_length=64, null=True, blank=True)
     caption = models.CharField(max_length=255, blank=True, null=True)
     created_at = models.DateTimeField(default=timezone.now, null=True, blank=True)
 
@@ -56,6 +71,7 @@ class TeamMember(models.Model):
     role = models.CharField(max_length=200, null=True, blank=True)
     bio = models.TextField(blank=True, null=True)
     photo = models.ImageField(upload_to="team/", blank=True, null=True)
+    photo_variants = models.JSONField(default=dict, blank=True, null=True)
     created_at = models.DateTimeField(default=timezone.now, null=True, blank=True)
 
     def __str__(self):
@@ -85,11 +101,54 @@ class Donation(models.Model):
     purpose = models.CharField(max_length=255, null=True, blank=True)
     date = models.DateField(default=timezone.now, null=True, blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="Pending")
+    email = models.EmailField(null=True, blank=True)
+    phone = models.CharField(max_length=20, null=True, blank=True)
+    order_id = models.CharField(max_length=100, null=True, blank=True, db_index=True)
+    payment_id = models.CharField(max_length=100, null=True, blank=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-date', '-id'], name='core_donation_date_idx'),
+        ]
 
     def __str__(self):
         return f"{self.donor or 'Anonymous'} - {self.amount or 0}"
 
 
+class DonationRollup(models.Model):
+    # Running totals per (day, purpose, status), maintained by core.rollups.
+    day = models.DateField()
+    purpose = models.CharField(max_length=255, default="", blank=True)
+    status = models.CharField(max_length=20)
+    total = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = ('day', 'purpose', 'status')
+        indexes = [
+            models.Index(fields=['status', 'day'], name='core_rollup_status_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.purpose or '-'} {self.status}: {self.total}"
+
+
+class PaymentEvent(models.Model):
+    # One row per gateway webhook delivery; the unique event_id makes retries no-ops.
+    event_id = models.CharField(max_length=100, unique=True)
+    gateway = models.CharField(max_length=20, default="razorpay")
+    event_type = models.CharField(max_length=100, null=True, blank=True)
+    payload = models.JSONField(default=dict, blank=True, null=True)
+    donation = models.ForeignKey(Donation, on_delete=models.SET_NULL, null=True, blank=True)
+    received_at = models.DateTimeField(default=timezone.now, null=True, blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    # Why the event did not change the donation, e.g. a captured amount that differs from it
+    error = models.CharField(max_length=255, blank=True, default="")
+
+    def __str__(self):
+        return f"{self.gateway} {self.event_type or 'event'} {self.event_id}"
+
+
 class Volunteer(models.Model):
     STATUS_CHOICES = [
         ("Pending", "Pending"),
@@ -133,11 +192,21 @@ class Contact(models.Model):
         ('resolved', 'Resolved')
     ], default='new')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='core_contact_created_idx'),
+        ]
+
 
 class Gallery(models.Model):
     title = models.CharField(max_length=200, null=True, blank=True)
     description = models.TextField(null=True, blank=True)
     image = models.ImageField(upload_to='gallery/', null=True, blank=True)
+    image_variants = models.JSONField(default=dict, blank=True, null=True)
+    image_width = models.PositiveIntegerField(null=True, blank=True)
+    image_height = models.PositiveIntegerField(null=True, blank=True)
+    image_color = models.CharField(max_length=7, null=True, blank=True)
+    image_blurhash = models.CharField(max_length=64, null=True, blank=True)
     category = models.CharField(max_length=50, null=True, blank=True)
     is_featured = models.BooleanField(default=False)
     created_at = models.DateTimeField(default=timezone.now, null=True, blank=True)
@@ -145,6 +214,10 @@ class Gallery(models.Model):
     class Meta:
         verbose_name_plural = "Galleries"
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='core_gallery_created_idx'),
+            models.Index(fields=['category', '-created_at', '-id'], name='core_gallery_category_idx'),
+        ]
 
     def __str__(self):
         return self.title or "Gallery"
@@ -156,16 +229,38 @@ class Event(models.Model):
     date = models.DateTimeField(null=True, blank=True)
     location = models.CharField(max_length=200, null=True, blank=True)
     image = models.ImageField(upload_to='events/', null=True, blank=True)
+    image_variants = models.JSONField(default=dict, blank=True, null=True)
+    image_width = models.PositiveIntegerField(null=True, blank=True)
+    image_height = models.PositiveIntegerField(null=True, blank=True)
+    image_color = models.CharField(max_length=7, null=True, blank=True)
+    image_blurhash = models.CharField(max_length=64, null=True, blank=True)
     status = models.CharField(max_length=20, null=True, blank=True)
     created_at = models.DateTimeField(default=timezone.now, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-date', '-id'], name='core_event_date_idx'),
+        ]
+
 
 class Impact(models.Model):
+    SOURCE_CHOICES = [
+        ("manual", "Manual"),
+        ("donations_total", "Completed donations (amount)"),
+        ("donations_count", "Completed donations (count)"),
+        ("volunteers_active", "Active volunteers"),
+        ("project_impact", "Project impact number"),
+    ]
+
     title = models.CharField(max_length=200, null=True, blank=True)
     number = models.IntegerField(null=True, blank=True)
     description = models.TextField(null=True, blank=True)
     icon = models.CharField(max_length=50, null=True, blank=True)
     created_at = models.DateTimeField(default=timezone.now, null=True, blank=True)
+    # Non-manual counters are kept up to date by core.impact; source_key is the
+    # Project.impact_numbers key, or a donation purpose to narrow donation counters.
+    source = models.CharField(max_length=30, choices=SOURCE_CHOICES, default="manual")
+    source_key = models.CharField(max_length=100, null=True, blank=True)
 
 
 class Testimonial(models.Model):
@@ -175,6 +270,11 @@ class Testimonial(models.Model):
     image = models.ImageField(upload_to='testimonials/', null=True, blank=True)
     created_at = models.DateTimeField(default=timezone.now, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='core_testimonial_created_idx'),
+        ]
+
 
 class Career(models.Model):
     title = models.CharField(max_length=200, null=True, blank=True)
@@ -185,6 +285,11 @@ class Career(models.Model):
     status = models.CharField(max_length=20, null=True, blank=True)
     created_at = models.DateTimeField(default=timezone.now, null=True, blank=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='core_career_created_idx'),
+        ]
+
 
 class Language(models.Model):
     name = models.CharField(max_length=50, null=True, blank=True)
@@ -201,6 +306,10 @@ class Translation(models.Model):
 
     class Meta:
         unique_together = ('language', 'model_name', 'field_name', 'object_id')
+        indexes = [
+            # The unique index leads with language; this one serves per-object lookups.
+            models.Index(fields=['model_name', 'object_id', 'field_name'], name='core_translation_object_idx'),
+        ]
 
 
 class Newsletter(models.Model):
@@ -210,3 +319,96 @@ class Newsletter(models.Model):
 
     def __str__(self):
         return self.email or "Unknown"
+
+
+class NewsletterCampaign(models.Model):
+    STATUS_CHOICES = [
+        ("Draft", "Draft"),
+        ("Sending", "Sending"),
+        # Stopped by an error (e.g. the mail server stayed unreachable); re-running resumes it.
+        ("Paused", "Paused"),
+        ("Sent", "Sent"),
+    ]
+
+    subject = models.CharField(max_length=255, null=True, blank=True)
+    body = models.TextField(null=True, blank=True)
+    html_body = models.TextField(null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="Draft")
+    # Checkpoint: subscribers are sent in id order, so a resumed run continues after this id.
+    last_subscriber_id = models.BigIntegerField(default=0)
+    sent_count = models.IntegerField(default=0)
+    # Recipients the server refused outright; they are skipped, not retried.
+    failed_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now, null=True, blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return self.subject or "Campaign"
+
+
+class WhatsAppMessage(models.Model):
+    STATUS_CHOICES = [
+        ("Queued", "Queued"),
+        ("Sent", "Sent"),
+        ("Failed", "Failed"),
+    ]
+
+    to_number = models.CharField(max_length=20, null=True, blank=True)
+    body = models.TextField(null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="Queued")
+    sid = models.CharField(max_length=64, null=True, blank=True)
+    attempts = models.IntegerField(default=0)
+    error = models.TextField(null=True, blank=True)
+    created_at = models.DateTimeField(default=timezone.now, null=True, blank=True)
+    updated_at = models.DateTimeField(default=timezone.now, null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.to_number or 'Unknown'} - {self.status}"
+
+
+class ChunkedUpload(models.Model):
+    # A resumable upload; chunks are appended to a partial file (see core.uploads).
+    STATUS_CHOICES = [
+        ("Uploading", "Uploading"),
+        ("Complete", "Complete"),
+    ]
+    TARGET_CHOICES = [
+        ("report", "Report file"),
+        ("gallery", "Gallery image"),
+        ("galleryimage", "Gallery batch image"),
+    ]
+
+    filename = models.CharField(max_length=255)
+    size = models.BigIntegerField()
+    offset = models.BigIntegerField(default=0)
+    target = models.CharField(max_length=20, choices=TARGET_CHOICES)
+    object_id = models.IntegerField(null=True, blank=True)
+    title = models.CharField(max_length=255, null=True, blank=True)
+    # Optional client-supplied SHA-256, checked at finalize; sha256 is the computed digest.
+    checksum = models.CharField(max_length=64, null=True, blank=True)
+    sha256 = models.CharField(max_length=64, null=True, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="Uploading")
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL)
+    created_at = models.DateTimeField(default=timezone.now, null=True, blank=True)
+    updated_at = models.DateTimeField(default=timezone.now, null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at'], name='core_upload_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
+
+
+class StoredFile(models.Model):
+    # One row per content-addressed blob; refcount is the number of saves not yet deleted (see core.storage).
+    name = models.CharField(max_length=255, unique=True)
+    size = models.BigIntegerField(default=0)
+    refcount = models.IntegerField(default=0)
+    created_at = models.DateTimeField(default=timezone.now, null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.refcount})"
@@ -0,0 +1,136 @@
+import base64
+import json
+from collections import OrderedDict
+
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Seek pagination on (``ordering_field`` DESC, id DESC). Each page is a
+    single indexed range query, with no COUNT(*) and no OFFSET, so deep
+    pages cost the same as the first. NULL values sort last.
+    """
+    ordering_field = 'created_at'
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def order_queryset(self, queryset):
+        return queryset.order_by(F(self.ordering_field).desc(nulls_last=True), '-pk')
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        field = self.ordering_field
+        self.model_field = queryset.model._meta.get_field(field)
+
+        queryset = self.order_queryset(queryset)
+        limit = self.page_size + 1
+        cursor = self.decode_cursor(request)
+        if cursor is None:
+            results = list(queryset[:limit])
+        else:
+            value, pk = cursor
+            if value is None:
+                results = list(queryset.filter(**{f'{field}__isnull': True, 'pk__lt': pk})[:limit])
+            else:
+                results = list(queryset.filter(self.seek_filter(value, pk))[:limit])
+                if len(results) < limit:
+                    # The non-NULL run is exhausted; continue into the NULL tail.
+                    tail = queryset.filter(**{f'{field}__isnull': True})
+                    results += list(tail[:limit - len(results)])
+
+        self.has_next = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        return self.page
+
+    def seek_filter(self, value, pk):
+        """
+        Rows after a non-NULL cursor, excluding the NULL tail. The redundant
+        ``field <= value`` bound gives the planner an index range to seek to;
+        the OR alone (or with an IS NULL branch) is a full index scan.
+        """
+        field = self.ordering_field
+        return Q(**{f'{field}__lte': value}) & (Q(**{f'{field}__lt': value}) | Q(**{field: value, 'pk__lt': pk}))
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            value, pk = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            if value is not None:
+                value = self.model_field.to_python(value)
+            return value, int(pk)
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, instance):
+        value = getattr(instance, self.ordering_field)
+        # isoformat() keeps microseconds, which DjangoJSONEncoder truncates
+        payload = json.dumps([value.isoformat() if value is not None else None, instance.pk])
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class CreatedAtKeysetPagination(KeysetPagination):
+    ordering_field = 'created_at'
+
+
+class DateKeysetPagination(KeysetPagination):
+    ordering_field = 'date'
+
+
+class KeysetPaginationMixin:
+    """
+    Opt-in keyset pagination for a viewset. Page-number pagination stays the
+    default; clients switch with ``?pagination=cursor`` (or by following a
+    ``next`` link that carries a cursor).
+    """
+    keyset_pagination_class = None
+
+    def use_keyset_pagination(self):
+        params = self.request.query_params
+        return 'cursor' in params or params.get('pagination') == 'cursor'
+
+    @property
+    def paginator(self):
+        if (not hasattr(self, '_paginator') and self.keyset_pagination_class is not None
+                and self.use_keyset_pagination()):
+            self._paginator = self.keyset_pagination_class()
+        return super().paginator
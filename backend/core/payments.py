@@ -1,13 +1,25 @@
+import hashlib
+import hmac
+import json
+import logging
 import os
-import razorpay
-import stripe
+from decimal import Decimal, InvalidOperation
 from django.conf import settings
-from rest_framework.decorators import api_view
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
+from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
-from .models import Donation
+from .models import Donation, PaymentEvent
+from .integrations import get_client
 
-razorpay_client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
-stripe.api_key = settings.STRIPE_SECRET_KEY
+logger = logging.getLogger(__name__)
+
+# Gateway events that move a donation to a new status
+WEBHOOK_STATUS = {
+    'payment.captured': 'Completed',
+    'order.paid': 'Completed',
+}
 
 def create_payment_order(donation):
     """
@@ -23,17 +35,38 @@ def create_payment_order(donation):
         "status": "created",
     }
 
+PAYMENT_CURRENCY = "INR"
+
+def to_paise(amount):
+    return int((Decimal(str(amount)) * 100).quantize(Decimal(1)))
+
 @api_view(['POST'])
+@authentication_classes([])
+@permission_classes([AllowAny])
 def create_payment(request):
     try:
         amount = request.data.get('amount')
-        currency = "INR"
-        
-        payment = razorpay_client.order.create({
-            'amount': int(float(amount) * 100),
+        currency = PAYMENT_CURRENCY
+
+        # An order for a donation always bills the donation's own amount; the webhook checks it again.
+        donation_id = request.data.get('donation_id')
+        donation = None
+        if donation_id:
+            donation = Donation.objects.filter(pk=donation_id).first()
+            if donation is None:
+                return Response({'error': 'Donation not found'}, status=404)
+            if donation.status != 'Pending' or not donation.amount:
+                return Response({'error': 'Donation cannot be paid'}, status=400)
+            amount = donation.amount
+
+        payment = get_client('razorpay').order.create({
+            'amount': to_paise(amount),
             'currency': currency,
             'payment_capture': 1
         })
+
+        if donation is not None:
+            Donation.objects.filter(pk=donation.pk).update(order_id=payment['id'])
         
         return Response({
             'id': payment['id'],
@@ -44,6 +77,8 @@ def create_payment(request):
         return Response({'error': str(e)}, status=400)
 
 @api_view(['POST'])
+@authentication_classes([])
+@permission_classes([AllowAny])
 def payment_callback(request):
     try:
         payment_id = request.data.get('razorpay_payment_id')
@@ -51,24 +86,128 @@ def payment_callback(request):
         signature = request.data.get('razorpay_signature')
         
         # Verify signature
-        razorpay_client.utility.verify_payment_signature({
+        get_client('razorpay').utility.verify_payment_signature({
             'razorpay_payment_id': payment_id,
             'razorpay_order_id': order_id,
             'razorpay_signature': signature
         })
         
         # Update donation status
-        donation = Donation.objects.get(payment_id=order_id)
-        donation.status = 'completed'
-        donation.save()
+        with transaction.atomic():
+            donation, _ = apply_payment_status(order_id, payment_id, 'Completed')
+        if donation is None:
+            return Response({'error': 'Donation not found'}, status=404)
         
         return Response({'status': 'success'})
     except Exception as e:
         return Response({'error': str(e)}, status=400)
 
+def payment_mismatch(donation, amount, currency):
+    """Why a captured ``amount`` (paise) / ``currency`` cannot complete ``donation``, or '' when it matches."""
+    if (currency or '').upper() != PAYMENT_CURRENCY:
+        return f'currency {currency!r} does not match {PAYMENT_CURRENCY}'
+    try:
+        expected = to_paise(donation.amount)
+        paid = int(amount)
+    except (TypeError, ValueError, InvalidOperation):
+        return f'amount {amount!r} cannot be checked against donation amount {donation.amount!r}'
+    if paid != expected:
+        return f'amount {paid} does not match donation amount {expected}'
+    return ''
+
+def apply_payment_status(order_id, payment_id, new_status, amount=None, currency=None, check_amount=False):
+    """
+    Move the donation for ``order_id`` to ``new_status`` under a row lock and
+    return (donation or None, mismatch message). Only Pending -> Completed is
+    a transition; anything else is a no-op, so replays and out-of-order
+    events are harmless. With ``check_amount`` the captured ``amount`` (paise)
+    and ``currency`` must match the donation, otherwise it stays Pending.
+    Receipts and notifications are deferred until the transaction commits.
+    Must run inside an atomic block.
+    """
+    if not order_id:
+        return None, ''
+    donation = Donation.objects.select_for_update().filter(order_id=order_id).first()
+    if donation is None:
+        return None, ''
+    if new_status == 'Completed' and donation.status == 'Pending':
+        mismatch = payment_mismatch(donation, amount, currency) if check_amount else ''
+        if mismatch:
+            logger.warning('Not completing donation %s: %s', donation.pk, mismatch)
+            return donation, mismatch
+        donation.status = new_status
+        donation.payment_id = payment_id or donation.payment_id
+        donation.save(update_fields=['status', 'payment_id'])
+        transaction.on_commit(lambda: send_donation_receipts(donation))
+    return donation, ''
+
+def send_donation_receipts(donation):
+    from .utils_email import send_donation_confirmation
+    from .whatsapp_utils import send_donation_confirmation_whatsapp
+
+    try:
+        if donation.email:
+            send_donation_confirmation(donation)
+        if donation.phone:
+            send_donation_confirmation_whatsapp(donation)
+    except Exception:
+        logger.exception('Could not queue receipts for donation %s', donation.pk)
+
+def _valid_webhook_signature(body, signature):
+    secret = settings.RAZORPAY_WEBHOOK_SECRET
+    if not secret or not signature:
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+@api_view(['POST'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def payment_webhook(request):
+    """
+    Razorpay webhook. Verifies the signature, records the event id and
+    applies the status change in one transaction, then acks immediately.
+    A retried delivery hits the unique event id and returns without work;
+    any other integrity error is raised, so the gateway retries it.
+    """
+    body = request.body
+    if not _valid_webhook_signature(body, request.META.get('HTTP_X_RAZORPAY_SIGNATURE')):
+        return Response({'error': 'Invalid signature'}, status=400)
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return Response({'error': 'Invalid payload'}, status=400)
+
+    event_id = request.META.get('HTTP_X_RAZORPAY_EVENT_ID') or hashlib.sha256(body).hexdigest()
+    event_type = payload.get('event')
+    entity = (payload.get('payload') or {}).get('payment', {}).get('entity', {})
+
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                event = PaymentEvent.objects.create(
+                    event_id=event_id, gateway='razorpay', event_type=event_type, payload=payload
+                )
+        except IntegrityError:
+            if PaymentEvent.objects.filter(event_id=event_id).exists():
+                return Response({'status': 'duplicate'})
+            raise
+        donation, mismatch = None, ''
+        new_status = WEBHOOK_STATUS.get(event_type)
+        if new_status:
+            donation, mismatch = apply_payment_status(
+                entity.get('order_id'), entity.get('id'), new_status,
+                amount=entity.get('amount'), currency=entity.get('currency'), check_amount=True,
+            )
+        PaymentEvent.objects.filter(pk=event.pk).update(
+            donation=donation, processed_at=timezone.now(), error=mismatch
+        )
+
+    return Response({'status': 'ok'})
+
 def create_stripe_payment(amount, currency="inr"):
     try:
-        intent = stripe.PaymentIntent.create(
+        intent = get_client('stripe').PaymentIntent.create(
             amount=int(amount * 100),
             currency=currency
         )
@@ -87,7 +226,7 @@ def verify_upi_payment(upi_id, transaction_ref):
 
 def verify_razorpay_payment(payment_id, order_id, signature):
     try:
-        razorpay_client.utility.verify_payment_signature({
+        get_client('razorpay').utility.verify_payment_signature({
             'razorpay_payment_id': payment_id,
             'razorpay_order_id': order_id,
             'razorpay_signature': signature
@@ -0,0 +1,83 @@
+"""
+Incremental donation rollups.
+
+Every Donation save/delete turns into at most two bucket deltas (remove the
+old (day, purpose, status) contribution, add the new one), applied with
+``F()`` updates so concurrent writers never lose increments. Queryset
+``update()``/``bulk_create()`` bypass signals; ``rebuild_donation_rollups``
+recomputes any range from the source table.
+"""
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum, Value
+from django.db.models.functions import Coalesce
+
+from .models import Donation, DonationRollup
+
+
+def donation_snapshot(donation):
+    """Normalised (day, purpose, status, amount) for ``donation``, or None if it has no date."""
+    day = Donation._meta.get_field('date').to_python(donation.date)
+    if day is None:
+        return None
+    amount = Donation._meta.get_field('amount').to_python(donation.amount) or Decimal('0')
+    return day, donation.purpose or '', donation.status, amount
+
+
+def apply_donation_change(old, new):
+    deltas = defaultdict(lambda: [Decimal('0'), 0])
+    if old is not None:
+        deltas[old[:3]][0] -= old[3]
+        deltas[old[:3]][1] -= 1
+    if new is not None:
+        deltas[new[:3]][0] += new[3]
+        deltas[new[:3]][1] += 1
+
+    with transaction.atomic():
+        for key, (amount, count) in deltas.items():
+            if amount or count:
+                _apply_delta(key, amount, count)
+
+
+def _apply_delta(key, amount, count):
+    day, purpose, status = key
+    buckets = DonationRollup.objects.filter(day=day, purpose=purpose, status=status)
+    if buckets.update(total=F('total') + amount, count=F('count') + count):
+        return
+    try:
+        with transaction.atomic():
+            DonationRollup.objects.create(day=day, purpose=purpose, status=status, total=amount, count=count)
+    except IntegrityError:
+        # Another writer created the bucket first.
+        buckets.update(total=F('total') + amount, count=F('count') + count)
+
+
+def rebuild_rollups(start=None, end=None):
+    donations = Donation.objects.exclude(date=None)
+    rollups = DonationRollup.objects.all()
+    if start:
+        donations = donations.filter(date__gte=start)
+        rollups = rollups.filter(day__gte=start)
+    if end:
+        donations = donations.filter(date__lte=end)
+        rollups = rollups.filter(day__lte=end)
+
+    rows = (
+        donations
+        .values('date', 'status', bucket_purpose=Coalesce('purpose', Value('')))
+        .annotate(bucket_total=Coalesce(Sum('amount'), Value(Decimal('0'))), bucket_count=Count('id'))
+        .order_by()
+    )
+    with transaction.atomic():
+        rollups.delete()
+        created = DonationRollup.objects.bulk_create(
+            (
+                DonationRollup(day=row['date'], purpose=row['bucket_purpose'], status=row['status'],
+                               total=row['bucket_total'], count=row['bucket_count'])
+                for row in rows.iterator()
+            ),
+            batch_size=500,
+        )
+    return len(created)
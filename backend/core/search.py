@@ -0,0 +1,227 @@
+"""
+Full-text search over site content, backed by an SQLite FTS5 table.
+
+``core_search_index`` holds one row per object with its original text
+(language '') plus one row per language that has Translation rows for the
+object. Rows are rewritten by save/delete signals; ``rebuild_search_index``
+repopulates the table from scratch. On other database backends the index
+does not exist and search is unavailable.
+"""
+import html
+import re
+
+from django.db import connection, transaction
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import BaseFilterBackend
+
+from . import batch
+from .models import Blog, Career, Event, Gallery, Project, Translation
+
+TABLE = 'core_search_index'
+
+# model -> (title field, body fields)
+SEARCH_FIELDS = {
+    Blog: ('title', ('excerpt', 'content')),
+    Project: ('title', ('description', 'category')),
+    Event: ('title', ('description', 'location')),
+    Career: ('title', ('description', 'requirements', 'location')),
+    Gallery: ('title', ('description',)),
+}
+
+MODELS = {model._meta.model_name: model for model in SEARCH_FIELDS}
+
+# Highlight markers that cannot occur in content; swapped for <mark> after escaping.
+_OPEN, _CLOSE = '\x02', '\x03'
+
+CHUNK_SIZE = 500
+
+
+def is_available():
+    return connection.vendor == 'sqlite'
+
+
+def _chunks(items, size=CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _is_searchable(instance):
+    return not isinstance(instance, Blog) or instance.published
+
+
+def _documents(model, instances):
+    title_field, body_fields = SEARCH_FIELDS[model]
+    translations = {}
+    rows = (
+        Translation.objects
+        .filter(model_name=model.__name__, object_id__in=[instance.pk for instance in instances],
+                field_name__in=(title_field, *body_fields), language__isnull=False)
+        .exclude(translated_text__isnull=True).exclude(translated_text='')
+        .values_list('object_id', 'language__code', 'field_name', 'translated_text')
+    )
+    for object_id, code, field, text in rows:
+        if code:
+            translations.setdefault(object_id, {}).setdefault(code.lower(), {})[field] = text
+
+    name = model._meta.model_name
+    for instance in instances:
+        if not _is_searchable(instance):
+            continue
+        original = {field: getattr(instance, field) or '' for field in (title_field, *body_fields)}
+        versions = {'': original}
+        for code, fields in translations.get(instance.pk, {}).items():
+            versions[code] = {**original, **fields}
+        for code, values in versions.items():
+            body = '\n'.join(values[field] for field in body_fields if values[field])
+            yield name, instance.pk, code, values[title_field], body
+
+
+def remove_objects(model, ids):
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        for chunk in _chunks(list(ids)):
+            placeholders = ', '.join(['%s'] * len(chunk))
+            cursor.execute(
+                f'DELETE FROM {TABLE} WHERE model = %s AND object_id IN ({placeholders})',
+                [model._meta.model_name, *chunk]
+            )
+
+
+def index_objects(model, instances):
+    """(Re)write the index rows for ``instances`` of ``model``."""
+    if not is_available():
+        return
+    instances = list(instances)
+    for chunk in _chunks(instances):
+        remove_objects(model, [instance.pk for instance in chunk])
+        documents = list(_documents(model, chunk))
+        if documents:
+            with connection.cursor() as cursor:
+                cursor.executemany(
+                    f'INSERT INTO {TABLE} (model, object_id, language, title, body) VALUES (%s, %s, %s, %s, %s)',
+                    documents
+                )
+
+
+def reindex_objects(items):
+    """Reindex (model, object_id) pairs: existing objects are rewritten, deleted ones removed."""
+    by_model = {}
+    for model, object_id in items:
+        by_model.setdefault(model, set()).add(object_id)
+    for model, ids in by_model.items():
+        instances = list(model.objects.filter(pk__in=ids))
+        found = {instance.pk for instance in instances}
+        remove_objects(model, [pk for pk in ids if pk not in found])
+        index_objects(model, instances)
+
+
+def reindex_object(model_name, object_id):
+    """Reindex one object named the way Translation stores it (model class name)."""
+    model = MODELS.get((model_name or '').lower())
+    if model is None or object_id is None:
+        return
+    if not batch.defer(reindex_objects, (model, object_id)):
+        reindex_objects([(model, object_id)])
+
+
+def rebuild(models=None):
+    """Repopulate the index for ``models`` (all searchable models by default)."""
+    if not is_available():
+        return 0
+    count = 0
+    with transaction.atomic():
+        for model in models or SEARCH_FIELDS:
+            with connection.cursor() as cursor:
+                cursor.execute(f'DELETE FROM {TABLE} WHERE model = %s', [model._meta.model_name])
+            pending = []
+            for instance in model.objects.order_by('pk').iterator(chunk_size=CHUNK_SIZE):
+                pending.append(instance)
+                if len(pending) >= CHUNK_SIZE:
+                    index_objects(model, pending)
+                    count += len(pending)
+                    pending = []
+            index_objects(model, pending)
+            count += len(pending)
+    return count
+
+
+def match_expression(query):
+    """
+    Turn free text into a safe FTS5 query: every word must match, and the
+    last one may be a prefix of a longer word (search-as-you-type).
+    """
+    terms = [f'"{term}"' for term in re.findall(r'\w+', query or '')]
+    if not terms:
+        return None
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def _mark(text):
+    return html.escape(text or '').replace(_OPEN, '<mark>').replace(_CLOSE, '</mark>')
+
+
+def search(query, language='', models=None, limit=20, offset=0):
+    """
+    Ranked (bm25, title weighted over body) matches with highlighted title
+    and body snippet. Objects indexed in ``language`` are shown in that
+    language, everything else in the original text.
+    """
+    expression = match_expression(query)
+    if expression is None or not is_available():
+        return []
+    language = (language or '').lower()
+    model_filter, model_names = '', []
+    if models:
+        model_filter = f"AND model IN ({', '.join(['%s'] * len(models))})"
+        model_names = [model._meta.model_name for model in models]
+    # highlight()/snippet() cannot share a query with a window function, so
+    # the per-object language choice is made in a subquery over rowids.
+    sql = f"""
+        SELECT model, object_id, language,
+               highlight({TABLE}, 3, %s, %s),
+               snippet({TABLE}, 4, %s, %s, '…', 24)
+        FROM {TABLE}
+        WHERE {TABLE} MATCH %s AND rowid IN (
+            SELECT rowid FROM (
+                SELECT rowid, ROW_NUMBER() OVER (
+                    PARTITION BY model, object_id ORDER BY language = ''
+                ) AS preference
+                FROM {TABLE}
+                WHERE {TABLE} MATCH %s AND language IN (%s, '') {model_filter}
+            ) WHERE preference = 1
+        )
+        ORDER BY bm25({TABLE}, 0, 0, 0, 10.0, 1.0)
+        LIMIT %s OFFSET %s
+    """
+    params = [_OPEN, _CLOSE, _OPEN, _CLOSE, expression, expression, language, *model_names, limit, offset]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    return [
+        {
+            'type': model,
+            'id': int(object_id),
+            'language': language or None,
+            'title': _mark(title),
+            'snippet': _mark(snippet),
+        }
+        for model, object_id, language, title, snippet in rows
+    ]
+
+
+class FullTextSearchFilter(BaseFilterBackend):
+    """Filters a searchable model's queryset by ``?search=`` using the FTS index."""
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        params = getattr(request, 'query_params', request.GET)
+        expression = match_expression(params.get(self.search_param, ''))
+        if expression is None or not is_available():
+            return queryset
+        matches = RawSQL(
+            f'SELECT object_id FROM {TABLE} WHERE {TABLE} MATCH %s AND model = %s',
+            [expression, queryset.model._meta.model_name]
+        )
+        return queryset.filter(pk__in=matches)
@@ -1,108 +1,405 @@
+import os
+import re
+from urllib.parse import urlsplit
+
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 from .models import *
 from django.contrib.auth.models import User
+from django.db import models as django_models
+from django.conf import settings
+from django.urls import reverse
+from django.utils.text import get_valid_filename
+from .uploads import TARGETS as UPLOAD_TARGETS, chunk_size
+from .utils_translation import (
+    resolve_translations, aresolve_translations, get_default_language_code,
+    aget_default_language_code, get_request_language
+)
+
+IMAGE_METADATA_FIELDS = ('image_width', 'image_height', 'image_color', 'image_blurhash')
+
+def absolute_media_url(context, url):
+    """
+    Makes a storage URL absolute. The scheme and host are taken from the
+    request once and kept in the (per-response) serializer context.
+    """
+    if not url or urlsplit(url).scheme:
+        return url
+    base = context.get('absolute_url_base')
+    if base is None:
+        request = context.get('request')
+        base = request.build_absolute_uri('/')[:-1] if request is not None else ''
+        context['absolute_url_base'] = base
+    return base + url if url.startswith('/') else url
+
+class MediaURLMixin:
+    def to_representation(self, value):
+        if not value:
+            return None
+        if not getattr(self, 'use_url', True):
+            return value.name
+        try:
+            url = value.url
+        except AttributeError:
+            return None
+        return absolute_media_url(self.context, url)
+
+class MediaFileField(MediaURLMixin, serializers.FileField):
+    pass
+
+class MediaImageField(MediaURLMixin, serializers.ImageField):
+    pass
+
+def _split_param(request, name):
+    value = getattr(request, 'query_params', request.GET).get(name, '')
+    return {item.strip() for item in value.split(',') if item.strip()}
+
+class BaseModelSerializer(serializers.ModelSerializer):
+    """
+    Common base for core serializers: media URLs share one absolute base per
+    response, and GET requests can ask for a sparse fieldset with
+    ``?fields=id,title`` or ``?omit=description`` (top-level objects only).
+    """
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        django_models.FileField: MediaFileField,
+        django_models.ImageField: MediaImageField,
+    }
+
+    def get_fieldset_params(self):
+        if not hasattr(self, '_fieldset_params'):
+            request = self.context.get('request')
+            parent = self.parent
+            top_level = parent is None or (isinstance(parent, serializers.ListSerializer) and parent.parent is None)
+            if request is None or request.method not in SAFE_METHODS or not top_level:
+                self._fieldset_params = (set(), set())
+            else:
+                self._fieldset_params = (_split_param(request, 'fields'), _split_param(request, 'omit'))
+        return self._fieldset_params
+
+    def field_requested(self, name):
+        only, omit = self.get_fieldset_params()
+        return (not only or name in only) and name not in omit
+
+    def get_fields(self):
+        fields = super().get_fields()
+        only, omit = self.get_fieldset_params()
+        if only or omit:
+            fields = {name: field for name, field in fields.items() if self.field_requested(name)}
+        return fields
+
+class TranslatedListSerializer(serializers.ListSerializer):
+    """Resolves translations for the whole page before serializing it."""
 
-class BlogSerializer(serializers.ModelSerializer):
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, django_models.Manager) else data
+        iterable = list(iterable)
+        if not self.context.get('translations_prefetched'):
+            self.child.prefetch_translations(iterable)
+        return [self.child.to_representation(item) for item in iterable]
+
+class TranslatedModelSerializer(BaseModelSerializer):
+    """
+    Replaces ``translated_fields`` with their Translation rows for the request
+    language (``?lang=`` or LocaleMiddleware), falling back to the default
+    Language and then to the model value. Only applies to safe methods so
+    admin edits always see the original text.
+    """
+    translated_fields = ()
+
+    def translates_request(self):
+        request = self.context.get('request')
+        return request is not None and request.method in SAFE_METHODS
+
+    def get_translation_languages(self, default_code=None):
+        if not self.translates_request():
+            return []
+        request_code = get_request_language(self.context['request'])
+        if default_code is None:
+            default_code = get_default_language_code()
+        return [code for code in (request_code, default_code) if code]
+
+    def prefetch_translations(self, instances):
+        codes = self.get_translation_languages()
+        fields = [field for field in self.translated_fields if field in self.fields]
+        if not codes or not fields:
+            self._translations = []
+            return
+        resolved = resolve_translations(
+            self.Meta.model.__name__,
+            [instance.pk for instance in instances],
+            fields,
+            codes
+        )
+        self._translations = [resolved[code] for code in dict.fromkeys(codes)]
+
+    async def aprefetch_translations(self, instances):
+        """
+        prefetch_translations() for async views. Callers set
+        ``translations_prefetched`` in the context so serializing does not
+        query again.
+        """
+        codes = []
+        if self.translates_request():
+            codes = self.get_translation_languages(await aget_default_language_code() or '')
+        fields = [field for field in self.translated_fields if field in self.fields]
+        if not codes or not fields:
+            self._translations = []
+            return
+        resolved = await aresolve_translations(
+            self.Meta.model.__name__,
+            [instance.pk for instance in instances],
+            fields,
+            codes
+        )
+        self._translations = [resolved[code] for code in dict.fromkeys(codes)]
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        prefetched = self.context.get('translations_prefetched')
+        if getattr(self, '_translations', None) is None or (self.parent is None and not prefetched):
+            self.prefetch_translations([instance])
+        for field in self.translated_fields:
+            if field not in data:
+                continue
+            for translations in self._translations:
+                text = translations.get((instance.pk, field))
+                if text:
+                    data[field] = text
+                    break
+        return data
+
+class ImageVariantsMixin:
+    """
+    Replaces each raw ``*_variants`` JSON field with ``<image>_srcset``:
+    {format: "url 320w, url 640w, ..."} ready for a <source srcset>.
+    """
+    image_variant_fields = {}
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        for image_field, variants_field in self.image_variant_fields.items():
+            data.pop(variants_field, None)
+            if not self.field_requested(f'{image_field}_srcset'):
+                continue
+            variants = getattr(instance, variants_field) or {}
+            storage = getattr(instance, image_field).storage
+            srcset = {}
+            for fmt, names in variants.items():
+                if fmt == 'source':
+                    continue
+                entries = []
+                for width, name in sorted(names.items(), key=lambda item: int(item[0])):
+                    entries.append(f'{absolute_media_url(self.context, storage.url(name))} {width}w')
+                srcset[fmt] = ', '.join(entries)
+            data[f'{image_field}_srcset'] = srcset
+        return data
+
+class BlogSerializer(BaseModelSerializer):
     class Meta:
         model = Blog
         fields = "__all__"
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(ImageVariantsMixin, TranslatedModelSerializer):
+    translated_fields = ('title', 'description')
+    image_variant_fields = {'image': 'image_variants'}
+
     class Meta:
         model = Project
         fields = "__all__"
+        read_only_fields = (*IMAGE_METADATA_FIELDS, 'image_variants')
+        list_serializer_class = TranslatedListSerializer
+
+class ReportSerializer(BaseModelSerializer):
+    download_url = serializers.SerializerMethodField()
 
-class ReportSerializer(serializers.ModelSerializer):
     class Meta:
         model = Report
         fields = "__all__"
 
-class GalleryImageSerializer(serializers.ModelSerializer):
+    def get_download_url(self, obj):
+        if not obj.file:
+            return None
+        return absolute_media_url(self.context, reverse('report-download', args=[obj.pk]))
+
+class GalleryImageSerializer(BaseModelSerializer):
     class Meta:
         model = GalleryImage
         fields = "__all__"
+        read_only_fields = IMAGE_METADATA_FIELDS
+
+class TeamMemberSerializer(ImageVariantsMixin, BaseModelSerializer):
+    image_variant_fields = {'photo': 'photo_variants'}
 
-class TeamMemberSerializer(serializers.ModelSerializer):
     class Meta:
         model = TeamMember
         fields = "__all__"
+        read_only_fields = ('photo_variants',)
 
-class DonationSerializer(serializers.ModelSerializer):
+class DonationSerializer(BaseModelSerializer):
     class Meta:
         model = Donation
         fields = "__all__"
-        read_only_fields = ("paid", "payment_id", "created_at")
+        # status is set by the payment webhook once a capture is verified.
+        read_only_fields = ("status", "order_id", "payment_id")
+
+class DonationAdminSerializer(DonationSerializer):
+    """Lets admins record offline and manual donations as Completed."""
+    class Meta(DonationSerializer.Meta):
+        read_only_fields = ("order_id", "payment_id")
 
-class VolunteerSerializer(serializers.ModelSerializer):
+class VolunteerSerializer(BaseModelSerializer):
     class Meta:
         model = Volunteer
         fields = "__all__"
 
-class ContactMessageSerializer(serializers.ModelSerializer):
+class ContactMessageSerializer(BaseModelSerializer):
     class Meta:
         model = ContactMessage
         fields = "__all__"
 
-class AboutSerializer(serializers.ModelSerializer):
+class AboutSerializer(BaseModelSerializer):
     class Meta:
         model = About
         fields = "__all__"
 
-class ContactSerializer(serializers.ModelSerializer):
+class ContactSerializer(BaseModelSerializer):
     class Meta:
         model = Contact
         fields = '__all__'
 
-class NewsletterSerializer(serializers.ModelSerializer):
+class NewsletterSerializer(BaseModelSerializer):
     class Meta:
         model = Newsletter
         fields = '__all__'
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(ImageVariantsMixin, TranslatedModelSerializer):
+    translated_fields = ('title', 'description', 'location')
+    image_variant_fields = {'image': 'image_variants'}
+
     class Meta:
         model = Event
         fields = '__all__'
+        read_only_fields = (*IMAGE_METADATA_FIELDS, 'image_variants')
+        list_serializer_class = TranslatedListSerializer
+
+class ImpactSerializer(TranslatedModelSerializer):
+    translated_fields = ('title', 'description')
 
-class ImpactSerializer(serializers.ModelSerializer):
     class Meta:
         model = Impact
         fields = '__all__'
+        list_serializer_class = TranslatedListSerializer
+
+class TestimonialSerializer(TranslatedModelSerializer):
+    translated_fields = ('role', 'content')
 
-class TestimonialSerializer(serializers.ModelSerializer):
     class Meta:
         model = Testimonial
         fields = '__all__'
+        list_serializer_class = TranslatedListSerializer
+
+class CareerSerializer(TranslatedModelSerializer):
+    translated_fields = ('title', 'description', 'requirements', 'location')
 
-class CareerSerializer(serializers.ModelSerializer):
     class Meta:
         model = Career
         fields = '__all__'
+        list_serializer_class = TranslatedListSerializer
 
-class LanguageSerializer(serializers.ModelSerializer):
+class LanguageSerializer(BaseModelSerializer):
     class Meta:
         model = Language
         fields = '__all__'
 
-class TranslationSerializer(serializers.ModelSerializer):
+class TranslationSerializer(BaseModelSerializer):
     class Meta:
         model = Translation
         fields = '__all__'
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(BaseModelSerializer):
     class Meta:
         model = User
         fields = ('id', 'username', 'email', 'first_name', 'last_name', 'is_staff')
 
-class GallerySerializer(serializers.ModelSerializer):
+class GallerySerializer(ImageVariantsMixin, TranslatedModelSerializer):
     image_url = serializers.SerializerMethodField()
+    translated_fields = ('title', 'description')
+    image_variant_fields = {'image': 'image_variants'}
 
     class Meta:
         model = Gallery
-        fields = ['id', 'title', 'description', 'image', 'category', 'created_at', 'image_url']
+        fields = ['id', 'title', 'description', 'image', 'category', 'created_at', 'image_url', *IMAGE_METADATA_FIELDS]
+        read_only_fields = (*IMAGE_METADATA_FIELDS, 'image_variants')
+        list_serializer_class = TranslatedListSerializer
 
     def get_image_url(self, obj):
-        if obj.image:
-            request = self.context.get('request')
-            if request:
-                return request.build_absolute_uri(obj.image.url)
+        if obj.image and self.context.get('request'):
+            return absolute_media_url(self.context, obj.image.url)
         return None
+
+class ChunkedUploadSerializer(BaseModelSerializer):
+    chunk_size = serializers.SerializerMethodField()
+
+    class Meta:
+        model = ChunkedUpload
+        fields = ('id', 'filename', 'size', 'offset', 'target', 'object_id', 'title', 'checksum',
+                  'sha256', 'status', 'chunk_size', 'created_at', 'updated_at', 'completed_at')
+        read_only_fields = ('offset', 'sha256', 'status', 'created_at', 'updated_at', 'completed_at')
+
+    def get_chunk_size(self, obj):
+        return chunk_size()
+
+    def validate_filename(self, value):
+        name = get_valid_filename(os.path.basename(value))
+        if not name:
+            raise serializers.ValidationError('Invalid file name.')
+        return name
+
+    def validate_size(self, value):
+        limit = getattr(settings, 'CHUNKED_UPLOAD_MAX_SIZE', 2 * 1024 ** 3)
+        if value < 1 or value > limit:
+            raise serializers.ValidationError(f'Size must be between 1 and {limit} bytes.')
+        return value
+
+    def validate_checksum(self, value):
+        if value and not re.fullmatch(r'[0-9a-fA-F]{64}', value):
+            raise serializers.ValidationError('Expected a hex SHA-256 digest.')
+        return value.lower() if value else value
+
+    def validate(self, attrs):
+        object_id = attrs.get('object_id')
+        if object_id is not None:
+            model, _ = UPLOAD_TARGETS[attrs['target']]
+            if not model.objects.filter(pk=object_id).exists():
+                raise serializers.ValidationError({'object_id': f'No {model._meta.verbose_name} with id {object_id}.'})
+        return attrs
+
+# Lightweight representations for list endpoints: cards never render the long
+# text fields, which make up most of the payload.
+
+class ProjectSummarySerializer(ProjectSerializer):
+    translated_fields = ('title',)
+
+    class Meta(ProjectSerializer.Meta):
+        fields = ('id', 'title', 'category', 'image', 'status', 'start_date',
+                  'end_date', 'created_at', *IMAGE_METADATA_FIELDS)
+
+class GallerySummarySerializer(GallerySerializer):
+    translated_fields = ('title',)
+
+    class Meta(GallerySerializer.Meta):
+        fields = ['id', 'title', 'image', 'category', 'created_at', 'image_url', *IMAGE_METADATA_FIELDS]
+
+class EventSummarySerializer(EventSerializer):
+    translated_fields = ('title', 'location')
+
+    class Meta(EventSerializer.Meta):
+        fields = ('id', 'title', 'date', 'location', 'image', 'status', 'created_at',
+                  *IMAGE_METADATA_FIELDS)
+
+class CareerSummarySerializer(CareerSerializer):
+    translated_fields = ('title', 'location')
+
+    class Meta(CareerSerializer.Meta):
+        fields = ('id', 'title', 'location', 'type', 'status', 'created_at')
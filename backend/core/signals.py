@@ -0,0 +1,186 @@
+from django.apps import apps
+from django.db import transaction
+from django.db.models import FileField
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from .models import Translation, Language, Donation, Volunteer, Project, Impact
+from .utils_translation import invalidate_translation, clear_translation_cache
+from .cache import bump_model_version, is_versioned_model
+from .rollups import donation_snapshot, apply_donation_change
+from . import batch, impact, images, search, storage, suggest
+
+
+@receiver(post_save, sender=Translation)
+def translation_saved(sender, instance, created, **kwargs):
+    if created:
+        invalidate_translation(instance.model_name, instance.field_name, instance.object_id)
+    else:
+        # An update may have moved the row to another key, so drop everything.
+        clear_translation_cache()
+    search.reindex_object(instance.model_name, instance.object_id)
+
+
+@receiver(post_delete, sender=Translation)
+def translation_deleted(sender, instance, **kwargs):
+    invalidate_translation(instance.model_name, instance.field_name, instance.object_id)
+    search.reindex_object(instance.model_name, instance.object_id)
+
+
+@receiver(post_save, sender=Language)
+@receiver(post_delete, sender=Language)
+def language_changed(sender, **kwargs):
+    clear_translation_cache()
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def content_changed(sender, **kwargs):
+    if is_versioned_model(sender):
+        bump_model_version(sender)
+
+
+@receiver(pre_save, sender=Donation)
+def donation_pre_save(sender, instance, raw=False, **kwargs):
+    instance._rollup_snapshot = None
+    if instance.pk and not raw:
+        previous = Donation.objects.filter(pk=instance.pk).first()
+        if previous is not None:
+            instance._rollup_snapshot = donation_snapshot(previous)
+
+
+@receiver(post_save, sender=Donation)
+def donation_saved(sender, instance, created, raw=False, **kwargs):
+    if not raw:
+        previous, current = getattr(instance, '_rollup_snapshot', None), donation_snapshot(instance)
+        apply_donation_change(previous, current)
+        impact.donations_changed(previous, current)
+
+
+@receiver(post_delete, sender=Donation)
+def donation_deleted(sender, instance, **kwargs):
+    snapshot = donation_snapshot(instance)
+    apply_donation_change(snapshot, None)
+    impact.donations_changed(snapshot, None)
+
+
+@receiver(pre_save, sender=Volunteer)
+def volunteer_pre_save(sender, instance, raw=False, **kwargs):
+    instance._was_active = False
+    if instance.pk and not raw:
+        instance._was_active = Volunteer.objects.filter(pk=instance.pk, status='Active').exists()
+
+
+@receiver(post_save, sender=Volunteer)
+def volunteer_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        impact.volunteer_changed(getattr(instance, '_was_active', False), instance.status == 'Active')
+
+
+@receiver(post_delete, sender=Volunteer)
+def volunteer_deleted(sender, instance, **kwargs):
+    impact.volunteer_changed(instance.status == 'Active', False)
+
+
+@receiver(pre_save, sender=Project)
+def project_pre_save(sender, instance, raw=False, **kwargs):
+    instance._previous_impact_numbers = None
+    if instance.pk and not raw:
+        instance._previous_impact_numbers = (
+            Project.objects.filter(pk=instance.pk).values_list('impact_numbers', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Project)
+def project_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        impact.project_changed(getattr(instance, '_previous_impact_numbers', None), instance.impact_numbers)
+
+
+@receiver(post_delete, sender=Project)
+def project_deleted(sender, instance, **kwargs):
+    impact.project_changed(instance.impact_numbers, None)
+
+
+@receiver(post_save, sender=Impact)
+def impact_saved(sender, instance, raw=False, **kwargs):
+    if not raw and instance.source != 'manual' and not batch.defer(impact.recompute_ids, instance.pk):
+        impact.recompute_ids([instance.pk])
+
+
+def image_pre_save(sender, instance, raw=False, **kwargs):
+    file = getattr(instance, images.IMAGE_FIELDS[sender].field)
+    # A new upload is still uncommitted until the field's own pre_save runs.
+    instance._image_uploaded = bool(file) and not file._committed
+
+
+def image_saved(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    variants, metadata = images.outdated_parts(instance)
+    instance._image_uploaded = False
+    if variants or metadata:
+        images.schedule_processing(instance, variants, metadata)
+
+
+def image_deleted(sender, instance, **kwargs):
+    spec = images.IMAGE_FIELDS[sender]
+    variants = getattr(instance, spec.variants_field) if spec.variants_field else None
+    if variants:
+        storage = getattr(instance, spec.field).storage
+        transaction.on_commit(lambda: images.delete_variant_files(storage, variants))
+
+
+for image_model in images.IMAGE_FIELDS:
+    model_name = image_model.__name__
+    pre_save.connect(image_pre_save, sender=image_model, dispatch_uid=f'image_pre_save_{model_name}')
+    post_save.connect(image_saved, sender=image_model, dispatch_uid=f'image_saved_{model_name}')
+    post_delete.connect(image_deleted, sender=image_model, dispatch_uid=f'image_deleted_{model_name}')
+
+
+def searchable_saved(sender, instance, **kwargs):
+    if not batch.defer(search.reindex_objects, (sender, instance.pk)):
+        search.index_objects(sender, [instance])
+
+
+def searchable_deleted(sender, instance, **kwargs):
+    if not batch.defer(search.reindex_objects, (sender, instance.pk)):
+        search.remove_objects(sender, [instance.pk])
+
+
+for search_model in search.SEARCH_FIELDS:
+    model_name = search_model.__name__
+    post_save.connect(searchable_saved, sender=search_model, dispatch_uid=f'search_saved_{model_name}')
+    post_delete.connect(searchable_deleted, sender=search_model, dispatch_uid=f'search_deleted_{model_name}')
+
+
+def suggestion_saved(sender, instance, **kwargs):
+    transaction.on_commit(lambda: suggest.object_saved(instance))
+
+
+def suggestion_deleted(sender, instance, **kwargs):
+    transaction.on_commit(lambda: suggest.object_deleted(instance))
+
+
+for suggest_model in suggest.SUGGEST_FIELDS:
+    model_name = suggest_model.__name__
+    post_save.connect(suggestion_saved, sender=suggest_model, dispatch_uid=f'suggest_saved_{model_name}')
+    post_delete.connect(suggestion_deleted, sender=suggest_model, dispatch_uid=f'suggest_deleted_{model_name}')
+
+
+def stored_files_pre_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    replaced = storage.replaced_files(instance, update_fields)
+    if replaced:
+        transaction.on_commit(lambda: storage.release(replaced))
+
+
+def stored_files_deleted(sender, instance, **kwargs):
+    transaction.on_commit(lambda: storage.release_files(instance))
+
+
+for file_model in apps.get_app_config('core').get_models():
+    if any(isinstance(field, FileField) for field in file_model._meta.fields):
+        model_name = file_model.__name__
+        pre_save.connect(stored_files_pre_save, sender=file_model, dispatch_uid=f'stored_files_pre_save_{model_name}')
+        post_delete.connect(stored_files_deleted, sender=file_model, dispatch_uid=f'stored_files_deleted_{model_name}')
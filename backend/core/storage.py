@@ -0,0 +1,175 @@
+"""
+Content-addressed media storage.
+
+Every saved file is named after the SHA-256 of its bytes, sharded two
+levels deep under ``CONTENT_STORAGE_PREFIX``:
+
+    cas/3f/a9/3fa9...c1.jpg
+
+so identical uploads (the same photo on a Gallery, a Project and an Event)
+share one file, no directory grows past a few hundred entries, and a URL
+never changes meaning, so the front proxy can serve ``MEDIA_URL + 'cas/'``
+with ``Cache-Control: public, max-age=31536000, immutable``.
+
+Each save adds a reference to the blob's StoredFile row and each delete
+removes one; the file goes when the last reference does. Rows give their
+references back when they are deleted or when a save replaces or clears
+one of their files (see ``replaced_files``). Names outside the
+prefix (media saved before this storage was enabled) are read and deleted
+as plain files; ``migrate_media_storage`` moves them in and recounts.
+"""
+import hashlib
+import os
+import re
+import uuid
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, transaction
+from django.db.models import F, FileField
+from django.utils.deconstruct import deconstructible
+
+_EXTENSION = re.compile(r'^\.[a-z0-9]{1,8}$')
+
+
+def content_hash(content):
+    hasher = hashlib.sha256()
+    size = 0
+    for chunk in content.chunks():
+        hasher.update(chunk)
+        size += len(chunk)
+    return hasher.hexdigest(), size
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+
+    def __init__(self, prefix=None, **kwargs):
+        super().__init__(**kwargs)
+        self.prefix = (prefix or getattr(settings, 'CONTENT_STORAGE_PREFIX', 'cas')).strip('/')
+
+    def hashed_name(self, digest, name):
+        extension = os.path.splitext(name or '')[1].lower()
+        if extension == '.jpeg':
+            extension = '.jpg'
+        if not _EXTENSION.match(extension):
+            extension = ''
+        return f'{self.prefix}/{digest[:2]}/{digest[2:4]}/{digest}{extension}'
+
+    def is_hashed(self, name):
+        return bool(name) and name.startswith(self.prefix + '/')
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        digest, size = content_hash(content)
+        name = self.hashed_name(digest, name)
+        self.add_reference(name, size)
+        if not self.exists(name):
+            try:
+                self._write(name, content)
+            except BaseException:
+                self.delete(name)
+                raise
+        return name
+
+    def _write(self, name, content):
+        full_path = self.path(name)
+        directory = os.path.dirname(full_path)
+        os.makedirs(directory, exist_ok=True)
+        if self.directory_permissions_mode is not None:
+            os.chmod(directory, self.directory_permissions_mode)
+        if hasattr(content, 'temporary_file_path'):
+            file_move_safe(content.temporary_file_path(), full_path, allow_overwrite=True)
+        else:
+            # Write beside the target and rename, so readers never see a partial blob
+            # and two identical concurrent saves simply replace one another.
+            temporary = f'{full_path}.{uuid.uuid4().hex}.tmp'
+            fd = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o666)
+            try:
+                with os.fdopen(fd, 'wb') as handle:
+                    for chunk in content.chunks():
+                        handle.write(chunk)
+                os.replace(temporary, full_path)
+            except BaseException:
+                if os.path.exists(temporary):
+                    os.remove(temporary)
+                raise
+        if self.file_permissions_mode is not None:
+            os.chmod(full_path, self.file_permissions_mode)
+
+    def add_reference(self, name, size=0):
+        from .models import StoredFile  # storage is built before the app registry is ready
+
+        with transaction.atomic():
+            if StoredFile.objects.filter(name=name).update(refcount=F('refcount') + 1):
+                return
+            try:
+                with transaction.atomic():
+                    StoredFile.objects.create(name=name, size=size, refcount=1)
+            except IntegrityError:
+                StoredFile.objects.filter(name=name).update(refcount=F('refcount') + 1)
+
+    def delete(self, name):
+        if not self.is_hashed(name):
+            return super().delete(name)
+        from .models import StoredFile
+
+        with transaction.atomic():
+            StoredFile.objects.filter(name=name, refcount__gt=0).update(refcount=F('refcount') - 1)
+            removed, _ = StoredFile.objects.filter(name=name, refcount__lte=0).delete()
+            if removed:
+                super().delete(name)
+
+    def get_available_name(self, name, max_length=None):
+        # Names are derived from content, never made unique by suffixing.
+        return name
+
+
+def _counted(storage, name):
+    return bool(name) and isinstance(storage, ContentAddressedStorage) and storage.is_hashed(name)
+
+
+def release(files):
+    """Drop one reference for each (storage, name) in ``files``."""
+    for storage, name in files:
+        storage.delete(name)
+
+
+def release_files(instance):
+    """Drop the references a deleted object held on content-addressed files."""
+    files = []
+    for field in instance._meta.fields:
+        if isinstance(field, FileField):
+            file = getattr(instance, field.attname)
+            if _counted(file.storage, file.name):
+                files.append((file.storage, file.name))
+    release(files)
+
+
+def replaced_files(instance, update_fields=None):
+    """
+    (storage, name) of the content-addressed files that saving ``instance``
+    will stop referencing, read from its stored row before the save.
+    """
+    fields = [field for field in instance._meta.fields if isinstance(field, FileField)
+              and (update_fields is None or field.name in update_fields)]
+    if not fields or instance.pk is None or instance._state.adding:
+        return []
+    previous = (type(instance)._base_manager.using(instance._state.db or 'default').filter(pk=instance.pk)
+                .values_list(*[field.attname for field in fields]).first())
+    if previous is None:
+        return []
+    files = []
+    for field, name in zip(fields, previous):
+        file = getattr(instance, field.attname)
+        if file.name == name or not _counted(file.storage, name):
+            continue
+        if not file and not file._committed:
+            continue  # FieldFile.delete() already released it
+        files.append((file.storage, name))
+    return files
@@ -0,0 +1,254 @@
+"""
+In-memory prefix index behind ``/api/suggest/``.
+
+Every indexed text contributes one key per word start ("Clean water drive"
+-> "clean water drive", "water drive", "drive"), kept in one sorted list, so
+a lookup is a bisect plus a short forward scan. The index is built from the
+database on first use and patched by save/delete signals in this process.
+Saves made by other processes are picked up through the response-cache model
+versions, which a background thread checks at most every
+``SUGGEST_REFRESH_INTERVAL`` seconds. Under a process-local cache those
+versions never see other processes' saves, so that thread instead rebuilds
+the index on every interval.
+"""
+import bisect
+import logging
+import re
+import threading
+import time
+import unicodedata
+
+from django.conf import settings
+from django.db import connections
+
+from .cache import get_model_versions, is_shared_cache, register_versioned_models
+from .models import Career, Event, Project
+
+logger = logging.getLogger(__name__)
+
+SUGGEST_FIELDS = {
+    Project: ('title',),
+    Event: ('title', 'location'),
+    Career: ('title', 'location'),
+}
+register_versioned_models(*SUGGEST_FIELDS)
+
+MAX_TEXT_LENGTH = 120
+MAX_WORDS = 6
+# Entries examined per lookup; bounds the cost of very common prefixes.
+SCAN_LIMIT = 500
+
+_WORD_START = re.compile(r'\b\w', re.UNICODE)
+
+
+def normalize(text):
+    text = unicodedata.normalize('NFKD', text or '')
+    return ''.join(char for char in text if not unicodedata.combining(char)).casefold().strip()
+
+
+def index_keys(normalized):
+    return list(dict.fromkeys(normalized[match.start():] for match in _WORD_START.finditer(normalized)))[:MAX_WORDS]
+
+
+class PrefixIndex:
+    """
+    Sorted (key, entry) pairs. A title's entry is its source,
+    (model_name, pk, field); locations share one ('location', text, '')
+    entry per distinct text, reference-counted across the objects using it.
+    At most ``max_entries`` keys are held: once full, new texts are not
+    indexed and ``truncated`` is set.
+    """
+
+    def __init__(self, max_entries=None):
+        self.max_entries = max_entries or getattr(settings, 'SUGGEST_MAX_ENTRIES', 200000)
+        self.truncated = False
+        self._keys = []
+        self._texts = {}
+        self._owners = {}
+        self._refs = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def load(self, items):
+        """Replace the contents with ``items`` ((source, text) pairs), sorting once."""
+        with self._lock:
+            self._keys, self._texts, self._owners, self._refs = [], {}, {}, {}
+            self._size, self.truncated = 0, False
+            keys = []
+            for source, text in items:
+                entry, new_keys = self._attach(source, text)
+                keys.extend((key, entry) for key in new_keys)
+            keys.sort()
+            self._keys = keys
+        if self.truncated:
+            logger.warning('Suggestion index is full (%s keys); some texts were not indexed', len(self._keys))
+
+    def add(self, source, text):
+        with self._lock:
+            self._detach(source)
+            entry, new_keys = self._attach(source, text)
+            for key in new_keys:
+                bisect.insort(self._keys, (key, entry))
+
+    def remove(self, source):
+        with self._lock:
+            self._detach(source)
+
+    def _attach(self, source, text):
+        """Reference the entry for ``source``; returns it with the keys to insert when it is new."""
+        text = (text or '').strip()[:MAX_TEXT_LENGTH]
+        normalized = normalize(text)
+        if not normalized:
+            return None, ()
+        entry = ('location', normalized, '') if source[2] == 'location' else source
+        keys = ()
+        if entry not in self._refs:
+            keys = index_keys(normalized)
+            if self._size + len(keys) > self.max_entries:
+                self.truncated = True
+                return None, ()
+            self._size += len(keys)
+            self._refs[entry] = 0
+            self._texts[entry] = text
+        self._refs[entry] += 1
+        self._owners[source] = entry
+        return entry, keys
+
+    def _detach(self, source):
+        entry = self._owners.pop(source, None)
+        if entry is None:
+            return
+        self._refs[entry] -= 1
+        if self._refs[entry]:
+            return
+        del self._refs[entry]
+        keys = index_keys(normalize(self._texts.pop(entry)))
+        self._size -= len(keys)
+        for key in keys:
+            position = bisect.bisect_left(self._keys, (key, entry))
+            if position < len(self._keys) and self._keys[position] == (key, entry):
+                del self._keys[position]
+
+    def lookup(self, prefix, limit=10):
+        """Up to ``limit`` suggestions whose text has a word starting with ``prefix``."""
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        results, seen = [], set()
+        with self._lock:
+            keys, texts = self._keys, self._texts
+            position = bisect.bisect_left(keys, (prefix,))
+            end = min(position + SCAN_LIMIT, len(keys))
+            while position < end and len(results) < limit:
+                key, entry = keys[position]
+                position += 1
+                if not key.startswith(prefix):
+                    break
+                if entry in seen:
+                    continue
+                seen.add(entry)
+                kind, pk, _ = entry
+                if kind == 'location':
+                    results.append({'text': texts[entry], 'type': 'location'})
+                else:
+                    results.append({'text': texts[entry], 'type': kind, 'id': pk})
+        return results
+
+
+def _sources(model, instance):
+    for field in SUGGEST_FIELDS[model]:
+        yield (model._meta.model_name, instance.pk, field), getattr(instance, field)
+
+
+def _rows():
+    for model, fields in SUGGEST_FIELDS.items():
+        for row in model.objects.values_list('pk', *fields).iterator(chunk_size=2000):
+            for field, text in zip(fields, row[1:]):
+                yield (model._meta.model_name, row[0], field), text
+
+
+_index = None
+_versions = None
+_checked_at = 0.0
+_build_lock = threading.Lock()
+_schedule_lock = threading.Lock()
+_refresh_thread = None
+
+
+def _build(versions):
+    """Load a fresh index; ``versions`` must have been read before the rows are."""
+    global _index, _versions, _checked_at
+    index = PrefixIndex()
+    index.load(_rows())
+    _index, _versions, _checked_at = index, versions, time.monotonic()
+
+
+def refresh():
+    """Rebuild when the model versions moved since the last build (always under a process-local cache)."""
+    with _build_lock:
+        versions = get_model_versions(SUGGEST_FIELDS)
+        if _index is None or versions != _versions or not is_shared_cache():
+            _build(versions)
+
+
+def _refresh_in_background():
+    try:
+        refresh()
+    except Exception:
+        logger.exception('Refreshing the suggestion index failed')
+    finally:
+        connections.close_all()
+
+
+def get_index():
+    """
+    The process-wide index. Only the first call builds it on the request
+    thread; afterwards staleness is checked (and the index rebuilt) in a
+    background thread at most every ``SUGGEST_REFRESH_INTERVAL`` seconds,
+    while requests keep reading the current index.
+    """
+    global _checked_at, _refresh_thread
+    if _index is None:
+        with _build_lock:
+            if _index is None:
+                _build(get_model_versions(SUGGEST_FIELDS))
+        return _index
+    now = time.monotonic()
+    if now - _checked_at >= getattr(settings, 'SUGGEST_REFRESH_INTERVAL', 30):
+        with _schedule_lock:
+            running = _refresh_thread is not None and _refresh_thread.is_alive()
+            if not running and now - _checked_at >= getattr(settings, 'SUGGEST_REFRESH_INTERVAL', 30):
+                _checked_at = now
+                _refresh_thread = threading.Thread(target=_refresh_in_background, name='suggest-refresh', daemon=True)
+                _refresh_thread.start()
+    return _index
+
+
+def reset_index():
+    global _index, _versions
+    with _build_lock:
+        _index = _versions = None
+
+
+# Local saves patch the index in place but leave ``_versions`` alone: their
+# own version bump costs one background rebuild, whereas recording the
+# current versions here would also swallow bumps from other processes.
+def object_saved(instance):
+    if _index is None:
+        return
+    for source, text in _sources(type(instance), instance):
+        _index.add(source, text)
+
+
+def object_deleted(instance):
+    if _index is None:
+        return
+    for source, _ in _sources(type(instance), instance):
+        _index.remove(source)
+
+
+def suggest(prefix, limit=10):
+    return get_index().lookup(prefix, limit)
@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models import Event, Language, Project, Translation
+from core.utils_translation import clear_translation_cache
+
+
+class AsyncReadViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        hindi = Language.objects.create(name='Hindi', code='hi')
+        Language.objects.create(name='English', code='en', is_default=True)
+        now = timezone.now()
+        cls.projects = [
+            Project.objects.create(title=f'Project {n}', description='Long text', created_at=now - timedelta(days=n))
+            for n in range(12)
+        ]
+        Translation.objects.bulk_create([
+            Translation(language=hindi, model_name='Project', field_name='title',
+                        object_id=project.pk, translated_text=f'परियोजना {n}')
+            for n, project in enumerate(cls.projects)
+        ])
+        Event.objects.create(title='Camp', date=now)
+
+    def setUp(self):
+        clear_translation_cache()
+        self.addCleanup(clear_translation_cache)
+
+    async def test_list_matches_the_sync_viewset(self):
+        for query in ('', '?page=2', '?lang=hi', '?lang=hi&page=2'):
+            sync = await self.async_client.get(f'/api/projects/{query}')
+            response = await self.async_client.get(f'/api/async/projects/{query}')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.json()['results'], sync.json()['results'], query)
+            self.assertEqual(response.json()['count'], 12)
+        response = await self.async_client.get('/api/async/projects/?lang=hi')
+        self.assertEqual(response.json()['results'][0]['title'], 'परियोजना 0')
+        self.assertTrue(response.json()['next'].endswith('/api/async/projects/?lang=hi&page=2'))
+
+    async def test_detail_matches_the_sync_viewset(self):
+        pk = self.projects[3].pk
+        sync = await self.async_client.get(f'/api/projects/{pk}/?lang=hi')
+        response = await self.async_client.get(f'/api/async/projects/{pk}/?lang=hi')
+        self.assertEqual(response.json(), sync.json())
+        self.assertEqual(response.json()['title'], 'परियोजना 3')
+        missing = await self.async_client.get('/api/async/projects/999999/')
+        self.assertEqual(missing.status_code, 404)
+
+    async def test_out_of_range_pages_are_not_found(self):
+        for page in ('0', '3', 'x'):
+            response = await self.async_client.get(f'/api/async/projects/?page={page}')
+            self.assertEqual(response.status_code, 404, page)
+
+    def test_page_translations_load_in_one_query(self):
+        @async_to_sync
+        async def get(path):
+            return await self.async_client.get(path)
+
+        # count, page, default language, then one query for every translation on the page.
+        with self.assertNumQueries(4):
+            response = get('/api/async/projects/?lang=hi')
+        self.assertEqual(len(response.json()['results']), 10)
+        # Resolved translations are served from the cache afterwards.
+        with self.assertNumQueries(2):
+            get('/api/async/projects/?lang=hi')
+
+    async def test_other_models_use_their_ordering_and_summaries(self):
+        sync = await self.async_client.get('/api/events/')
+        response = await self.async_client.get('/api/async/events/')
+        self.assertEqual(response.json()['results'], sync.json()['results'])
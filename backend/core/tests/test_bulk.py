@@ -0,0 +1,42 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.models import Language, Translation
+
+
+class BulkActionsTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser('admin', 'admin@example.org', 'pw'))
+        self.hindi = Language.objects.create(name='Hindi', code='hi')
+
+    def item(self, object_id, text='x'):
+        return {'language': self.hindi.pk, 'model_name': 'Project', 'field_name': 'title',
+                'object_id': object_id, 'translated_text': text}
+
+    def test_create_reports_duplicates_within_the_batch_per_item(self):
+        response = self.client.post('/api/translations/bulk/', [self.item(1), self.item(2), self.item(1)],
+                                    format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), [
+            {'non_field_errors': ['Duplicated by item 2 in this batch.']},
+            {},
+            {'non_field_errors': ['Duplicates item 0 in this batch.']},
+        ])
+        self.assertFalse(Translation.objects.exists())
+
+    def test_update_reports_items_moved_onto_the_same_key(self):
+        first = Translation.objects.create(language=self.hindi, model_name='Project', field_name='title',
+                                           object_id=1)
+        second = Translation.objects.create(language=self.hindi, model_name='Project', field_name='title',
+                                            object_id=2)
+        response = self.client.patch('/api/translations/bulk/', [
+            {'id': first.pk, 'object_id': 3}, {'id': second.pk, 'object_id': 3}], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()[1], {'non_field_errors': ['Duplicates item 0 in this batch.']})
+
+    def test_distinct_items_are_created(self):
+        response = self.client.post('/api/translations/bulk/', [self.item(1), self.item(2)], format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(Translation.objects.count(), 2)
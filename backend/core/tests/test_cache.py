@@ -0,0 +1,54 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core.cache import get_model_versions
+from core.models import ChunkedUpload, Gallery
+
+
+@override_settings(RESPONSE_CACHE_ALLOW_LOCAL=True, ALLOWED_HOSTS=['a.example.org', 'b.example.org'])
+class CachedResponseTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        Gallery.objects.create(title='Camp', image='gallery/camp.jpg')
+
+    def image_url(self, **extra):
+        return APIClient().get('/api/gallery/', **extra).json()['results'][0]['image']
+
+    def test_hosts_and_schemes_get_their_own_entries(self):
+        self.assertTrue(self.image_url(HTTP_HOST='a.example.org').startswith('http://a.example.org/'))
+        self.assertTrue(self.image_url(HTTP_HOST='b.example.org').startswith('http://b.example.org/'))
+        self.assertTrue(self.image_url(HTTP_HOST='a.example.org', secure=True).startswith('https://a.example.org/'))
+
+    def test_repeat_request_is_served_from_cache(self):
+        client = APIClient()
+        first = client.get('/api/gallery/', HTTP_HOST='a.example.org')
+        response = client.get('/api/gallery/', HTTP_HOST='a.example.org', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+    @override_settings(RESPONSE_CACHE_ALLOW_LOCAL=False)
+    def test_process_local_cache_disables_response_caching(self):
+        response = APIClient().get('/api/gallery/', HTTP_HOST='a.example.org')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
+
+
+class VersionBumpTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_cached_model_is_bumped_on_commit(self):
+        before = get_model_versions([Gallery])
+        with self.captureOnCommitCallbacks() as callbacks:
+            Gallery.objects.create(title='Camp')
+            self.assertEqual(get_model_versions([Gallery]), before)
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(get_model_versions([Gallery]), before)
+
+    def test_internal_tables_do_not_bump(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            ChunkedUpload.objects.create(filename='a.pdf', size=1, target='report')
+        self.assertEqual(callbacks, [])
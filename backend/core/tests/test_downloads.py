@@ -0,0 +1,95 @@
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils.http import http_date
+
+from core.downloads import parse_range
+from core.models import Report
+
+DATA = bytes(range(256)) * 4
+
+
+class ParseRangeTests(SimpleTestCase):
+    def test_single_ranges(self):
+        self.assertEqual(parse_range('bytes=0-99', 1024), (0, 99))
+        self.assertEqual(parse_range('bytes=1000-', 1024), (1000, 1023))
+        self.assertEqual(parse_range('bytes=1000-5000', 1024), (1000, 1023))
+        self.assertEqual(parse_range('bytes=-100', 1024), (924, 1023))
+        self.assertEqual(parse_range('bytes=-5000', 1024), (0, 1023))
+
+    def test_unsatisfiable_ranges(self):
+        self.assertIs(parse_range('bytes=1024-', 1024), False)
+        self.assertIs(parse_range('bytes=-0', 1024), False)
+        self.assertIs(parse_range('bytes=50-10', 1024), False)
+
+    def test_whole_file_for_absent_malformed_or_multi_ranges(self):
+        for header in (None, '', 'bytes=-', 'items=0-1', 'bytes=0-1,5-9'):
+            self.assertIsNone(parse_range(header, 1024), header)
+        self.assertIsNone(parse_range('bytes=0-1', 0))
+
+
+class ReportDownloadTests(TestCase):
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media)
+        override = override_settings(MEDIA_ROOT=media)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.report = Report(title='Annual report 2024')
+        self.report.file.save('annual.pdf', ContentFile(DATA))
+        self.url = f'/api/reports/{self.report.pk}/download/'
+
+    def get(self, **headers):
+        return self.client.get(self.url, **headers)
+
+    def test_full_download(self):
+        response = self.get()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), DATA)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Content-Disposition'], 'inline; filename="Annual report 2024.pdf"')
+
+    def test_partial_download(self):
+        response = self.get(HTTP_RANGE='bytes=-24')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Content-Range'], f'bytes 1000-1023/{len(DATA)}')
+        self.assertEqual(b''.join(response.streaming_content), DATA[1000:])
+
+    def test_unsatisfiable_range(self):
+        response = self.get(HTTP_RANGE='bytes=5000-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(DATA)}')
+
+    def test_if_range_mismatch_serves_the_whole_file(self):
+        etag = self.get()['ETag']
+        self.assertEqual(self.get(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=etag).status_code, 206)
+        response = self.get(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), DATA)
+        response = self.get(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE=http_date(0))
+        self.assertEqual(response.status_code, 200)
+
+    def test_conditional_requests(self):
+        first = self.get()
+        not_modified = self.get(HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['ETag'], first['ETag'])
+        self.assertNotIn('Content-Disposition', not_modified)
+        self.assertEqual(self.get(HTTP_IF_MODIFIED_SINCE=first['Last-Modified']).status_code, 304)
+        self.assertEqual(self.get(HTTP_IF_MATCH='"other"').status_code, 412)
+
+    @override_settings(FILE_DOWNLOAD_OFFLOAD='x-accel', FILE_DOWNLOAD_ACCEL_PREFIX='/protected/')
+    def test_x_accel_offload(self):
+        response = self.get(HTTP_RANGE='bytes=0-9')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['X-Accel-Redirect'], '/protected/' + self.report.file.name)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+
+    @override_settings(FILE_DOWNLOAD_OFFLOAD='x-sendfile')
+    def test_x_sendfile_offload(self):
+        response = self.get()
+        self.assertEqual(response['X-Sendfile'], self.report.file.path)
+        self.assertEqual(response.content, b'')
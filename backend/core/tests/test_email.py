@@ -0,0 +1,89 @@
+import smtplib
+from unittest import mock
+
+from django.core.mail import EmailMessage
+from django.test import SimpleTestCase, override_settings
+
+from core.utils_email import MailDispatcher, is_transient_error, send_messages_with_retry
+
+
+class FakeConnection:
+    """Accepts every message except those addressed to ``refused``."""
+
+    def __init__(self, refused=()):
+        self.refused = set(refused)
+        self.sent = []
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def send_messages(self, messages):
+        for message in messages:
+            if set(message.to) & self.refused:
+                raise smtplib.SMTPRecipientsRefused({message.to[0]: (550, b'no such user')})
+            self.sent.extend(message.to)
+        return len(messages)
+
+
+def make_messages(*recipients):
+    return [EmailMessage('Hello', 'body', 'from@example.org', [to]) for to in recipients]
+
+
+class TransientErrorTests(SimpleTestCase):
+    def test_smtp_errors_are_classified_before_oserror(self):
+        transient = [
+            smtplib.SMTPServerDisconnected('Connection unexpectedly closed'),
+            smtplib.SMTPConnectError(421, b'Too many connections'),
+            smtplib.SMTPDataError(451, b'Try again later'),
+            smtplib.SMTPRecipientsRefused({'a@example.org': (450, b'Greylisted')}),
+            ConnectionResetError(),
+            TimeoutError(),
+        ]
+        permanent = [
+            smtplib.SMTPAuthenticationError(535, b'Bad credentials'),
+            smtplib.SMTPSenderRefused(550, b'Not allowed', 'from@example.org'),
+            smtplib.SMTPConnectError(554, b'No service'),
+            smtplib.SMTPRecipientsRefused({'a@example.org': (450, b'Later'), 'b@example.org': (550, b'No')}),
+            smtplib.SMTPNotSupportedError('STARTTLS extension not supported by server.'),
+            smtplib.SMTPException('No suitable authentication method found.'),
+            ValueError('bad header'),
+        ]
+        for exc in transient:
+            self.assertTrue(is_transient_error(exc), repr(exc))
+        for exc in permanent:
+            self.assertFalse(is_transient_error(exc), repr(exc))
+
+
+@override_settings(MAIL_RETRY_BACKOFF=0)
+class SendWithRetryTests(SimpleTestCase):
+    def test_refused_recipient_raises_without_callback(self):
+        connection = FakeConnection(refused={'b@example.org'})
+        with self.assertRaises(smtplib.SMTPRecipientsRefused):
+            send_messages_with_retry(make_messages('a@example.org', 'b@example.org'), connection=connection)
+
+    def test_refused_recipient_is_skipped_with_callback(self):
+        connection = FakeConnection(refused={'b@example.org'})
+        failed = []
+        sent = send_messages_with_retry(make_messages('a@example.org', 'b@example.org', 'c@example.org'),
+                                        connection=connection,
+                                        on_failure=lambda message, exc: failed.append(message.to[0]))
+        self.assertEqual(sent, 2)
+        self.assertEqual(connection.sent, ['a@example.org', 'c@example.org'])
+        self.assertEqual(failed, ['b@example.org'])
+
+
+@override_settings(MAIL_RETRY_BACKOFF=0)
+class MailDispatcherTests(SimpleTestCase):
+    def test_one_bad_message_does_not_drop_the_batch(self):
+        connection = FakeConnection(refused={'b@example.org'})
+        dispatcher = MailDispatcher(workers=1)
+        with mock.patch('core.utils_email.get_connection', return_value=connection), \
+                self.assertLogs('core.utils_email', 'ERROR'):
+            for message in make_messages('a@example.org', 'b@example.org', 'c@example.org'):
+                dispatcher._queue.put(message)
+            dispatcher.start()
+            self.assertTrue(dispatcher.flush(timeout=5))
+        self.assertEqual(connection.sent, ['a@example.org', 'c@example.org'])
@@ -0,0 +1,12 @@
+import io
+
+from django.core.management import call_command
+from django.test import TestCase
+
+
+class ExplainQueriesTests(TestCase):
+    def test_no_list_or_cursor_query_scans(self):
+        out = io.StringIO()
+        call_command('explain_queries', '--fail-on-scan', stdout=out)
+        self.assertIn('donations [list, keyset cursor]: ok', out.getvalue())
+        self.assertIn('0 flagged queries', out.getvalue())
@@ -0,0 +1,47 @@
+import csv
+import datetime
+import io
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core import exports
+from core.models import Donation, Newsletter
+
+
+class ExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_superuser('admin', 'admin@example.org', 'pw'))
+
+    def body(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_donations_csv_is_limited_to_the_date_range(self):
+        for day, donor in ((1, 'early'), (15, '=HYPERLINK("x")'), (28, 'late')):
+            Donation.objects.create(donor=donor, amount='5.00', date=datetime.date(2024, 3, day), phone='+91 98765')
+        response = self.client.get('/api/exports/donations/', {'from': '2024-03-10', 'to': '2024-03-28'})
+        self.assertEqual(response['Content-Disposition'],
+                         'attachment; filename="donations_2024-03-10_2024-03-28.csv"')
+        rows = list(csv.DictReader(io.StringIO(self.body(response))))
+        self.assertEqual([row['donor'] for row in rows], ['\'=HYPERLINK("x")', 'late'])
+        self.assertEqual(rows[0]['phone'], '+91 98765')
+
+    def test_subscribers_ndjson_applies_filters(self):
+        Newsletter.objects.create(email='on@example.org')
+        Newsletter.objects.create(email='off@example.org', is_active=False)
+        response = self.client.get('/api/exports/subscribers/', {'output': 'ndjson', 'active': 'true'})
+        lines = [json.loads(line) for line in self.body(response).splitlines()]
+        self.assertEqual([line['email'] for line in lines], ['on@example.org'])
+
+    def test_rows_are_streamed_in_blocks(self):
+        count = exports.ROWS_PER_BLOCK + 1
+        Newsletter.objects.bulk_create([Newsletter(email=f'{i}@example.org') for i in range(count)])
+        spec = exports.EXPORTS['subscribers']
+        blocks = list(exports.stream_rows(spec, exports.export_queryset(spec)))
+        self.assertEqual(len(blocks), 2)
+
+    def test_exports_are_admin_only(self):
+        self.assertEqual(APIClient().get('/api/exports/donations/').status_code, 401)
@@ -0,0 +1,63 @@
+from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from core.models import Project
+from core.serializers import ProjectSerializer, ProjectSummarySerializer
+
+
+class ProjectWithRelatedSerializer(ProjectSerializer):
+    summary = ProjectSummarySerializer(source='*', read_only=True)
+    related = ProjectSummarySerializer(many=True, read_only=True)
+
+
+class SparseFieldsetTests(TestCase):
+    def setUp(self):
+        self.project = Project.objects.create(title='Clean water', description='Wells', category='Health')
+        self.client = APIClient()
+
+    def get(self, path, **params):
+        response = self.client.get(path, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_fields_and_omit_on_detail_and_list(self):
+        detail = f'/api/projects/{self.project.pk}/'
+        self.assertEqual(self.get(detail, fields='id,title'), {'id': self.project.pk, 'title': 'Clean water'})
+        self.assertNotIn('description', self.get(detail, omit='description,image_srcset'))
+        self.assertNotIn('image_srcset', self.get(detail, omit='image_srcset'))
+        self.assertEqual(self.get('/api/projects/', fields='id')['results'], [{'id': self.project.pk}])
+
+    def test_unknown_names_are_ignored_by_both_parameters(self):
+        detail = f'/api/projects/{self.project.pk}/'
+        full = self.get(detail)
+        self.assertEqual(self.get(detail, omit='nonsense'), full)
+        self.assertEqual(self.get(detail, fields='id,nonsense'), {'id': self.project.pk})
+        self.assertEqual(self.get(detail, fields='nonsense'), {})
+        self.assertEqual(self.get(detail, fields=' id , ,title,'), {'id': self.project.pk, 'title': 'Clean water'})
+
+    def test_list_selection_stays_within_the_summary_fields(self):
+        # description is only on the detail serializer; asking for it does not widen the summary.
+        self.assertEqual(self.get('/api/projects/', fields='id,description')['results'], [{'id': self.project.pk}])
+        self.assertEqual(self.get(f'/api/projects/{self.project.pk}/', fields='id,description'),
+                         {'id': self.project.pk, 'description': 'Wells'})
+
+    def test_selection_does_not_reach_nested_serializers(self):
+        self.project.related = [Project.objects.create(title='School kits')]
+        request = Request(APIRequestFactory().get('/', {'fields': 'id,summary,related', 'omit': 'category'}))
+        data = ProjectWithRelatedSerializer(self.project, context={'request': request}).data
+        self.assertEqual(set(data), {'id', 'summary', 'related'})
+        self.assertEqual(data['summary']['category'], 'Health')
+        self.assertEqual(data['summary']['title'], 'Clean water')
+        self.assertEqual(data['related'][0]['title'], 'School kits')
+        self.assertIn('category', data['related'][0])
+
+    def test_async_views_honour_the_same_parameters(self):
+        self.assertEqual(self.get('/api/async/projects/', fields='id')['results'], [{'id': self.project.pk}])
+        self.assertEqual(self.get(f'/api/async/projects/{self.project.pk}/', fields='id,nonsense'),
+                         {'id': self.project.pk})
+
+    def test_writes_ignore_the_parameters(self):
+        request = Request(APIRequestFactory().post('/?fields=id'))
+        serializer = ProjectSerializer(self.project, context={'request': request})
+        self.assertIn('title', serializer.data)
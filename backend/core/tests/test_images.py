@@ -0,0 +1,82 @@
+import io
+import os
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from PIL import Image
+from rest_framework.test import APIClient
+
+from core.models import Gallery, Project
+
+
+def png(width=800, height=400, color=(255, 0, 0)):
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), color).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+@override_settings(IMAGE_VARIANTS_SYNC=True, IMAGE_VARIANT_WIDTHS=[320, 640, 1024], IMAGE_VARIANT_FORMATS=['webp'])
+class ImageProcessingTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media)
+        override = override_settings(MEDIA_ROOT=self.media)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def upload(self, instance, data, name='photo.png'):
+        with self.captureOnCommitCallbacks(execute=True):
+            instance.image.save(name, ContentFile(data))
+        instance.refresh_from_db()
+        return instance
+
+    def test_upload_builds_variants_and_metadata(self):
+        gallery = self.upload(Gallery(title='Camp'), png())
+        variants = gallery.image_variants
+        self.assertEqual(variants['source'], gallery.image.name)
+        self.assertEqual(sorted(variants['webp'], key=int), ['320', '640', '800'])
+        for name in variants['webp'].values():
+            self.assertTrue(os.path.exists(os.path.join(self.media, name)))
+        self.assertEqual((gallery.image_width, gallery.image_height), (800, 400))
+        self.assertEqual(gallery.image_color, '#ff0000')
+        self.assertTrue(gallery.image_blurhash)
+
+    def test_replacing_the_image_deletes_old_variants(self):
+        gallery = self.upload(Gallery(title='Camp'), png())
+        old = list(gallery.image_variants['webp'].values())
+        gallery = self.upload(gallery, png(color=(0, 0, 255)), 'other.png')
+        self.assertEqual(gallery.image_color, '#0000ff')
+        for name in old:
+            self.assertFalse(os.path.exists(os.path.join(self.media, name)))
+
+    def test_clients_cannot_write_variant_names(self):
+        project = Project.objects.create(title='Water')
+        client = APIClient()
+        client.force_authenticate(User.objects.create_superuser('admin', 'admin@example.org', 'pw'))
+        response = client.patch(f'/api/projects/{project.pk}/',
+                                {'image_variants': {'webp': {'320': '../settings.py'}}, 'image_width': 1},
+                                format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        project.refresh_from_db()
+        self.assertEqual((project.image_variants, project.image_width), ({}, None))
+
+    def test_process_images_backfills_unprocessed_rows(self):
+        with self.settings(IMAGE_VARIANTS_SYNC=False), self.captureOnCommitCallbacks(execute=False):
+            gallery = Gallery(title='Camp')
+            gallery.image.save('photo.png', ContentFile(png(200, 100)))
+        self.assertIsNone(Gallery.objects.get().image_width)
+
+        with ThreadPoolExecutor(1) as pool, \
+                mock.patch('core.management.commands.process_images.get_pool', return_value=pool):
+            out = io.StringIO()
+            call_command('process_images', '--model', 'gallery', stdout=out)
+        self.assertIn('Processed 1 images (0 failed)', out.getvalue())
+        gallery.refresh_from_db()
+        self.assertEqual((gallery.image_width, gallery.image_height), (200, 100))
+        self.assertEqual(sorted(gallery.image_variants['webp'], key=int), ['200'])
@@ -0,0 +1,74 @@
+import datetime
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core import impact
+from core.models import Donation, Impact, Project, Volunteer
+
+DAY = datetime.date(2024, 3, 5)
+
+
+class ImpactCounterTests(TestCase):
+    def setUp(self):
+        self.total = Impact.objects.create(title='Raised', source='donations_total')
+        self.count = Impact.objects.create(title='Donations', source='donations_count')
+        self.education = Impact.objects.create(title='For education', source='donations_total',
+                                               source_key='Education')
+
+    def numbers(self):
+        return [impact.number or 0 for impact in Impact.objects.order_by('pk')]
+
+    def assert_matches_recompute(self):
+        numbers = self.numbers()
+        impact.recompute_counters()
+        self.assertEqual(self.numbers(), numbers)
+
+    def test_donations_apply_deltas_without_recomputing(self):
+        with mock.patch.object(impact, 'recompute_counters') as recompute:
+            donation = Donation.objects.create(amount='100.00', purpose='Education', date=DAY)
+            Donation.objects.create(amount='40.00', purpose='Health', date=DAY, status='Completed')
+            donation.status = 'Completed'
+            donation.save()
+            donation.purpose = 'Health'
+            donation.save()
+        recompute.assert_not_called()
+        self.assertEqual(self.numbers(), [140, 2, 0])
+        self.assert_matches_recompute()
+
+        donation.delete()
+        self.assertEqual(self.numbers(), [40, 1, 0])
+        self.assert_matches_recompute()
+
+    def test_fractional_amounts_recompute_the_total(self):
+        Donation.objects.create(amount='10.60', purpose='Education', date=DAY, status='Completed')
+        Donation.objects.create(amount='10.60', purpose='Education', date=DAY, status='Completed')
+        self.assertEqual(self.numbers(), [21, 2, 21])
+        self.assert_matches_recompute()
+
+    def test_volunteer_and_project_counters(self):
+        active = Impact.objects.create(source='volunteers_active')
+        trees = Impact.objects.create(source='project_impact', source_key='trees')
+        volunteer = Volunteer.objects.create(name='Asha', status='Active')
+        Volunteer.objects.create(name='Ravi')
+        project = Project.objects.create(title='Green belt', impact_numbers={'trees': 120})
+        project.impact_numbers = {'trees': '1,000'}
+        project.save()
+        volunteer.delete()
+        active.refresh_from_db()
+        trees.refresh_from_db()
+        self.assertEqual((active.number, trees.number), (0, 1000))
+
+
+class ImpactViewSetTests(TestCase):
+    def test_anyone_can_read_only_admins_can_write(self):
+        Impact.objects.create(title='Meals served', number=5000)
+        client = APIClient()
+        response = client.get('/api/impact/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'][0]['number'], 5000)
+        self.assertEqual(client.post('/api/impact/', {'title': 'x', 'number': 1}).status_code, 401)
+        client.force_authenticate(User.objects.create_user('staff', is_staff=True))
+        self.assertEqual(client.post('/api/impact/', {'title': 'x', 'number': 1}).status_code, 201)
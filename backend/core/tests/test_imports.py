@@ -0,0 +1,54 @@
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.imports import import_records
+from core.models import Language, Newsletter, Translation, Volunteer
+
+
+def lines(text):
+    return text.encode().splitlines(keepends=True)
+
+
+class ImportTests(TestCase):
+    def setUp(self):
+        self.hindi = Language.objects.create(name='Hindi', code='hi')
+
+    def test_translations_upsert_and_bad_rows_are_reported(self):
+        Translation.objects.create(language=self.hindi, model_name='Project', field_name='title', object_id=1,
+                                   translated_text='old')
+        result = import_records('translations', lines(
+            'language,model_name,field_name,object_id,translated_text\n'
+            'hi,Project,title,1,new\n'
+            'xx,Project,title,2,unknown language\n'
+            'HI,Project,title,3,added\n'
+        ))
+        self.assertEqual((result['rows'], result['imported'], result['failed']), (3, 2, 1))
+        self.assertEqual(result['errors'], [{'row': 2, 'errors': {'language': ['Unknown language: xx']}}])
+        self.assertEqual(dict(Translation.objects.values_list('object_id', 'translated_text')),
+                         {1: 'new', 3: 'added'})
+
+    def test_subscribers_without_is_active_are_not_resubscribed(self):
+        Newsletter.objects.create(email='gone@example.org', is_active=False)
+        result = import_records('subscribers', lines(
+            '{"email": "gone@example.org"}\n{"email": "new@example.org"}\n{"email": "not-an-email"}\n'
+        ), 'ndjson')
+        self.assertEqual((result['imported'], result['failed']), (2, 1))
+        self.assertEqual(dict(Newsletter.objects.values_list('email', 'is_active')),
+                         {'gone@example.org': False, 'new@example.org': True})
+
+    def test_dry_run_writes_nothing(self):
+        result = import_records('volunteers', lines('[{"name": "Asha"}, {"email": "x@example.org"}]'), 'json',
+                                dry_run=True)
+        self.assertEqual((result['imported'], result['failed']), (1, 1))
+        self.assertFalse(Volunteer.objects.exists())
+
+    def test_endpoint_accepts_a_multipart_file(self):
+        client = APIClient()
+        client.force_authenticate(User.objects.create_superuser('admin', 'admin@example.org', 'pw'))
+        upload = SimpleUploadedFile('subscribers.csv', b'email,is_active\na@example.org,yes\n', 'text/csv')
+        response = client.post('/api/imports/subscribers/', {'file': upload})
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['imported'], 1)
+        self.assertTrue(Newsletter.objects.get(email='a@example.org').is_active)
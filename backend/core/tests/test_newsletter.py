@@ -0,0 +1,68 @@
+import smtplib
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from core.models import Newsletter, NewsletterCampaign
+from core.tests.test_email import FakeConnection
+
+
+class DisconnectingConnection(FakeConnection):
+    """Drops the connection on every message addressed to ``unreachable``."""
+
+    def __init__(self, unreachable):
+        super().__init__()
+        self.unreachable = unreachable
+
+    def send_messages(self, messages):
+        if messages[0].to[0] == self.unreachable:
+            raise smtplib.SMTPServerDisconnected('gone')
+        return super().send_messages(messages)
+
+
+@override_settings(MAIL_RETRY_BACKOFF=0, MAIL_MAX_RETRIES=1)
+class SendNewsletterCampaignTests(TestCase):
+    def setUp(self):
+        self.subscribers = [Newsletter.objects.create(email=f'{name}@example.org') for name in 'abc']
+        self.campaign = NewsletterCampaign.objects.create(subject='News', body='Hello')
+
+    def run_command(self, connection, rate='0'):
+        with mock.patch('core.management.commands.send_newsletter_campaign.get_connection',
+                        return_value=connection):
+            call_command('send_newsletter_campaign', self.campaign.pk, '--rate', rate, stdout=mock.Mock(),
+                         stderr=mock.Mock())
+        self.campaign.refresh_from_db()
+
+    def test_refused_recipient_is_skipped_and_campaign_finishes(self):
+        connection = FakeConnection(refused={'b@example.org'})
+        self.run_command(connection)
+        self.assertEqual(connection.sent, ['a@example.org', 'c@example.org'])
+        self.assertEqual(self.campaign.status, 'Sent')
+        self.assertEqual((self.campaign.sent_count, self.campaign.failed_count), (2, 1))
+        self.assertEqual(self.campaign.last_subscriber_id, self.subscribers[-1].pk)
+
+    def test_rerun_after_outage_resumes_without_resending(self):
+        first = DisconnectingConnection('c@example.org')
+        with self.assertRaisesMessage(CommandError, 're-run the command to resume'):
+            self.run_command(first)
+        self.campaign.refresh_from_db()
+        self.assertEqual(self.campaign.status, 'Paused')
+        self.assertEqual(self.campaign.last_subscriber_id, self.subscribers[1].pk)
+
+        second = FakeConnection()
+        self.run_command(second)
+        self.assertEqual(first.sent + second.sent, ['a@example.org', 'b@example.org', 'c@example.org'])
+        self.assertEqual((self.campaign.status, self.campaign.sent_count), ('Sent', 3))
+
+    def test_rate_limit_spaces_every_message(self):
+        clock = [100.0]
+        fake_time = mock.Mock(monotonic=lambda: clock[0], sleep=lambda seconds: clock.__setitem__(0, clock[0] + seconds))
+        sent_at = []
+        connection = FakeConnection()
+        send = connection.send_messages
+        connection.send_messages = lambda messages: sent_at.append(clock[0]) or send(messages)
+        with mock.patch('core.management.commands.send_newsletter_campaign.time', fake_time):
+            self.run_command(connection, rate='2')
+        self.assertEqual(sent_at, [100.0, 100.5, 101.0])
+        self.assertEqual(self.campaign.status, 'Sent')
@@ -0,0 +1,137 @@
+import hashlib
+import hmac
+import json
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import IntegrityError
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core.models import Donation, PaymentEvent
+
+
+@override_settings(RAZORPAY_WEBHOOK_SECRET='s3cret')
+class PaymentWebhookTests(TestCase):
+    def setUp(self):
+        self.donation = Donation.objects.create(donor='Asha', amount='1000.00', order_id='order_1',
+                                                email='asha@example.org')
+        patcher = mock.patch('core.payments.send_donation_receipts')
+        self.receipts = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def post(self, body, event_id='evt_1', signature=None):
+        raw = json.dumps(body).encode()
+        signature = signature or hmac.new(b's3cret', raw, hashlib.sha256).hexdigest()
+        with self.captureOnCommitCallbacks(execute=True):
+            return APIClient().post('/api/payments/webhook/', raw, content_type='application/json',
+                                    HTTP_X_RAZORPAY_SIGNATURE=signature, HTTP_X_RAZORPAY_EVENT_ID=event_id)
+
+    def captured(self, amount=100000, currency='INR'):
+        entity = {'id': 'pay_1', 'order_id': 'order_1', 'amount': amount, 'currency': currency}
+        return {'event': 'payment.captured', 'payload': {'payment': {'entity': entity}}}
+
+    def test_captured_payment_completes_donation_once(self):
+        self.assertEqual(self.post(self.captured()).json(), {'status': 'ok'})
+        self.assertEqual(self.post(self.captured()).json(), {'status': 'duplicate'})
+        self.post(self.captured(), event_id='evt_2')
+        self.donation.refresh_from_db()
+        self.assertEqual((self.donation.status, self.donation.payment_id), ('Completed', 'pay_1'))
+        self.assertEqual(self.receipts.call_count, 1)
+        self.assertEqual(PaymentEvent.objects.count(), 2)
+
+    def test_other_integrity_errors_are_not_acked(self):
+        with mock.patch('core.payments.apply_payment_status', side_effect=IntegrityError('NOT NULL failed')):
+            with self.assertRaises(IntegrityError):
+                self.post(self.captured())
+        self.assertFalse(PaymentEvent.objects.exists())
+
+    def test_bad_signature_is_rejected(self):
+        self.assertEqual(self.post(self.captured(), signature='bad').status_code, 400)
+        self.assertFalse(PaymentEvent.objects.exists())
+
+    def test_amount_mismatch_leaves_donation_pending(self):
+        self.post(self.captured(amount=100))
+        self.donation.refresh_from_db()
+        self.assertEqual(self.donation.status, 'Pending')
+        event = PaymentEvent.objects.get()
+        self.assertEqual(event.donation, self.donation)
+        self.assertIn('amount 100', event.error)
+        self.receipts.assert_not_called()
+
+    def test_currency_mismatch_leaves_donation_pending(self):
+        self.post(self.captured(currency='USD'))
+        self.donation.refresh_from_db()
+        self.assertEqual(self.donation.status, 'Pending')
+        self.assertIn('currency', PaymentEvent.objects.get().error)
+
+
+class CreatePaymentTests(TestCase):
+    # Donors are anonymous, so these requests carry no credentials.
+    def setUp(self):
+        self.client = APIClient()
+        self.razorpay = mock.MagicMock()
+        self.razorpay.order.create.return_value = {'id': 'order_9'}
+        patcher = mock.patch('core.payments.get_client', return_value=self.razorpay)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_order_for_donation_bills_donation_amount(self):
+        donation = Donation.objects.create(amount='100000.00')
+        response = self.client.post('/api/payments/create/', {'amount': '1', 'donation_id': donation.pk},
+                                    format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(self.razorpay.order.create.call_args[0][0]['amount'], 10000000)
+        donation.refresh_from_db()
+        self.assertEqual(donation.order_id, 'order_9')
+
+    def test_callback_with_valid_signature_completes_donation(self):
+        donation = Donation.objects.create(amount='10.00', order_id='order_9')
+        with self.captureOnCommitCallbacks(execute=True), mock.patch('core.payments.send_donation_receipts'):
+            response = self.client.post('/api/payments/callback/', {
+                'razorpay_payment_id': 'pay_9', 'razorpay_order_id': 'order_9', 'razorpay_signature': 'sig',
+            }, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        donation.refresh_from_db()
+        self.assertEqual((donation.status, donation.payment_id), ('Completed', 'pay_9'))
+
+    def test_callback_with_bad_signature_is_refused(self):
+        Donation.objects.create(amount='10.00', order_id='order_9')
+        self.razorpay.utility.verify_payment_signature.side_effect = ValueError('bad signature')
+        response = self.client.post('/api/payments/callback/', {
+            'razorpay_payment_id': 'pay_9', 'razorpay_order_id': 'order_9', 'razorpay_signature': 'bad',
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Donation.objects.get().status, 'Pending')
+
+    def test_completed_or_unknown_donation_is_refused(self):
+        donation = Donation.objects.create(amount='10.00', status='Completed')
+        response = self.client.post('/api/payments/create/', {'donation_id': donation.pk}, format='json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/payments/create/', {'donation_id': 999}, format='json')
+        self.assertEqual(response.status_code, 404)
+        self.razorpay.order.create.assert_not_called()
+
+
+class DonationEndpointTests(TestCase):
+    def test_anonymous_cannot_list_donations(self):
+        Donation.objects.create(donor='Asha', amount='10.00', email='asha@example.org', phone='99999')
+        self.assertEqual(APIClient().get('/api/donations/').status_code, 401)
+        admin = APIClient()
+        admin.force_authenticate(User.objects.create_superuser('admin', 'admin@example.org', 'pw'))
+        self.assertEqual(admin.get('/api/donations/').json()['results'][0]['email'], 'asha@example.org')
+
+    def test_anonymous_donation_cannot_be_created_completed(self):
+        response = APIClient().post('/api/donations/', {'donor': 'Asha', 'amount': '10.00', 'date': '2024-01-01',
+                                                         'status': 'Completed'}, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(Donation.objects.get().status, 'Pending')
+
+    def test_admin_can_mark_a_manual_donation_completed(self):
+        donation = Donation.objects.create(donor='Asha', amount='10.00')
+        admin = APIClient()
+        admin.force_authenticate(User.objects.create_superuser('admin', 'admin@example.org', 'pw'))
+        response = admin.patch(f'/api/donations/{donation.pk}/', {'status': 'Completed'}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        donation.refresh_from_db()
+        self.assertEqual(donation.status, 'Completed')
@@ -0,0 +1,56 @@
+import datetime
+import io
+from decimal import Decimal
+
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.models import Donation, DonationRollup
+
+DAY = datetime.date(2024, 3, 5)
+
+
+class DonationRollupTests(TestCase):
+    def buckets(self):
+        return {(row.day, row.purpose, row.status): (row.total, row.count)
+                for row in DonationRollup.objects.exclude(count=0)}
+
+    def test_saves_and_deletes_apply_deltas(self):
+        first = Donation.objects.create(amount='10.00', purpose='Education', date=DAY)
+        Donation.objects.create(amount='5.00', purpose='Education', date=DAY)
+        self.assertEqual(self.buckets(), {(DAY, 'Education', 'Pending'): (Decimal('15.00'), 2)})
+
+        first.status = 'Completed'
+        first.save()
+        self.assertEqual(self.buckets(), {
+            (DAY, 'Education', 'Pending'): (Decimal('5.00'), 1),
+            (DAY, 'Education', 'Completed'): (Decimal('10.00'), 1),
+        })
+
+        first.delete()
+        self.assertEqual(self.buckets(), {(DAY, 'Education', 'Pending'): (Decimal('5.00'), 1)})
+
+    def test_rebuild_repairs_changes_that_bypassed_signals(self):
+        Donation.objects.create(amount='10.00', purpose='Health', date=DAY)
+        Donation.objects.update(amount='25.00')
+        call_command('rebuild_donation_rollups', '--from', '2024-03-01', '--to', '2024-03-31', stdout=io.StringIO())
+        self.assertEqual(self.buckets(), {(DAY, 'Health', 'Pending'): (Decimal('25.00'), 1)})
+
+
+class DonationStatsTests(TestCase):
+    def test_totals_by_purpose(self):
+        for amount, purpose in (('10.00', 'Education'), ('30.00', 'Health'), ('5.00', 'Education')):
+            Donation.objects.create(amount=amount, purpose=purpose, date=DAY, status='Completed')
+        Donation.objects.create(amount='99.00', purpose='Health', date=DAY)
+        body = APIClient().get('/api/donations/stats/', {'from': '2024-03-01', 'to': '2024-03-31'}).json()
+        self.assertEqual((Decimal(str(body['total'])), body['count']), (Decimal('45'), 3))
+        self.assertEqual([(row['purpose'], row['count']) for row in body['by_purpose']],
+                         [('Health', 1), ('Education', 2)])
+
+    def test_bad_ranges_are_rejected(self):
+        client = APIClient()
+        self.assertEqual(client.get('/api/donations/stats/', {'from': '2024-02-30'}).status_code, 400)
+        self.assertEqual(client.get('/api/donations/stats/', {'from': 'march'}).status_code, 400)
+        response = client.get('/api/donations/stats/', {'from': '2024-03-31', 'to': '2024-03-01'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,53 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core import search
+from core.models import Event, Gallery, Language, Project, Translation
+
+
+class FullTextSearchTests(TestCase):
+    def setUp(self):
+        self.water = Project.objects.create(title='Clean water', description='Wells for villages')
+        self.school = Project.objects.create(title='School kits', description='Books and clean water bottles')
+        self.event = Event.objects.create(title='Tree planting', description='Planting drive', location='Pune')
+
+    def ids(self, query, **kwargs):
+        return [(row['type'], row['id']) for row in search.search(query, **kwargs)]
+
+    def test_title_matches_rank_above_body_matches(self):
+        self.assertEqual(self.ids('clean water'), [('project', self.water.pk), ('project', self.school.pk)])
+
+    def test_last_word_matches_as_prefix_and_types_filter(self):
+        self.assertEqual(self.ids('plant'), [('event', self.event.pk)])
+        self.assertEqual(self.ids('plant', models=[Project]), [])
+        self.assertEqual(search.search('Wells')[0]['snippet'], '<mark>Wells</mark> for villages')
+
+    def test_translated_rows_are_used_for_their_language(self):
+        hindi = Language.objects.create(name='Hindi', code='hi')
+        Translation.objects.create(language=hindi, model_name='Project', field_name='title',
+                                   object_id=self.water.pk, translated_text='स्वच्छ पानी')
+        self.assertEqual(self.ids('पानी', language='hi'), [('project', self.water.pk)])
+        self.assertEqual(self.ids('पानी'), [])
+        # Untranslated fields fall back to the original text in the language row.
+        hit = search.search('wells', language='hi')[0]
+        self.assertEqual((hit['language'], hit['title']), ('hi', 'स्वच्छ पानी'))
+        self.assertEqual(search.search('school', language='hi')[0]['title'], '<mark>School</mark> kits')
+
+    def test_saves_and_deletes_reindex(self):
+        self.water.title = 'Solar lamps'
+        self.water.save()
+        self.assertEqual(self.ids('solar'), [('project', self.water.pk)])
+        self.water.delete()
+        self.assertEqual(self.ids('solar'), [])
+
+    def test_rebuild_repopulates_the_index(self):
+        Project.objects.filter(pk=self.water.pk).update(title='Rainwater harvesting')
+        self.assertEqual(self.ids('rainwater'), [])
+        self.assertEqual(search.rebuild([Project]), 2)
+        self.assertEqual(self.ids('rainwater'), [('project', self.water.pk)])
+
+    def test_gallery_search_filter(self):
+        camp = Gallery.objects.create(title='Medical camp', description='Free checkups')
+        Gallery.objects.create(title='Tree planting')
+        response = APIClient().get('/api/gallery/', {'search': 'checkup'})
+        self.assertEqual([row['id'] for row in response.json()['results']], [camp.pk])
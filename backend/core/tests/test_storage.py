@@ -0,0 +1,90 @@
+import os
+import shutil
+import tempfile
+
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db.models import F
+from django.test import TestCase, override_settings
+
+from core.models import Report, StoredFile
+
+
+class ContentAddressedStorageTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media)
+        override = override_settings(MEDIA_ROOT=self.media)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def save(self, report, name, data):
+        with self.captureOnCommitCallbacks(execute=True):
+            report.file.save(name, ContentFile(data))
+        return report.file.name
+
+    def blobs(self):
+        return sorted(os.path.relpath(os.path.join(directory, name), self.media)
+                      for directory, _, names in os.walk(self.media) for name in names)
+
+    def test_identical_files_share_one_blob(self):
+        first = self.save(Report(title='2023'), 'a.pdf', b'same')
+        second = self.save(Report(title='2024'), 'b.pdf', b'same')
+        self.assertEqual(first, second)
+        self.assertRegex(first, r'^cas/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.pdf$')
+        self.assertEqual(StoredFile.objects.get(name=first).refcount, 2)
+        self.assertEqual(self.blobs(), [first])
+
+    def test_replacing_a_file_releases_the_old_blob(self):
+        report = Report(title='annual')
+        old = self.save(report, 'a.pdf', b'first')
+        new = self.save(report, 'b.pdf', b'second')
+        self.assertFalse(StoredFile.objects.filter(name=old).exists())
+        self.assertEqual(self.blobs(), [new])
+        with self.captureOnCommitCallbacks(execute=True):
+            report.delete()
+        self.assertFalse(StoredFile.objects.exists())
+        self.assertEqual(self.blobs(), [])
+
+    def test_shared_blob_survives_replacement_by_one_owner(self):
+        shared = self.save(Report(title='one'), 'a.pdf', b'shared')
+        other = Report(title='two')
+        self.save(other, 'a.pdf', b'shared')
+        self.save(other, 'b.pdf', b'own')
+        self.assertEqual(StoredFile.objects.get(name=shared).refcount, 1)
+        self.assertIn(shared, self.blobs())
+
+    def test_clearing_a_file_releases_it_once(self):
+        cleared = Report(title='cleared')
+        name = self.save(cleared, 'a.pdf', b'data')
+        deleted = Report(title='deleted')
+        self.save(deleted, 'a.pdf', b'data')
+        with self.captureOnCommitCallbacks(execute=True):
+            cleared.file = None
+            cleared.save()
+        self.assertEqual(StoredFile.objects.get(name=name).refcount, 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            deleted.file.delete()
+        self.assertFalse(StoredFile.objects.exists())
+        self.assertEqual(self.blobs(), [])
+
+    def test_prune_reclaims_leaked_references(self):
+        report = Report(title='leaky')
+        leaked = self.save(report, 'a.pdf', b'old')
+        current = self.save(report, 'b.pdf', b'new')
+        # References left behind by saves that never released them.
+        StoredFile.objects.create(name=leaked, size=3, refcount=1)
+        with open(os.path.join(self.media, leaked), 'wb') as handle:
+            handle.write(b'old')
+        StoredFile.objects.filter(name=current).update(refcount=F('refcount') + 2)
+        call_command('migrate_media_storage', '--prune', stdout=open(os.devnull, 'w'))
+        self.assertEqual(dict(StoredFile.objects.values_list('name', 'refcount')), {current: 1})
+        self.assertEqual(self.blobs(), [current])
+
+    def test_report_download_is_named_after_its_title(self):
+        report = Report(title='Annual "Report" 2024/25')
+        self.save(report, 'upload.pdf', b'%PDF')
+        response = self.client.get(f'/api/reports/{report.pk}/download/?download=1')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="Annual Report 2024 25.pdf"')
+        self.assertEqual(b''.join(response.streaming_content), b'%PDF')
+        response.close()
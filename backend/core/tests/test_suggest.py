@@ -0,0 +1,62 @@
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core import suggest
+from core.cache import bump_model_versions
+from core.models import Project
+
+
+class SuggestTests(TestCase):
+    def setUp(self):
+        suggest.reset_index()
+        self.addCleanup(suggest.reset_index)
+
+    def titles(self, query):
+        return [row['text'] for row in suggest.suggest(query)]
+
+    def test_local_cache_rebuilds_on_refresh(self):
+        self.assertEqual(self.titles('clean'), [])
+        # bulk_create sends no signals, like a save made in another worker.
+        Project.objects.bulk_create([Project(title='Clean water drive')])
+        suggest.refresh()
+        self.assertEqual(self.titles('clean'), ['Clean water drive'])
+
+    @override_settings(SUGGEST_REFRESH_INTERVAL=0)
+    def test_stale_index_is_refreshed_off_the_request_thread(self):
+        self.assertEqual(self.titles('clean'), [])
+        Project.objects.bulk_create([Project(title='Clean water drive')])
+        with mock.patch.object(suggest, 'refresh') as refresh:
+            self.assertEqual(self.titles('clean'), [])
+            suggest._refresh_thread.join()
+        refresh.assert_called_once_with()
+
+    @mock.patch('core.suggest.is_shared_cache', return_value=True)
+    def test_shared_cache_rebuilds_only_on_version_change(self, shared):
+        self.titles('clean')
+        Project.objects.bulk_create([Project(title='Clean water drive')])
+        suggest.refresh()
+        self.assertEqual(self.titles('clean'), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_model_versions([Project])
+        suggest.refresh()
+        self.assertEqual(self.titles('clean'), ['Clean water drive'])
+
+    @mock.patch('core.suggest.is_shared_cache', return_value=True)
+    def test_local_saves_do_not_hide_other_processes_changes(self, shared):
+        self.titles('clean')
+        # Another worker saves and bumps the version ...
+        Project.objects.bulk_create([Project(title='Clean water drive')])
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_model_versions([Project])
+        # ... before this process saves (and patches its index).
+        with self.captureOnCommitCallbacks(execute=True):
+            Project.objects.create(title='Clean air campaign')
+        suggest.refresh()
+        self.assertEqual(sorted(self.titles('clean')), ['Clean air campaign', 'Clean water drive'])
+
+    @override_settings(SUGGEST_MAX_AGE=300)
+    def test_endpoint_uses_its_own_max_age(self):
+        response = APIClient().get('/api/suggest/', {'q': 'cl'})
+        self.assertIn('max-age=300', response['Cache-Control'])
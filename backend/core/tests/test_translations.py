@@ -0,0 +1,93 @@
+import time
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core.cache import bump_model_versions
+from core.models import Event, Language, Project, Translation
+from core.utils_translation import clear_translation_cache, get_translated_content
+
+
+class TranslationCacheTests(TestCase):
+    def setUp(self):
+        clear_translation_cache()
+        self.addCleanup(clear_translation_cache)
+        self.hindi = Language.objects.create(name='Hindi', code='hi')
+        self.project = Project.objects.create(title='Clean water')
+        self.translation = Translation.objects.create(language=self.hindi, model_name='Project', field_name='title',
+                                                      object_id=self.project.pk, translated_text='स्वच्छ पानी')
+
+    def lookup(self):
+        return get_translated_content('Project', 'title', self.project.pk, 'hi')
+
+    def edit_elsewhere(self, text):
+        # A queryset update sends no signals, like a write made by another worker.
+        Translation.objects.filter(pk=self.translation.pk).update(translated_text=text)
+
+    def test_other_processes_writes_invalidate_through_versions(self):
+        self.assertEqual(self.lookup(), 'स्वच्छ पानी')
+        self.edit_elsewhere('साफ पानी')
+        with self.captureOnCommitCallbacks(execute=True):
+            bump_model_versions([Translation])
+        with self.assertNumQueries(1):
+            self.assertEqual(self.lookup(), 'साफ पानी')
+
+    @override_settings(TRANSLATION_CACHE_TIMEOUT=60)
+    def test_unversioned_changes_are_stale_for_at_most_the_timeout(self):
+        self.assertEqual(self.lookup(), 'स्वच्छ पानी')
+        self.edit_elsewhere('साफ पानी')
+        self.assertEqual(self.lookup(), 'स्वच्छ पानी')
+        later = time.monotonic() + 61
+        with mock.patch('core.utils_translation.time.monotonic', return_value=later):
+            self.assertEqual(self.lookup(), 'साफ पानी')
+
+    def test_local_writes_invalidate_immediately(self):
+        self.assertEqual(self.lookup(), 'स्वच्छ पानी')
+        self.translation.translated_text = 'साफ पानी'
+        self.translation.save()
+        self.assertEqual(self.lookup(), 'साफ पानी')
+
+
+class TranslatedListQueryTests(TestCase):
+    def setUp(self):
+        clear_translation_cache()
+        self.addCleanup(clear_translation_cache)
+        self.hindi = Language.objects.create(name='Hindi', code='hi')
+        Language.objects.create(name='English', code='en', is_default=True)
+
+    def add(self, model, count):
+        objects = [model.objects.create(title=f'{model.__name__} {n}', location='Pune') if model is Event
+                   else model.objects.create(title=f'{model.__name__} {n}') for n in range(count)]
+        Translation.objects.bulk_create(
+            Translation(language=self.hindi, model_name=model.__name__, field_name=field,
+                        object_id=instance.pk, translated_text=f'{field} {instance.pk}')
+            for instance in objects for field in ('title', 'description')
+        )
+
+    def count_queries(self, path):
+        clear_translation_cache()
+        with CaptureQueriesContext(connection) as queries:
+            response = APIClient().get(path, {'lang': 'hi'})
+        self.assertEqual(response.status_code, 200)
+        return len(queries), response.json()
+
+    def test_translated_pages_cost_a_constant_number_of_queries(self):
+        for model, path in ((Project, '/api/projects/'), (Event, '/api/events/')):
+            self.add(model, 2)
+            small, _ = self.count_queries(path)
+            self.add(model, 8)
+            large, data = self.count_queries(path)
+            self.assertEqual(large, small, path)
+            self.assertEqual(len(data['results']), 10)
+            self.assertTrue(all(row['title'].startswith('title ') for row in data['results']))
+
+    def test_detail_translates_in_one_query(self):
+        self.add(Project, 1)
+        pk = Project.objects.get().pk
+        queries, data = self.count_queries(f'/api/projects/{pk}/')
+        self.assertEqual(data['title'], f'title {pk}')
+        # object, default language, translations
+        self.assertEqual(queries, 3)
@@ -0,0 +1,95 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core import uploads
+from core.models import ChunkedUpload, Report
+
+DATA = b'%PDF-1.4 annual report ' * 100
+
+
+class ChunkedUploadTests(TestCase):
+    def setUp(self):
+        self.media = tempfile.mkdtemp()
+        self.partials = tempfile.mkdtemp()
+        for directory in (self.media, self.partials):
+            self.addCleanup(shutil.rmtree, directory)
+        override = override_settings(MEDIA_ROOT=self.media, CHUNKED_UPLOAD_DIR=self.partials)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create_user('admin', password='x', is_staff=True))
+
+    def create(self, **extra):
+        response = self.client.post('/api/uploads/', {
+            'filename': 'report.pdf', 'size': len(DATA), 'target': 'report', 'title': 'Annual report', **extra,
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.content)
+        return response.json()
+
+    def put(self, upload, data, offset):
+        return self.client.put(f"/api/uploads/{upload['id']}/chunk/?offset={offset}", data,
+                               content_type='application/octet-stream')
+
+    def finalize(self, upload):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(f"/api/uploads/{upload['id']}/finalize/")
+
+    def test_create_starts_an_empty_partial_file(self):
+        upload = self.create()
+        self.assertEqual((upload['offset'], upload['status']), (0, 'Uploading'))
+        self.assertEqual(os.path.getsize(os.path.join(self.partials, f"{upload['id']}.part")), 0)
+
+    def test_chunks_must_continue_at_the_current_offset(self):
+        upload = self.create()
+        self.assertEqual(self.put(upload, DATA[:1000], 0).json()['offset'], 1000)
+        response = self.put(upload, DATA[:1000], 0)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['offset'], 1000)
+        self.assertEqual(self.put(upload, DATA[1000:], 1000).json()['offset'], len(DATA))
+
+    def test_finalize_attaches_the_verified_file(self):
+        upload = self.create(checksum=hashlib.sha256(DATA).hexdigest())
+        self.put(upload, DATA, 0)
+        response = self.finalize(upload)
+        self.assertEqual(response.json()['status'], 'Complete')
+        report = Report.objects.get(pk=response.json()['object_id'])
+        self.assertEqual((report.title, report.file.read()), ('Annual report', DATA))
+        self.assertEqual(os.listdir(self.partials), [])
+
+    def test_checksum_mismatch_resets_the_upload(self):
+        upload = self.create(checksum='0' * 64)
+        self.put(upload, DATA, 0)
+        response = self.finalize(upload)
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(ChunkedUpload.objects.get(pk=upload['id']).offset, 0)
+        self.assertFalse(Report.objects.exists())
+
+    def test_finalize_can_be_retried_after_a_failed_save(self):
+        upload = self.create()
+        self.put(upload, DATA, 0)
+        with mock.patch.object(ChunkedUpload, 'save', side_effect=DatabaseError('lost connection')):
+            with self.assertRaises(DatabaseError):
+                uploads.finalize(ChunkedUpload.objects.get(pk=upload['id']))
+        self.assertFalse(Report.objects.exists())
+        response = self.finalize(upload)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Report.objects.get().file.read(), DATA)
+        self.assertEqual(os.listdir(self.partials), [])
+
+    def test_expire_uploads_removes_idle_uploads_and_their_files(self):
+        stale, fresh = self.create(), self.create()
+        ChunkedUpload.objects.filter(pk=stale['id']).update(updated_at=timezone.now() - timedelta(hours=3))
+        call_command('expire_uploads', hours=1, stdout=open(os.devnull, 'w'))
+        self.assertEqual(list(ChunkedUpload.objects.values_list('pk', flat=True)), [fresh['id']])
+        self.assertEqual(os.listdir(self.partials), [f"{fresh['id']}.part"])
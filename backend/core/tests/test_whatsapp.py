@@ -0,0 +1,77 @@
+import time
+from datetime import timedelta
+
+from django.test import SimpleTestCase, TransactionTestCase
+from django.utils import timezone
+
+from core.models import WhatsAppMessage
+from core.whatsapp_utils import FakeWhatsAppTransport, RateLimited, WhatsAppDispatcher
+
+
+class TimedTransport(FakeWhatsAppTransport):
+    """Records when each send starts and when each 429 is answered."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.started = []
+        self.limited_at = []
+
+    async def send(self, to_number, body):
+        self.started.append(time.monotonic())
+        try:
+            return await super().send(to_number, body)
+        except RateLimited:
+            self.limited_at.append(time.monotonic())
+            raise
+
+
+class DispatcherBackoffTests(SimpleTestCase):
+    def test_rate_limit_pauses_every_worker(self):
+        transport = TimedTransport(latency=0.01, rate_limit_every=4)
+        dispatcher = WhatsAppDispatcher(transport=transport, concurrency=4, retry_delay=0.2, record_status=False)
+        for index in range(12):
+            dispatcher.submit(f'+91000000{index:04d}', 'Thank you!')
+        self.assertTrue(dispatcher.join(timeout=10))
+        self.assertEqual(dispatcher.stats['sent'], 12)
+        self.assertEqual(dispatcher.stats['rate_limited'], len(transport.limited_at))
+        first = transport.limited_at[0]
+        later = [started for started in transport.started if started > first]
+        self.assertTrue(later)
+        self.assertGreaterEqual(min(later) - first, 0.19)
+
+    def test_rate_limited_messages_fail_after_max_retries(self):
+        transport = FakeWhatsAppTransport(latency=0, rate_limit_every=1)
+        dispatcher = WhatsAppDispatcher(transport=transport, concurrency=2, max_retries=2, retry_delay=0.01,
+                                        record_status=False)
+        with self.assertLogs('core.whatsapp_utils', 'WARNING'):
+            dispatcher.submit('+910000000001', 'Thank you!')
+            self.assertTrue(dispatcher.join(timeout=10))
+        self.assertEqual((dispatcher.stats['failed'], transport.calls), (1, 3))
+
+
+class DispatcherRecordTests(TransactionTestCase):
+    def test_outcomes_are_recorded(self):
+        dispatcher = WhatsAppDispatcher(transport=FakeWhatsAppTransport(latency=0), concurrency=2)
+        record = dispatcher.submit('+910000000001', 'Thank you!')
+        self.assertTrue(dispatcher.join(timeout=10))
+        record.refresh_from_db()
+        self.assertEqual((record.status, record.sid, record.attempts), ('Sent', 'FAKE00000001', 1))
+
+    def test_start_resends_stale_queued_messages(self):
+        old = timezone.now() - timedelta(hours=1)
+        stale = WhatsAppMessage.objects.create(to_number='+910000000001', body='Hi', attempts=2, updated_at=old)
+        recent = WhatsAppMessage.objects.create(to_number='+910000000002', body='Hi')
+        WhatsAppMessage.objects.create(to_number='+910000000003', body='Hi', status='Sent', updated_at=old)
+        transport = FakeWhatsAppTransport(latency=0)
+        dispatcher = WhatsAppDispatcher(transport=transport, concurrency=2)
+        dispatcher.start()
+        self.assertTrue(dispatcher.join(timeout=10))
+        self.assertEqual(transport.calls, 1)
+        stale.refresh_from_db()
+        recent.refresh_from_db()
+        self.assertEqual((stale.status, stale.attempts), ('Sent', 3))
+        self.assertEqual(recent.status, 'Queued')
+        # A second dispatcher finds nothing left to claim.
+        other = FakeWhatsAppTransport(latency=0)
+        WhatsAppDispatcher(transport=other).start()
+        self.assertEqual(other.calls, 0)
@@ -0,0 +1,77 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from unittest import mock
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core import writebehind
+from core.models import Contact, Donation, Newsletter
+
+
+class WriteBehindTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        override = override_settings(WRITE_BEHIND_ENABLED=True, WRITE_BEHIND_DIR=self.directory,
+                                     WRITE_BEHIND_FSYNC=False)
+        override.enable()
+        self.addCleanup(override.disable)
+        # Flush by hand instead of from the background thread.
+        patcher = mock.patch('core.writebehind.start_flusher')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def subscribe(self, email):
+        return APIClient().post('/api/newsletter/', {'email': email}, format='json')
+
+    def test_enqueued_submission_is_inserted_on_flush(self):
+        self.assertEqual(self.subscribe('asha@example.org').status_code, 202)
+        self.assertFalse(Newsletter.objects.exists())
+        self.assertEqual(writebehind.flush('newsletter'), 1)
+        self.assertEqual(list(Newsletter.objects.values_list('email', flat=True)), ['asha@example.org'])
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_flush_counts_only_inserted_rows(self):
+        self.subscribe('asha@example.org')
+        self.subscribe('asha@example.org')
+        with self.assertLogs('core.writebehind', 'WARNING'):
+            self.assertEqual(writebehind.flush('newsletter'), 1)
+        self.assertEqual(Newsletter.objects.count(), 1)
+
+    def test_full_buffer_answers_503_with_retry_after(self):
+        self.assertEqual(self.subscribe('asha@example.org').status_code, 202)
+        with self.settings(WRITE_BEHIND_MAX_BYTES=1, WRITE_BEHIND_INTERVAL=3):
+            response = self.subscribe('ravi@example.org')
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response['Retry-After'], '6')
+        self.assertEqual(writebehind.flush('newsletter'), 1)
+
+    def test_file_claimed_by_a_dead_worker_is_replayed(self):
+        worker = subprocess.Popen([sys.executable, '-c', 'pass'])
+        worker.wait()
+        claimed = os.path.join(self.directory, f'contact.{worker.pid}.{"a" * 32}.claimed')
+        with open(claimed, 'w', encoding='utf-8') as handle:
+            handle.write(json.dumps({'name': 'Asha', 'email': 'asha@example.org', 'message': 'Hi'}) + '\n')
+            handle.write('{"name": "cut off by a cra')
+        with self.assertLogs('core.writebehind', 'WARNING'):
+            self.assertEqual(writebehind.flush('contact'), 1)
+        self.assertEqual(list(Contact.objects.values_list('name', flat=True)), ['Asha'])
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_file_claimed_by_a_live_worker_is_left_alone(self):
+        claimed = os.path.join(self.directory, f'contact.{os.getppid()}.{"b" * 32}.claimed')
+        with open(claimed, 'w', encoding='utf-8') as handle:
+            handle.write(json.dumps({'name': 'Ravi'}) + '\n')
+        self.assertEqual(writebehind.flush('contact'), 0)
+        self.assertTrue(os.path.exists(claimed))
+
+    def test_donations_are_saved_directly_by_default(self):
+        response = APIClient().post('/api/donations/', {'donor': 'Asha', 'amount': '10.00', 'date': '2024-01-01'},
+                                    format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data['id'], Donation.objects.get().pk)
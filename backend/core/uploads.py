@@ -0,0 +1,244 @@
+"""
+Resumable chunked uploads for report PDFs and gallery images.
+
+A client creates an upload with the file's name and size, then PUTs the
+bytes in order to ``chunk/?offset=N``. Each request body is streamed
+straight into a partial file under ``CHUNKED_UPLOAD_DIR`` and into a
+running SHA-256, so neither the worker nor the database holds the file.
+After an interruption the client reads the upload's ``offset`` (bytes
+safely on disk, including any part of a chunk that was cut off) and
+continues from there. ``finalize`` checks the size and checksum and hands
+a hard link of the partial file to the target Report, Gallery or
+GalleryImage; storage moves it into MEDIA_ROOT with a rename when both are
+on one filesystem. The partial file itself is only removed once the target
+is committed, so a failed finalize can simply be retried.
+"""
+import hashlib
+import os
+import shutil
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, one writer per upload is assumed
+    fcntl = None
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image
+
+from .models import ChunkedUpload, Gallery, GalleryImage, Report
+
+# target -> (model, file field)
+TARGETS = {
+    'report': (Report, 'file'),
+    'gallery': (Gallery, 'image'),
+    'galleryimage': (GalleryImage, 'image'),
+}
+
+BLOCK_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class AssembledFile(File):
+    """The finished partial file; ``temporary_file_path`` lets FileSystemStorage move it instead of copying."""
+
+    def __init__(self, path, name):
+        super().__init__(open(path, 'rb'), name)
+        self.path = path
+
+    def temporary_file_path(self):
+        return self.path
+
+
+def chunk_size():
+    return getattr(settings, 'CHUNKED_UPLOAD_CHUNK_SIZE', 5 * 1024 * 1024)
+
+
+def partial_path(upload):
+    return os.path.join(str(settings.CHUNKED_UPLOAD_DIR), f'{upload.pk}.part')
+
+
+def staged_path(upload):
+    return os.path.join(str(settings.CHUNKED_UPLOAD_DIR), f'{upload.pk}.final')
+
+
+def _stage(path, staged):
+    """Expose the partial file under ``staged`` for storage to move, leaving ``path`` in place."""
+    _remove(staged)
+    try:
+        os.link(path, staged)
+    except OSError:  # no hard links on this filesystem
+        shutil.copyfile(path, staged)
+
+
+def _remove(*paths):
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+# Running digests by upload id, each valid while its offset matches the upload's.
+_hashers = {}
+_hashers_lock = threading.Lock()
+
+
+def _take_hasher(upload, path):
+    with _hashers_lock:
+        cached = _hashers.pop(upload.pk, None)
+    if cached is not None and cached[0] == upload.offset:
+        return cached[1]
+    # Earlier chunks went to another process (or before a restart): rehash them from disk.
+    hasher = hashlib.sha256()
+    remaining = upload.offset
+    with open(path, 'rb') as handle:
+        while remaining:
+            block = handle.read(min(BLOCK_SIZE, remaining))
+            if not block:
+                break
+            hasher.update(block)
+            remaining -= len(block)
+    return hasher
+
+
+def _lock(handle):
+    if fcntl is None:
+        return
+    try:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        raise UploadError('Another chunk for this upload is still being written', 409)
+
+
+def start(upload):
+    os.makedirs(str(settings.CHUNKED_UPLOAD_DIR), exist_ok=True)
+    open(partial_path(upload), 'wb').close()
+
+
+def append_chunk(upload, stream, offset, length):
+    """
+    Write ``length`` bytes from ``stream`` at ``offset``, which must equal
+    the upload's current offset. Whatever arrives before the client goes
+    away is kept, so ``upload.offset`` is always where to resume.
+    """
+    if upload.status != 'Uploading':
+        raise UploadError('Upload is already complete', 409)
+    if length is None:
+        raise UploadError('Content-Length is required', 411)
+    if length > chunk_size():
+        raise UploadError(f'Chunks may be at most {chunk_size()} bytes', 413)
+    if offset + length > upload.size:
+        raise UploadError('Chunk runs past the declared file size')
+
+    path = partial_path(upload)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    with os.fdopen(fd, 'r+b') as handle:
+        _lock(handle)
+        upload.refresh_from_db(fields=['offset', 'status'])
+        if offset != upload.offset:
+            raise UploadError(f'Expected offset {upload.offset}', 409)
+        hasher = _take_hasher(upload, path)
+        handle.seek(offset)
+        # Drop bytes past the offset left by a write that died before it was recorded.
+        handle.truncate()
+        written = 0
+        try:
+            while written < length and stream is not None:
+                block = stream.read(min(BLOCK_SIZE, length - written))
+                if not block:
+                    break
+                handle.write(block)
+                hasher.update(block)
+                written += len(block)
+        finally:
+            handle.flush()
+            os.fsync(handle.fileno())
+            upload.offset = offset + written
+            upload.updated_at = timezone.now()
+            ChunkedUpload.objects.filter(pk=upload.pk).update(offset=upload.offset, updated_at=upload.updated_at)
+            with _hashers_lock:
+                _hashers[upload.pk] = (upload.offset, hasher)
+    return written
+
+
+def _restart(upload, path):
+    open(path, 'wb').close()
+    upload.offset = 0
+    upload.updated_at = timezone.now()
+    upload.save(update_fields=['offset', 'updated_at'])
+
+
+def finalize(upload):
+    """Verify the upload and attach it to its target object, which is created when ``object_id`` is empty."""
+    if upload.status != 'Uploading':
+        raise UploadError('Upload is already complete', 409)
+    if upload.offset != upload.size:
+        raise UploadError(f'Upload is incomplete: {upload.offset} of {upload.size} bytes received', 409)
+
+    path = partial_path(upload)
+    digest = _take_hasher(upload, path).hexdigest()
+    if upload.checksum and upload.checksum.lower() != digest:
+        _restart(upload, path)
+        raise UploadError('Checksum mismatch; the upload was reset to offset 0', 422)
+
+    model, field = TARGETS[upload.target]
+    if field == 'image':
+        try:
+            with Image.open(path) as image:
+                image.verify()
+        except Exception:
+            raise UploadError('File is not a valid image')
+
+    staged = staged_path(upload)
+    _stage(path, staged)
+    try:
+        with transaction.atomic():
+            if upload.object_id:
+                instance = model.objects.select_for_update().filter(pk=upload.object_id).first()
+                if instance is None:
+                    raise UploadError('Target object no longer exists', 404)
+            else:
+                instance = model(title=upload.title or os.path.splitext(upload.filename)[0])
+            file = AssembledFile(staged, upload.filename)
+            try:
+                setattr(instance, field, file)
+                instance.save()
+            finally:
+                file.close()
+            upload.status = 'Complete'
+            upload.sha256 = digest
+            upload.object_id = instance.pk
+            upload.completed_at = upload.updated_at = timezone.now()
+            upload.save(update_fields=['status', 'sha256', 'object_id', 'completed_at', 'updated_at'])
+            # The staged link is gone unless storage copied rather than moved it.
+            transaction.on_commit(lambda: _remove(path, staged))
+    except BaseException:
+        _remove(staged)
+        raise
+    return instance
+
+
+def discard(upload):
+    with _hashers_lock:
+        _hashers.pop(upload.pk, None)
+    _remove(partial_path(upload), staged_path(upload))
+
+
+def expire(older_than):
+    """Delete unfinished uploads not touched since ``older_than``; returns how many."""
+    stale = ChunkedUpload.objects.filter(status='Uploading', updated_at__lt=older_than)
+    count = 0
+    for upload in stale.iterator():
+        discard(upload)
+        upload.delete()
+        count += 1
+    return count
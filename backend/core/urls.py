@@ -3,9 +3,12 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     ProjectViewSet, DonationViewSet, GalleryViewSet, EventViewSet,
     ImpactViewSet, TestimonialViewSet, CareerViewSet, NewsletterViewSet,
-    ContactViewSet, LanguageViewSet, TranslationViewSet
+    ContactViewSet, LanguageViewSet, TranslationViewSet, ChunkedUploadViewSet, search, suggest, export, bulk_import
 )
 from .auth import register_user, get_user_profile
+from .payments import create_payment, payment_callback, payment_webhook
+from .downloads import report_download
+from .async_views import ProjectReadView, GalleryReadView, EventReadView, CareerReadView
 
 router = DefaultRouter()
 router.register(r'projects', ProjectViewSet)
@@ -19,9 +22,27 @@ router.register(r'newsletter', NewsletterViewSet)
 router.register(r'contact', ContactViewSet)
 router.register(r'languages', LanguageViewSet)
 router.register(r'translations', TranslationViewSet)
+router.register(r'uploads', ChunkedUploadViewSet)
 
 urlpatterns = [
     path('', include(router.urls)),
     path('auth/register/', register_user, name='register'),
     path('auth/profile/', get_user_profile, name='profile'),
+    path('payments/create/', create_payment, name='payment-create'),
+    path('payments/callback/', payment_callback, name='payment-callback'),
+    path('payments/webhook/', payment_webhook, name='payment-webhook'),
+    path('search/', search, name='search'),
+    path('suggest/', suggest, name='suggest'),
+    path('exports/<str:dataset>/', export, name='export'),
+    path('imports/<str:dataset>/', bulk_import, name='import'),
+    path('reports/<int:pk>/download/', report_download, name='report-download'),
+    # Native async read path for ASGI (see core.async_views)
+    path('async/projects/', ProjectReadView.as_view(), name='async-project-list'),
+    path('async/projects/<int:pk>/', ProjectReadView.as_view(), name='async-project-detail'),
+    path('async/gallery/', GalleryReadView.as_view(), name='async-gallery-list'),
+    path('async/gallery/<int:pk>/', GalleryReadView.as_view(), name='async-gallery-detail'),
+    path('async/events/', EventReadView.as_view(), name='async-event-list'),
+    path('async/events/<int:pk>/', EventReadView.as_view(), name='async-event-detail'),
+    path('async/careers/', CareerReadView.as_view(), name='async-career-list'),
+    path('async/careers/<int:pk>/', CareerReadView.as_view(), name='async-career-detail'),
 ]
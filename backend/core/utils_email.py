@@ -1,58 +1,183 @@
+import atexit
+import logging
+import queue
+import smtplib
 import threading
-from django.core.mail import send_mail
+import time
+from django.core.mail import EmailMessage, EmailMultiAlternatives, get_connection
 from django.template.loader import render_to_string
 from django.conf import settings
 
-def _send(subject, message, recipient_list, from_email=None):
-    send_mail(subject, message, from_email or settings.EMAIL_HOST_USER, recipient_list, fail_silently=False)
+logger = logging.getLogger(__name__)
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+def is_transient_error(exc):
+    """
+    Whether retrying could help: 4xx replies and lost connections. Every
+    smtplib exception subclasses OSError, so they are all classified here
+    before the OSError fallback (sockets, DNS, timeouts).
+    """
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return 400 <= exc.smtp_code < 500
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in exc.recipients.values()]
+        return bool(codes) and all(400 <= code < 500 for code in codes)
+    if isinstance(exc, smtplib.SMTPServerDisconnected):
+        return True
+    if isinstance(exc, smtplib.SMTPException):
+        # SMTPNotSupportedError, missing AUTH/STARTTLS support and the like.
+        return False
+    return isinstance(exc, OSError)
+
+
+def send_messages_with_retry(messages, connection=None, on_failure=None, throttle=None):
+    """
+    Send ``messages`` one at a time over a single open connection. Transient
+    failures reconnect and retry the remaining messages with exponential
+    backoff, so messages already accepted are never sent twice.
+
+    A message that still fails (a non-transient error, or retries exhausted)
+    is raised, unless ``on_failure(message, exc)`` is given: it is then
+    called for that message and the rest are still sent. ``throttle()``,
+    when given, is called before every send attempt to pace them.
+    """
+    retries = _setting('MAIL_MAX_RETRIES', 3)
+    backoff = _setting('MAIL_RETRY_BACKOFF', 1.0)
+    owns_connection = connection is None
+    connection = connection or get_connection()
+    pending = list(messages)
+    sent = 0
+    attempt = 0
+    try:
+        while pending:
+            if throttle is not None:
+                throttle()
+            try:
+                connection.open()
+                sent += connection.send_messages(pending[:1]) or 0
+                pending.pop(0)
+                attempt = 0
+            except Exception as exc:
+                if attempt >= retries or not is_transient_error(exc):
+                    if on_failure is None:
+                        raise
+                    on_failure(pending.pop(0), exc)
+                    attempt = 0
+                    continue
+                connection.close()
+                time.sleep(backoff * 2 ** attempt)
+                attempt += 1
+    finally:
+        if owns_connection:
+            connection.close()
+    return sent
+
+
+def log_failed_message(message, exc):
+    logger.error('Dropping email %r to %s: %s', message.subject, ', '.join(message.recipients()), exc)
+
+
+class MailDispatcher:
+    """
+    Bounded queue drained by a fixed pool of worker threads. Each worker
+    batches whatever is queued and keeps one SMTP connection open while the
+    queue is busy. When the queue is full, submit() falls back to sending
+    inline so no message is dropped.
+    """
+
+    def __init__(self, workers=None, max_queue=None, batch_size=None):
+        self.workers = workers or _setting('MAIL_DISPATCHER_WORKERS', 2)
+        self.batch_size = batch_size or _setting('MAIL_BATCH_SIZE', 50)
+        self._queue = queue.Queue(max_queue or _setting('MAIL_QUEUE_SIZE', 1000))
+        self._threads = []
+        self._lock = threading.Lock()
+
+    @property
+    def queue_depth(self):
+        return self._queue.qsize()
+
+    def start(self):
+        with self._lock:
+            if self._threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f'mail-dispatcher-{index}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+            atexit.register(self.flush, _setting('MAIL_SHUTDOWN_TIMEOUT', 10))
+
+    def submit(self, message):
+        self.start()
+        try:
+            self._queue.put(message, timeout=_setting('MAIL_QUEUE_PUT_TIMEOUT', 1))
+        except queue.Full:
+            logger.warning('Mail queue full (%s messages), sending inline', self.queue_depth)
+            send_messages_with_retry([message], on_failure=log_failed_message)
+
+    def flush(self, timeout=None):
+        """Wait until every queued message has been handled."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def _run(self):
+        connection = None
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                connection = connection or get_connection()
+                send_messages_with_retry(batch, connection=connection, on_failure=log_failed_message)
+            except Exception:
+                logger.exception('Failed to send %s queued emails', len(batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+                if connection is not None and self._queue.empty():
+                    connection.close()
+                    connection = None
+
+
+mail_dispatcher = MailDispatcher()
+
+
+def send_email_async(subject, message, recipient_list, from_email=None):
+    mail_dispatcher.submit(EmailMessage(subject, message, from_email or settings.EMAIL_HOST_USER, recipient_list))
+
+
+def _send_html_async(subject, template_name, context, recipient):
+    html_message = render_to_string(template_name, context)
+    message = EmailMultiAlternatives(subject, '', settings.EMAIL_HOST_USER, [recipient])
+    message.attach_alternative(html_message, 'text/html')
+    mail_dispatcher.submit(message)
 
-def send_email_async(subject, message, recipient_list):
-    thread = threading.Thread(target=_send, args=(subject, message, recipient_list))
-    thread.start()
 
 def send_donation_confirmation(donation):
-    subject = 'Thank you for your donation'
-    html_message = render_to_string('emails/donation_confirmation.html', {
-        'name': donation.name,
+    _send_html_async('Thank you for your donation', 'emails/donation_confirmation.html', {
+        'name': donation.donor,
         'amount': donation.amount,
         'payment_id': donation.payment_id
-    })
-    
-    send_mail(
-        subject=subject,
-        message='',
-        html_message=html_message,
-        from_email=settings.EMAIL_HOST_USER,
-        recipient_list=[donation.email],
-        fail_silently=False,
-    )
+    }, donation.email)
+
 
 def send_volunteer_confirmation(volunteer):
-    subject = 'Thank you for volunteering'
-    html_message = render_to_string('emails/volunteer_confirmation.html', {
+    _send_html_async('Thank you for volunteering', 'emails/volunteer_confirmation.html', {
         'name': volunteer.name
-    })
-    
-    send_mail(
-        subject=subject,
-        message='',
-        html_message=html_message,
-        from_email=settings.EMAIL_HOST_USER,
-        recipient_list=[volunteer.email],
-        fail_silently=False,
-    )
+    }, volunteer.email)
+
 
 def send_contact_confirmation(contact):
-    subject = 'We received your message'
-    html_message = render_to_string('emails/contact_confirmation.html', {
+    _send_html_async('We received your message', 'emails/contact_confirmation.html', {
         'name': contact.name
-    })
-    
-    send_mail(
-        subject=subject,
-        message='',
-        html_message=html_message,
-        from_email=settings.EMAIL_HOST_USER,
-        recipient_list=[contact.email],
-        fail_silently=False,
-    )
+    }, contact.email)
@@ -1,32 +1,208 @@
-from django.utils.translation import gettext as _
+import threading
+import time
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.utils.translation import gettext as _, get_language
 from .models import Translation, Language
 
+# Cached lookups are keyed per language on (model_name, field_name, object_id).
+# Misses are cached as None so untranslated fields fall back without a query.
+# Translation/Language signals invalidate entries in the writing process; the
+# others notice through the core.cache model versions, checked on every
+# resolve, and drop their whole cache. Under a process-local cache backend
+# those versions never leave the writer, so other processes may serve a
+# changed translation for up to TRANSLATION_CACHE_TIMEOUT seconds.
+_MISSING = None
+_cache = {}
+_lock = threading.Lock()
+_default_language = []
+_versions_seen = []
+
+
+def _cache_size():
+    return getattr(settings, 'TRANSLATION_CACHE_SIZE', 5000)
+
+
+def _cache_timeout():
+    return getattr(settings, 'TRANSLATION_CACHE_TIMEOUT', 300)
+
+
+def _get_cached(language_code, key):
+    bucket = _cache.get(language_code)
+    if bucket is None or key not in bucket:
+        return False, None
+    text, expires = bucket[key]
+    if expires < time.monotonic():
+        del bucket[key]
+        return False, None
+    bucket.move_to_end(key)
+    return True, text
+
+
+def _set_cached(language_code, key, text):
+    bucket = _cache.setdefault(language_code, OrderedDict())
+    bucket[key] = (text, time.monotonic() + _cache_timeout())
+    bucket.move_to_end(key)
+    while len(bucket) > _cache_size():
+        bucket.popitem(last=False)
+
+
+def _sync_versions():
+    """Drop everything cached if translations or languages changed since the last check."""
+    from .cache import get_model_versions  # core.cache imports this module
+
+    versions = get_model_versions([Translation, Language])
+    with _lock:
+        if _versions_seen and _versions_seen[0] != versions:
+            _cache.clear()
+            _default_language.clear()
+        _versions_seen[:] = [versions]
+
+
+def _lookup_cached(model_name, object_ids, fields, language_codes):
+    object_ids = [object_id for object_id in object_ids if object_id is not None]
+    language_codes = [code for code in dict.fromkeys(language_codes) if code]
+    resolved = {code: {} for code in language_codes}
+    missing = {}
+
+    with _lock:
+        for code in language_codes:
+            for object_id in object_ids:
+                for field in fields:
+                    key = (model_name, field, object_id)
+                    hit, text = _get_cached(code, key)
+                    if hit:
+                        if text is not _MISSING:
+                            resolved[code][(object_id, field)] = text
+                    else:
+                        missing.setdefault(code, set()).add(key)
+    return resolved, missing
+
+
+def _missing_rows(model_name, missing):
+    return Translation.objects.filter(
+        model_name=model_name,
+        object_id__in={key[2] for keys in missing.values() for key in keys},
+        field_name__in={key[1] for keys in missing.values() for key in keys},
+        language__code__in=list(missing),
+    ).values_list('language__code', 'field_name', 'object_id', 'translated_text')
+
+
+def _store_loaded(model_name, resolved, missing, rows):
+    found = {}
+    for code, field, object_id, text in rows:
+        found[(code, (model_name, field, object_id))] = text
+
+    with _lock:
+        for code, keys in missing.items():
+            for key in keys:
+                text = found.get((code, key), _MISSING)
+                _set_cached(code, key, text)
+                if text is not _MISSING:
+                    resolved[code][(key[2], key[1])] = text
+    return resolved
+
+
+def resolve_translations(model_name, object_ids, fields, language_codes):
+    """
+    Return {language_code: {(object_id, field_name): text}} for every
+    requested combination, loading all cache misses in a single query.
+    """
+    _sync_versions()
+    resolved, missing = _lookup_cached(model_name, object_ids, fields, language_codes)
+    if not missing:
+        return resolved
+    return _store_loaded(model_name, resolved, missing, _missing_rows(model_name, missing))
+
+
+async def aresolve_translations(model_name, object_ids, fields, language_codes):
+    """Async resolve_translations(): cache misses are loaded with the async ORM."""
+    await sync_to_async(_sync_versions)()
+    resolved, missing = _lookup_cached(model_name, object_ids, fields, language_codes)
+    if not missing:
+        return resolved
+    rows = [row async for row in _missing_rows(model_name, missing)]
+    return _store_loaded(model_name, resolved, missing, rows)
+
+
+def get_translations(model_name, object_ids, fields, language_code):
+    return resolve_translations(model_name, object_ids, fields, [language_code]).get(language_code, {})
+
+
+def invalidate_translation(model_name, field_name, object_id):
+    key = (model_name, field_name, object_id)
+    with _lock:
+        for bucket in _cache.values():
+            bucket.pop(key, None)
+
+
+def clear_translation_cache():
+    with _lock:
+        _cache.clear()
+        _default_language.clear()
+
+
+def _default_language_query():
+    return Language.objects.filter(is_default=True).values_list('code', flat=True)
+
+
+def _cache_default_language(code):
+    with _lock:
+        _default_language[:] = [code]
+    return code
+
+
+def get_default_language_code():
+    with _lock:
+        if _default_language:
+            return _default_language[0]
+    return _cache_default_language(_default_language_query().first())
+
+
+async def aget_default_language_code():
+    with _lock:
+        if _default_language:
+            return _default_language[0]
+    return _cache_default_language(await _default_language_query().afirst())
+
+
+def get_request_language(request):
+    params = getattr(request, 'query_params', getattr(request, 'GET', {}))
+    code = params.get('lang') or getattr(request, 'LANGUAGE_CODE', None) or get_language()
+    return code.lower() if code else None
+
+
 def get_translated_content(model_name, field_name, object_id, language_code='en'):
-    try:
-        translation = Translation.objects.get(
-            model_name=model_name,
-            field_name=field_name,
-            object_id=object_id,
-            language__code=language_code
-        )
-        return translation.translated_text
-    except Translation.DoesNotExist:
-        return None
+    return get_translations(model_name, [object_id], [field_name], language_code).get((object_id, field_name))
+
 
 def translate_model_data(instance, fields_to_translate, language_code):
-    translated_data = {}
-    model_name = instance.__class__.__name__
-    
-    for field in fields_to_translate:
-        translated_content = get_translated_content(
-            model_name,
-            field,
-            instance.id,
-            language_code
-        )
-        if translated_content:
-            translated_data[field] = translated_content
-        else:
-            translated_data[field] = getattr(instance, field)
-    
-    return translated_data
\ No newline at end of file
+    return translate_queryset_data([instance], fields_to_translate, language_code)[0]
+
+
+def translate_queryset_data(instances, fields_to_translate, language_code):
+    instances = list(instances)
+    if not instances:
+        return []
+    model_name = instances[0].__class__.__name__
+    translations = get_translations(
+        model_name,
+        [instance.id for instance in instances],
+        fields_to_translate,
+        language_code
+    )
+
+    translated = []
+    for instance in instances:
+        translated_data = {}
+        for field in fields_to_translate:
+            translated_content = translations.get((instance.id, field))
+            if translated_content:
+                translated_data[field] = translated_content
+            else:
+                translated_data[field] = getattr(instance, field)
+        translated.append(translated_data)
+
+    return translated
@@ -1,24 +1,198 @@
-from rest_framework import viewsets, status, permissions
+from rest_framework import mixins, viewsets, status, permissions
 from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from django.shortcuts import get_object_or_404
+from django.db import IntegrityError, transaction
+from django.db.models import Sum, UniqueConstraint
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 from .models import (
     Contact, Project, Donation, Gallery, Event, 
-    Impact, Testimonial, Career, Language, Translation, Newsletter
+    Impact, Testimonial, Career, Language, Translation, Newsletter,
+    DonationRollup, ChunkedUpload
 )
 from .serializers import (
-    ContactSerializer, ProjectSerializer, DonationSerializer,
+    ContactSerializer, ProjectSerializer, DonationSerializer, DonationAdminSerializer,
     GallerySerializer, EventSerializer, ImpactSerializer,
     TestimonialSerializer, CareerSerializer, LanguageSerializer,
-    TranslationSerializer, NewsletterSerializer
+    TranslationSerializer, NewsletterSerializer, ProjectSummarySerializer,
+    GallerySummarySerializer, EventSummarySerializer, CareerSummarySerializer,
+    ChunkedUploadSerializer
 )
 from django.conf import settings
 from .utils_email import send_email_async  # simple helper
 from .payments import create_payment_order  # optional razorpay helper
+from .cache import CachedResponseMixin
+from .pagination import KeysetPaginationMixin, CreatedAtKeysetPagination, DateKeysetPagination
+from . import search as search_index
+from . import batch, exports, imports, uploads, writebehind
+from .suggest import suggest as suggest_titles
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_cache_control
+from .utils_translation import get_request_language
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class SummarySerializerMixin:
+    """Serializes list responses with ``summary_serializer_class``."""
+    summary_serializer_class = None
+
+    def get_serializer_class(self):
+        if self.action == 'list' and self.summary_serializer_class is not None:
+            return self.summary_serializer_class
+        return super().get_serializer_class()
+
+class BulkActionsMixin:
+    """
+    List payloads on ``bulk/``: POST creates, PATCH partially updates (each
+    item carries its ``id``) and DELETE removes (a list of ids, or
+    ``?ids=1,2``). A batch is validated as a whole and written in one
+    transaction with bulk SQL; save/delete signals still fire per row, but
+    their cache, search and counter work runs once per batch (core.batch).
+    """
+    bulk_max_items = 500
+
+    def get_bulk_payload(self, request):
+        payload = request.data
+        if not isinstance(payload, list) or not payload:
+            raise ValidationError('Expected a non-empty list.')
+        if len(payload) > self.bulk_max_items:
+            raise ValidationError(f'At most {self.bulk_max_items} items per request.')
+        return payload
+
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        serializer = self.get_serializer(data=self.get_bulk_payload(request), many=True)
+        serializer.is_valid(raise_exception=True)
+        model = self.get_queryset().model
+        duplicates = _batch_duplicate_errors(model, serializer.validated_data)
+        if any(duplicates):
+            raise ValidationError(duplicates)
+        instances = [model(**attrs) for attrs in serializer.validated_data]
+        try:
+            with batch.batched(), transaction.atomic():
+                batch.bulk_save(model, instances)
+        except IntegrityError as error:
+            return Response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(self.get_serializer(instances, many=True).data, status=status.HTTP_201_CREATED)
+
+    @bulk.mapping.patch
+    def bulk_update(self, request):
+        payload = self.get_bulk_payload(request)
+        ids = [_bulk_id(item.get('id') if isinstance(item, dict) else None) for item in payload]
+        model = self.get_queryset().model
+        try:
+            with batch.batched(), transaction.atomic():
+                found = self.get_queryset().select_for_update().in_bulk([pk for pk in ids if pk is not None])
+                serializers, errors, seen = [], [], set()
+                for item, pk in zip(payload, ids):
+                    if pk not in found or pk in seen:
+                        errors.append({'id': ['Duplicate id.' if pk in seen else 'Not found.']})
+                        continue
+                    seen.add(pk)
+                    serializer = self.get_serializer(found[pk], data=item, partial=True)
+                    errors.append({} if serializer.is_valid() else serializer.errors)
+                    serializers.append((len(errors) - 1, serializer))
+                if not any(errors):
+                    duplicates = _batch_duplicate_errors(
+                        model, [serializer.validated_data for _, serializer in serializers],
+                        [serializer.instance for _, serializer in serializers],
+                        [index for index, _ in serializers])
+                    for (index, _), error in zip(serializers, duplicates):
+                        errors[index] = error
+                if any(errors):
+                    raise ValidationError(errors)
+                serializers = [serializer for _, serializer in serializers]
+
+                fields = set()
+                for serializer in serializers:
+                    for attr, value in serializer.validated_data.items():
+                        setattr(serializer.instance, attr, value)
+                        fields.add(attr)
+                instances = [serializer.instance for serializer in serializers]
+                if fields:
+                    batch.bulk_save(model, instances, fields)
+        except IntegrityError as error:
+            return Response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(self.get_serializer(instances, many=True).data)
+
+    @bulk.mapping.delete
+    def bulk_destroy(self, request):
+        if isinstance(request.data, list) and request.data:
+            values = request.data
+        else:
+            values = [value for value in request.query_params.get('ids', '').split(',') if value.strip()]
+        if not values:
+            raise ValidationError('Expected a non-empty list of ids.')
+        if len(values) > self.bulk_max_items:
+            raise ValidationError(f'At most {self.bulk_max_items} items per request.')
+        ids = [_bulk_id(value) for value in values]
+        if None in ids:
+            raise ValidationError('Ids must be integers.')
+
+        with batch.batched(), transaction.atomic():
+            queryset = self.get_queryset().filter(pk__in=ids)
+            deleted = set(queryset.values_list('pk', flat=True))
+            queryset.delete()
+        return Response({
+            'deleted': len(deleted),
+            'results': [{'id': pk, 'status': 'deleted' if pk in deleted else 'not_found'} for pk in ids],
+        })
+
+
+def _batch_duplicate_errors(model, items, instances=None, positions=None):
+    """
+    Per-item errors for items that share a unique key with an earlier item
+    in the same batch. Serializer validators only check each item against
+    the database, so such clashes would otherwise fail as one IntegrityError.
+    ``items`` are validated data; on update, ``instances`` supply the values
+    an item leaves unchanged and ``positions`` its index in the payload.
+    """
+    opts = model._meta
+    keys = [(field.name,) for field in opts.fields if field.unique and not field.primary_key]
+    keys += [tuple(fields) for fields in opts.unique_together]
+    keys += [tuple(constraint.fields) for constraint in opts.constraints
+             if isinstance(constraint, UniqueConstraint) and constraint.fields and constraint.condition is None]
+    instances = instances or [None] * len(items)
+    positions = positions or list(range(len(items)))
+
+    def value(attrs, instance, name):
+        field = opts.get_field(name)
+        if name in attrs:
+            value = attrs[name]
+            return value.pk if field.is_relation and value is not None else value
+        return getattr(instance, field.attname) if instance is not None else None
+
+    errors = [{} for _ in items]
+    for key in keys:
+        error_key = key[0] if len(key) == 1 else api_settings.NON_FIELD_ERRORS_KEY
+        first = {}
+        for index, (attrs, instance) in enumerate(zip(items, instances)):
+            values = tuple(value(attrs, instance, name) for name in key)
+            if None in values:
+                continue  # NULLs never clash
+            if values not in first:
+                first[values] = index
+                continue
+            other = first[values]
+            errors[other].setdefault(error_key, [f'Duplicated by item {positions[index]} in this batch.'])
+            errors[index].setdefault(error_key, [f'Duplicates item {positions[other]} in this batch.'])
+    return errors
+
+
+def _bulk_id(value):
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+class ProjectViewSet(CachedResponseMixin, SummarySerializerMixin, viewsets.ModelViewSet):
     queryset = Project.objects.all().order_by("-created_at")
     serializer_class = ProjectSerializer
+    summary_serializer_class = ProjectSummarySerializer
+    cache_models = (Project,)
 
     def get_permissions(self):
         if self.action in ['list', 'retrieve']:
@@ -27,11 +201,33 @@ class ProjectViewSet(viewsets.ModelViewSet):
             permission_classes = [permissions.IsAdminUser]
         return [permission() for permission in permission_classes]
 
-class DonationViewSet(viewsets.ModelViewSet):
+class DonationViewSet(KeysetPaginationMixin, viewsets.ModelViewSet):
     # use the model's 'date' field for ordering (was using non-existent 'created_at')
     queryset = Donation.objects.all().order_by("-date")
     serializer_class = DonationSerializer
-    permission_classes = [permissions.AllowAny]
+    keyset_pagination_class = DateKeysetPagination
+
+    def get_permissions(self):
+        # Donations carry donor email and phone, so only admins may read or edit them.
+        if self.action in ['create', 'create_payment', 'stats']:
+            permission_classes = [permissions.AllowAny]
+        else:
+            permission_classes = [permissions.IsAdminUser]
+        return [permission() for permission in permission_classes]
+
+    def get_serializer_class(self):
+        if self.request.user and self.request.user.is_staff:
+            return DonationAdminSerializer
+        return super().get_serializer_class()
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        if writebehind.save_or_enqueue(serializer):
+            # Saved on the next flush, so there is no id to return yet.
+            return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+        headers = self.get_success_headers(serializer.data)
+        return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
     @action(detail=False, methods=['post'])
     def create_payment(self, request):
@@ -46,10 +242,47 @@ class DonationViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-class GalleryViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """Totals by purpose from DonationRollup; defaults to completed donations this month."""
+        today = timezone.localdate()
+        try:
+            start = _query_date(request, 'from') or today.replace(day=1)
+            end = _query_date(request, 'to') or today
+        except ValueError as error:
+            return Response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        if start > end:
+            return Response({'error': 'from must not be after to'}, status=status.HTTP_400_BAD_REQUEST)
+        donation_status = request.query_params.get('status', 'Completed')
+
+        rows = (
+            DonationRollup.objects
+            .filter(status=donation_status, day__range=(start, end))
+            .values('purpose')
+            .annotate(total=Sum('total'), count=Sum('count'))
+            .order_by('-total')
+        )
+        by_purpose = [
+            {'purpose': row['purpose'] or None, 'total': row['total'], 'count': row['count']}
+            for row in rows if row['count']
+        ]
+        return Response({
+            'from': start,
+            'to': end,
+            'status': donation_status,
+            'total': sum(row['total'] for row in by_purpose),
+            'count': sum(row['count'] for row in by_purpose),
+            'by_purpose': by_purpose,
+        })
+
+class GalleryViewSet(CachedResponseMixin, KeysetPaginationMixin, SummarySerializerMixin, BulkActionsMixin,
+                     viewsets.ModelViewSet):
     serializer_class = GallerySerializer
+    summary_serializer_class = GallerySummarySerializer
+    cache_models = (Gallery,)
+    keyset_pagination_class = CreatedAtKeysetPagination
+    filter_backends = [search_index.FullTextSearchFilter]
     filterset_fields = ['category', 'is_featured']
-    search_fields = ['title', 'description']
     ordering_fields = ['created_at', 'title']
 
     def get_permissions(self):
@@ -72,9 +305,12 @@ class GalleryViewSet(viewsets.ModelViewSet):
         context['request'] = self.request
         return context
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(CachedResponseMixin, KeysetPaginationMixin, SummarySerializerMixin, viewsets.ModelViewSet):
     queryset = Event.objects.all().order_by("-date")
     serializer_class = EventSerializer
+    summary_serializer_class = EventSummarySerializer
+    cache_models = (Event,)
+    keyset_pagination_class = DateKeysetPagination
 
     def get_permissions(self):
         if self.action in ['list', 'retrieve']:
@@ -83,19 +319,29 @@ class EventViewSet(viewsets.ModelViewSet):
             permission_classes = [permissions.IsAdminUser]
         return [permission() for permission in permission_classes]
 
-class ImpactViewSet(viewsets.ModelViewSet):
-    queryset = Impact.objects.all()
+class ImpactViewSet(CachedResponseMixin, BulkActionsMixin, viewsets.ModelViewSet):
+    # Counter values are maintained by core.impact, so reads never aggregate.
+    queryset = Impact.objects.all().order_by("id")
     serializer_class = ImpactSerializer
-    permission_classes = [permissions.IsAdminUser]
+    cache_models = (Impact,)
 
-class TestimonialViewSet(viewsets.ModelViewSet):
+    def get_permissions(self):
+        if self.action in ['list', 'retrieve']:
+            permission_classes = [permissions.AllowAny]
+        else:
+            permission_classes = [permissions.IsAdminUser]
+        return [permission() for permission in permission_classes]
+
+class TestimonialViewSet(BulkActionsMixin, viewsets.ModelViewSet):
     queryset = Testimonial.objects.all().order_by("-created_at")
     serializer_class = TestimonialSerializer
     permission_classes = [permissions.IsAdminUser]
 
-class CareerViewSet(viewsets.ModelViewSet):
+class CareerViewSet(CachedResponseMixin, SummarySerializerMixin, viewsets.ModelViewSet):
     queryset = Career.objects.all().order_by("-created_at")
     serializer_class = CareerSerializer
+    summary_serializer_class = CareerSummarySerializer
+    cache_models = (Career,)
 
     def get_permissions(self):
         if self.action in ['list', 'retrieve', 'apply']:
@@ -113,11 +359,13 @@ class NewsletterViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         try:
-            serializer.save()
+            queued = writebehind.save_or_enqueue(serializer)
             return Response(
                 {'message': 'Successfully subscribed to newsletter'},
-                status=status.HTTP_201_CREATED
+                status=status.HTTP_202_ACCEPTED if queued else status.HTTP_201_CREATED
             )
+        except writebehind.BufferFull:
+            raise
         except Exception as e:
             return Response(
                 {'error': str(e)},
@@ -132,10 +380,10 @@ class ContactViewSet(viewsets.ModelViewSet):
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        queued = writebehind.save_or_enqueue(serializer)
         return Response(
             {'message': 'Message sent successfully'},
-            status=status.HTTP_201_CREATED
+            status=status.HTTP_202_ACCEPTED if queued else status.HTTP_201_CREATED
         )
 
 class LanguageViewSet(viewsets.ModelViewSet):
@@ -143,11 +391,54 @@ class LanguageViewSet(viewsets.ModelViewSet):
     serializer_class = LanguageSerializer
     permission_classes = [permissions.IsAdminUser]
 
-class TranslationViewSet(viewsets.ModelViewSet):
+class TranslationViewSet(BulkActionsMixin, viewsets.ModelViewSet):
     queryset = Translation.objects.all()
     serializer_class = TranslationSerializer
     permission_classes = [permissions.IsAdminUser]
 
+class ChunkedUploadViewSet(mixins.CreateModelMixin, mixins.RetrieveModelMixin, mixins.ListModelMixin,
+                           mixins.DestroyModelMixin, viewsets.GenericViewSet):
+    """
+    Resumable uploads (see core.uploads): POST the file's name, size and
+    target, PUT the raw bytes to ``chunk/?offset=N`` in order, GET the
+    upload to learn where to resume, then POST ``finalize/``.
+    """
+    queryset = ChunkedUpload.objects.all().order_by("-created_at")
+    serializer_class = ChunkedUploadSerializer
+    permission_classes = [permissions.IsAdminUser]
+
+    def perform_create(self, serializer):
+        upload = serializer.save(created_by=self.request.user)
+        uploads.start(upload)
+
+    def perform_destroy(self, instance):
+        uploads.discard(instance)
+        instance.delete()
+
+    @action(detail=True, methods=['put'])
+    def chunk(self, request, pk=None):
+        upload = self.get_object()
+        try:
+            offset = int(request.query_params.get('offset', ''))
+        except ValueError:
+            return Response({'error': 'offset is required'}, status=status.HTTP_400_BAD_REQUEST)
+        length = request.META.get('CONTENT_LENGTH')
+        try:
+            # The body is read from request.stream as it arrives; request.data is never parsed.
+            uploads.append_chunk(upload, request.stream, offset, int(length) if length else None)
+        except uploads.UploadError as error:
+            return Response({'error': str(error), 'offset': upload.offset}, status=error.status_code)
+        return Response(self.get_serializer(upload).data)
+
+    @action(detail=True, methods=['post'])
+    def finalize(self, request, pk=None):
+        upload = self.get_object()
+        try:
+            uploads.finalize(upload)
+        except uploads.UploadError as error:
+            return Response({'error': str(error), 'offset': upload.offset}, status=error.status_code)
+        return Response(self.get_serializer(upload).data)
+
 @api_view(['POST'])
 def send_email(request):
     try:
@@ -155,3 +446,125 @@ def send_email(request):
         return Response({'status': 'success'})
     except Exception as e:
         return Response({'status': 'error', 'message': str(e)})
+
+
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def search(request):
+    """
+    Ranked full-text search across blogs, projects, events, careers and the
+    gallery. ``?q=`` text, optional ``?type=project,event``, ``?limit=`` and
+    ``?offset=``; results use the request language where translated.
+    """
+    if not search_index.is_available():
+        return Response({'error': 'Search is not available'}, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+    query = request.query_params.get('q', '').strip()
+    types = [name.strip() for name in request.query_params.get('type', '').split(',') if name.strip()]
+    unknown = [name for name in types if name not in search_index.MODELS]
+    if unknown:
+        return Response({'error': f"Unknown type: {', '.join(unknown)}"}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        limit = min(max(int(request.query_params.get('limit', 20)), 1), 50)
+        offset = max(int(request.query_params.get('offset', 0)), 0)
+    except ValueError:
+        return Response({'error': 'limit and offset must be integers'}, status=status.HTTP_400_BAD_REQUEST)
+
+    language = get_request_language(request)
+    results = search_index.search(
+        query, language=language, models=[search_index.MODELS[name] for name in types],
+        limit=limit, offset=offset
+    )
+    return Response({
+        'query': query,
+        'language': language,
+        'results': results,
+        'next_offset': offset + limit if len(results) == limit else None,
+    })
+
+
+@api_view(['GET'])
+@permission_classes([permissions.AllowAny])
+def suggest(request):
+    """Search-box suggestions for ``?q=`` from project, event and career titles and locations."""
+    query = request.query_params.get('q', '')
+    try:
+        limit = min(max(int(request.query_params.get('limit', 8)), 1), 20)
+    except ValueError:
+        return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    response = Response({'query': query, 'suggestions': suggest_titles(query, limit)})
+    patch_cache_control(response, public=True, max_age=getattr(settings, 'SUGGEST_MAX_AGE', 60))
+    return response
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+def export(request, dataset):
+    """
+    Stream a whole dataset (donations, volunteers, contacts, subscribers) as
+    ``?output=csv`` (default) or ``ndjson``, optionally limited to the
+    ``?from=``/``?to=`` dates (inclusive) and the dataset's filters
+    (``status``, ``purpose``, ``active``).
+    """
+    spec = exports.EXPORTS.get(dataset)
+    if spec is None:
+        return Response({'error': f'Unknown export: {dataset}'}, status=status.HTTP_404_NOT_FOUND)
+    output = request.query_params.get('output', 'csv')
+    if output not in exports.OUTPUTS:
+        return Response({'error': f"output must be one of: {', '.join(exports.OUTPUTS)}"},
+                        status=status.HTTP_400_BAD_REQUEST)
+    try:
+        start, end = (_query_date(request, name) for name in ('from', 'to'))
+    except ValueError as error:
+        return Response({'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+
+    queryset = exports.export_queryset(spec, start, end, request.query_params)
+    response = StreamingHttpResponse(exports.stream_rows(spec, queryset, output), content_type=exports.OUTPUTS[output])
+    response['Content-Disposition'] = f'attachment; filename="{exports.filename(dataset, output, start, end)}"'
+    # Personal data: never cache, and let nginx pass blocks through as they are produced.
+    response['Cache-Control'] = 'private, no-store'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@api_view(['POST'])
+@permission_classes([permissions.IsAdminUser])
+def bulk_import(request, dataset):
+    """
+    Import translations, volunteers or subscribers from a CSV, NDJSON or
+    JSON array, sent as the ``file`` of a multipart form or as the raw
+    request body. ``?input=`` overrides the format guessed from the file
+    name or content type; ``?dry_run=1`` only validates. Rows that fail
+    are listed with their number; every other row is written.
+    """
+    if dataset not in imports.IMPORTS:
+        return Response({'error': f'Unknown import: {dataset}'}, status=status.HTTP_404_NOT_FOUND)
+    if request.content_type.startswith('multipart/'):
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({'error': 'file is required'}, status=status.HTTP_400_BAD_REQUEST)
+        # Uploads past FILE_UPLOAD_MAX_MEMORY_SIZE are spooled to disk and read line by line.
+        lines, guessed = upload, imports.guess_input(upload.name, upload.content_type)
+    else:
+        # The raw body is iterated line by line straight off the request stream.
+        lines, guessed = request.stream or [], imports.guess_input(content_type=request.content_type)
+    input_format = request.query_params.get('input') or guessed
+    if input_format not in imports.INPUTS:
+        return Response({'error': f"input must be one of: {', '.join(imports.INPUTS)}"},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    dry_run = request.query_params.get('dry_run', '').lower() in ('1', 'true', 'yes')
+    result = imports.import_records(dataset, lines, input_format, dry_run=dry_run)
+    return Response(result, status=status.HTTP_200_OK if dry_run else status.HTTP_201_CREATED)
+
+
+def _query_date(request, name):
+    value = request.query_params.get(name, '')
+    if not value:
+        return None
+    try:
+        day = parse_date(value)
+    except ValueError:
+        day = None
+    if day is None:
+        raise ValueError(f'{name} must be a date (YYYY-MM-DD)')
+    return day
@@ -1,11 +1,23 @@
-from twilio.rest import Client
+import asyncio
+import atexit
+import logging
+import random
+import threading
+import time
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.utils import timezone
+from .integrations import get_client
+from .models import WhatsAppMessage
+
+logger = logging.getLogger(__name__)
 
-client = Client(settings.TWILIO_ACCOUNT_SID, settings.TWILIO_AUTH_TOKEN)
 
 def send_whatsapp_message(to_number, message):
     try:
-        message = client.messages.create(
+        message = get_client('twilio').messages.create(
             from_=f'whatsapp:{settings.TWILIO_WHATSAPP_NUMBER}',
             body=message,
             to=f'whatsapp:{to_number}'
@@ -14,13 +26,211 @@ def send_whatsapp_message(to_number, message):
     except Exception as e:
         return False, str(e)
 
+
+@sync_to_async
+def _record_status(pk, status, sid, error, attempts):
+    WhatsAppMessage.objects.filter(pk=pk).update(
+        status=status, sid=sid, error=error, attempts=attempts, updated_at=timezone.now()
+    )
+
+
+class RateLimited(Exception):
+    pass
+
+
+class TwilioWhatsAppTransport:
+    """Sends through the shared Twilio client without blocking the event loop."""
+
+    async def send(self, to_number, body):
+        from twilio.base.exceptions import TwilioRestException
+
+        client = get_client('twilio')
+        try:
+            message = await asyncio.to_thread(
+                client.messages.create,
+                from_=f'whatsapp:{settings.TWILIO_WHATSAPP_NUMBER}',
+                body=body,
+                to=f'whatsapp:{to_number}'
+            )
+        except TwilioRestException as exc:
+            if exc.status == 429:
+                raise RateLimited(str(exc))
+            raise
+        return message.sid
+
+
+class FakeWhatsAppTransport:
+    """Offline stand-in for load tests: fixed latency, periodic 429s, random failures."""
+
+    def __init__(self, latency=0.05, rate_limit_every=0, failure_rate=0.0):
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.failure_rate = failure_rate
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def send(self, to_number, body):
+        self.calls += 1
+        call = self.calls
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        if self.rate_limit_every and call % self.rate_limit_every == 0:
+            raise RateLimited('429 Too Many Requests')
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise RuntimeError('Simulated delivery failure')
+        return f'FAKE{call:08d}'
+
+
+class WhatsAppDispatcher:
+    """
+    Queues WhatsApp messages onto an event loop running in a background
+    thread and sends them with at most ``concurrency`` requests in flight.
+    A 429 puts every worker behind a shared backoff before the rate-limited
+    message is retried. Each message's outcome is recorded on its
+    WhatsAppMessage row when ``record_status`` is set, and on start the
+    dispatcher picks up rows left Queued by a process that stopped before
+    sending them.
+    """
+
+    def __init__(self, transport=None, concurrency=None, max_retries=None, retry_delay=None, record_status=True):
+        self.transport = transport
+        self.concurrency = concurrency or getattr(settings, 'WHATSAPP_CONCURRENCY', 10)
+        self.max_retries = max_retries if max_retries is not None else getattr(settings, 'WHATSAPP_MAX_RETRIES', 5)
+        self.retry_delay = retry_delay if retry_delay is not None else getattr(settings, 'WHATSAPP_RETRY_DELAY', 1.0)
+        self.record_status = record_status
+        self.stats = {'sent': 0, 'failed': 0, 'rate_limited': 0}
+        self.pending = 0
+        self._loop = None
+        self._queue = None
+        # Loop time before which no worker sends (set by 429 responses).
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self._loop is not None:
+                return
+            if self.transport is None:
+                self.transport = get_client('whatsapp')
+            ready = threading.Event()
+            thread = threading.Thread(target=self._run_loop, args=(ready,), name='whatsapp-dispatcher', daemon=True)
+            thread.start()
+            ready.wait()
+            atexit.register(self.join, getattr(settings, 'WHATSAPP_SHUTDOWN_TIMEOUT', 10))
+        if self.record_status:
+            self._resume_queued()
+
+    def submit(self, to_number, body):
+        record = None
+        if self.record_status:
+            record = WhatsAppMessage.objects.create(to_number=to_number, body=body)
+        self.start()
+        self._enqueue(record.pk if record else None, to_number, body)
+        return record
+
+    def _enqueue(self, pk, to_number, body, attempts=0):
+        with self._lock:
+            self.pending += 1
+        message = {'id': pk, 'to': to_number, 'body': body, 'attempts': attempts}
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, message)
+
+    def _resume_queued(self):
+        """
+        Re-enqueue Queued rows untouched for ``WHATSAPP_RESUME_AFTER``
+        seconds. Each row is claimed by moving its ``updated_at``, so when
+        several processes start together only one of them sends it.
+        """
+        cutoff = timezone.now() - timedelta(seconds=getattr(settings, 'WHATSAPP_RESUME_AFTER', 300))
+        stale = WhatsAppMessage.objects.filter(status='Queued', updated_at__lt=cutoff).values_list(
+            'pk', 'to_number', 'body', 'attempts', 'updated_at')
+        resumed = 0
+        for pk, to_number, body, attempts, updated_at in stale.iterator():
+            claimed = WhatsAppMessage.objects.filter(pk=pk, status='Queued', updated_at=updated_at).update(
+                updated_at=timezone.now())
+            if claimed:
+                self._enqueue(pk, to_number, body, attempts)
+                resumed += 1
+        if resumed:
+            logger.info('Resumed %s queued WhatsApp message(s)', resumed)
+
+    def join(self, timeout=None):
+        """Block until every submitted message has been sent or has failed."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.pending:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def _run_loop(self, ready):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue()
+        for _ in range(self.concurrency):
+            self._loop.create_task(self._worker())
+        ready.set()
+        self._loop.run_forever()
+
+    async def _worker(self):
+        while True:
+            message = await self._queue.get()
+            await self._wait_for_backoff()
+            message['attempts'] += 1
+            try:
+                sid = await self.transport.send(message['to'], message['body'])
+            except RateLimited as exc:
+                self.stats['rate_limited'] += 1
+                if message['attempts'] > self.max_retries:
+                    await self._finish(message, 'Failed', error=str(exc))
+                else:
+                    self._schedule_retry(message)
+            except Exception as exc:
+                await self._finish(message, 'Failed', error=str(exc))
+            else:
+                await self._finish(message, 'Sent', sid=sid)
+            finally:
+                self._queue.task_done()
+
+    async def _wait_for_backoff(self):
+        while True:
+            delay = self._resume_at - self._loop.time()
+            if delay <= 0:
+                return
+            await asyncio.sleep(delay)
+
+    def _schedule_retry(self, message):
+        delay = self.retry_delay * 2 ** (message['attempts'] - 1)
+        self._resume_at = max(self._resume_at, self._loop.time() + delay)
+        self._queue.put_nowait(message)
+
+    async def _finish(self, message, status, sid=None, error=None):
+        self.stats['sent' if status == 'Sent' else 'failed'] += 1
+        if message['id'] is not None:
+            try:
+                await _record_status(message['id'], status, sid, error, message['attempts'])
+            except Exception:
+                logger.exception('Could not record WhatsApp message %s', message['id'])
+        if status == 'Failed':
+            logger.warning('WhatsApp message to %s failed: %s', message['to'], error)
+        with self._lock:
+            self.pending -= 1
+
+
+whatsapp_dispatcher = WhatsAppDispatcher()
+
+
 def send_donation_confirmation_whatsapp(donation):
     message = f"""Thank you for your donation of ₹{donation.amount}!
 Your support helps us make a difference.
 Receipt ID: {donation.payment_id}"""
-    return send_whatsapp_message(donation.phone, message)
+    return whatsapp_dispatcher.submit(donation.phone, message)
 
 def send_volunteer_confirmation_whatsapp(volunteer):
     message = f"""Thank you for registering as a volunteer, {volunteer.name}!
 We'll contact you soon about opportunities."""
-    return send_whatsapp_message(volunteer.phone, message)
\ No newline at end of file
+    return whatsapp_dispatcher.submit(volunteer.phone, message)
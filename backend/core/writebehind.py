@@ -0,0 +1,288 @@
+"""
+Write-behind buffering of public contact, newsletter and donation submissions.
+
+With ``WRITE_BEHIND_ENABLED`` the create endpoints still validate in the
+request, but instead of an INSERT (and on SQLite a wait for the single
+writer lock) each submission is appended as one JSON line to
+``<WRITE_BEHIND_DIR>/<model>.jsonl`` and fsynced, and the view answers 202.
+A flusher thread in every worker claims the file every
+``WRITE_BEHIND_INTERVAL`` seconds by renaming it, inserts its rows with
+``bulk_save`` in one transaction and deletes it. Claimed files left by a
+worker that died are picked up by the next flush, so a submission that was
+acknowledged is written unless the disk is lost; replaying a file whose
+transaction committed just before a crash can duplicate contact messages
+(subscribers are unique by email and are not duplicated). Donations are
+left out by default (see ``DEFAULT_MODELS``).
+
+When a model's pending files pass ``WRITE_BEHIND_MAX_BYTES`` the views
+answer 503 with Retry-After instead of buffering more. Buffered rows are
+flushed at interpreter exit; ``flush_write_behind`` drains them by hand.
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import uuid
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the in-process lock applies, run one worker
+    fcntl = None
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DatabaseError, IntegrityError, close_old_connections, transaction
+from rest_framework.exceptions import APIException
+
+from . import batch
+from .models import Contact, Donation, Newsletter
+
+logger = logging.getLogger(__name__)
+
+MODELS = {model._meta.model_name: model for model in (Contact, Donation, Newsletter)}
+# Buffered unless WRITE_BEHIND_MODELS says otherwise. A buffered donation is
+# answered without an id, so create_payment cannot bill it; opt in only where
+# donations are recorded without the payment flow.
+DEFAULT_MODELS = ('contact', 'newsletter')
+
+CHUNK_SIZE = 500
+
+_encoder = DjangoJSONEncoder(ensure_ascii=False)
+_lock = threading.Lock()
+_flush_lock = threading.Lock()  # the flusher, shutdown and commands must not replay one file twice
+_flusher = None
+_flusher_pid = None
+_stop = threading.Event()
+
+
+class BufferFull(APIException):
+    status_code = 503
+    default_detail = 'Too many submissions are waiting to be saved, please retry shortly.'
+    default_code = 'buffer_full'
+
+    def __init__(self, wait):
+        super().__init__()
+        self.wait = wait  # DRF's exception handler turns this into Retry-After
+
+
+def enabled(model):
+    return (getattr(settings, 'WRITE_BEHIND_ENABLED', False)
+            and model._meta.model_name in getattr(settings, 'WRITE_BEHIND_MODELS', DEFAULT_MODELS))
+
+
+def buffer_dir():
+    return getattr(settings, 'WRITE_BEHIND_DIR', None) or os.path.join(settings.BASE_DIR, 'writebehind')
+
+
+def interval():
+    return getattr(settings, 'WRITE_BEHIND_INTERVAL', 1.0)
+
+
+def _buffer_path(model_name):
+    return os.path.join(buffer_dir(), f'{model_name}.jsonl')
+
+
+def _flock(handle):
+    if fcntl is not None:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+
+
+def _open_locked(path):
+    """
+    Open ``path`` for appending with an exclusive lock, retrying if a flush
+    renamed it away while we waited, so nothing is appended to a claimed file.
+    """
+    while True:
+        handle = open(path, 'a', encoding='utf-8')
+        _flock(handle)
+        try:
+            if os.path.samestat(os.stat(path), os.fstat(handle.fileno())):
+                return handle
+        except FileNotFoundError:
+            pass
+        handle.close()
+
+
+def pending_bytes(model_name):
+    total = 0
+    try:
+        entries = os.scandir(buffer_dir())
+    except FileNotFoundError:
+        return 0
+    with entries:
+        for entry in entries:
+            if entry.name.startswith(model_name + '.') and entry.is_file():
+                total += entry.stat().st_size
+    return total
+
+
+def save_or_enqueue(serializer):
+    """
+    ``serializer.save()``, or with write-behind enabled for its model append
+    the validated row to the buffer instead. Returns True when buffered.
+    """
+    model = serializer.Meta.model
+    if not enabled(model):
+        serializer.save()
+        return False
+    model_name = model._meta.model_name
+    if pending_bytes(model_name) >= getattr(settings, 'WRITE_BEHIND_MAX_BYTES', 16 * 1024 * 1024):
+        raise BufferFull(max(1, int(interval() * 2)))
+    # Build the instance now so defaults such as created_at record the time of the request.
+    instance = model(**serializer.validated_data)
+    record = {field.attname: field.to_python(field.value_from_object(instance))
+              for field in model._meta.concrete_fields if not field.primary_key}
+    line = _encoder.encode(record) + '\n'
+
+    os.makedirs(buffer_dir(), exist_ok=True)
+    with _lock, _open_locked(_buffer_path(model_name)) as handle:
+        handle.write(line)
+        handle.flush()
+        if getattr(settings, 'WRITE_BEHIND_FSYNC', True):
+            os.fsync(handle.fileno())
+    start_flusher()
+    return True
+
+
+def _claim(model_name):
+    """Rename the live buffer aside for this process; returns its new path or None when empty."""
+    path = _buffer_path(model_name)
+    if not os.path.exists(path):
+        return None
+    with _lock, _open_locked(path) as handle:
+        if not os.fstat(handle.fileno()).st_size:
+            return None
+        claimed = os.path.join(buffer_dir(), f'{model_name}.{os.getpid()}.{uuid.uuid4().hex}.claimed')
+        os.rename(path, claimed)
+    return claimed
+
+
+def _alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+
+def _claimed_files(model_name):
+    """Files claimed by this process, plus any whose worker is gone (taken over with a rename)."""
+    directory = buffer_dir()
+    try:
+        names = sorted(os.listdir(directory))
+    except FileNotFoundError:
+        return []
+    paths = []
+    for name in names:
+        parts = name.split('.')
+        if len(parts) != 4 or parts[0] != model_name or parts[3] != 'claimed' or not parts[1].isdigit():
+            continue
+        path = os.path.join(directory, name)
+        pid = int(parts[1])
+        if pid != os.getpid():
+            if _alive(pid):
+                continue
+            taken = os.path.join(directory, f'{model_name}.{os.getpid()}.{parts[2]}.claimed')
+            try:
+                os.rename(path, taken)
+            except FileNotFoundError:  # another worker took it first
+                continue
+            path = taken
+        paths.append(path)
+    return paths
+
+
+def _read(model, path):
+    fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+    instances = []
+    with open(path, encoding='utf-8') as handle:
+        for number, line in enumerate(handle, start=1):
+            try:
+                record = json.loads(line)
+                instances.append(model(**{field.attname: field.to_python(record[field.attname])
+                                          for field in fields if field.attname in record}))
+            except Exception:
+                # Only a write cut off by a crash can leave a bad line; it was never acknowledged.
+                logger.warning('Skipping unreadable line %d of %s', number, path)
+    return instances
+
+
+def _write(model, instances):
+    """Insert ``instances``; returns how many were inserted (duplicates are dropped)."""
+    inserted = 0
+    for start in range(0, len(instances), CHUNK_SIZE):
+        chunk = instances[start:start + CHUNK_SIZE]
+        try:
+            with transaction.atomic():
+                batch.bulk_save(model, chunk)
+            inserted += len(chunk)
+        except IntegrityError:
+            # A subscriber who signed up twice before a flush: keep the first, drop the rest.
+            for instance in chunk:
+                instance.pk = None
+                instance._state.adding = True
+                try:
+                    with transaction.atomic():
+                        instance.save()
+                    inserted += 1
+                except IntegrityError as error:
+                    logger.warning('Dropping buffered %s: %s', model._meta.model_name, error)
+    return inserted
+
+
+def flush(model_name):
+    """Write every pending row of one model; returns the number of rows inserted."""
+    model = MODELS[model_name]
+    written = 0
+    with _flush_lock:
+        _claim(model_name)
+        for path in _claimed_files(model_name):
+            instances = _read(model, path)
+            with batch.batched(), transaction.atomic():
+                written += _write(model, instances)
+            os.remove(path)
+    return written
+
+
+def flush_all():
+    written = {}
+    for model_name in MODELS:
+        try:
+            written[model_name] = flush(model_name)
+        except (DatabaseError, OSError):
+            logger.exception('Write-behind flush of %s failed; will retry', model_name)
+    return written
+
+
+def _run():
+    while not _stop.wait(interval()):
+        close_old_connections()
+        flush_all()
+    close_old_connections()
+
+
+def start_flusher():
+    """Start this process's flusher thread (again after a fork)."""
+    global _flusher, _flusher_pid
+    if _flusher_pid == os.getpid() and _flusher.is_alive():
+        return
+    with _lock:
+        if _flusher_pid == os.getpid() and _flusher.is_alive():
+            return
+        if _flusher_pid is None:
+            atexit.register(shutdown)
+        _stop.clear()
+        _flusher = threading.Thread(target=_run, name='write-behind-flusher', daemon=True)
+        _flusher.start()
+        _flusher_pid = os.getpid()
+
+
+def shutdown():
+    """Stop the flusher and write whatever is still buffered."""
+    _stop.set()
+    if _flusher is not None and _flusher_pid == os.getpid():
+        _flusher.join(timeout=max(5.0, interval() * 5))
+    flush_all()